@@ -1,11 +1,35 @@
 import minimalmodbus
 from PyExpLabSys.common.supported_versions import python3_only
+from PyExpLabSys.common.modbus import (
+    Register,
+    RegisterMap,
+    instrument_read_block,
+    int32,
+    scaled,
+)
 
 python3_only(__file__)
 import time
 
 
 class Motor(object):
+    # Register table of the direct data operation values, read in three block reads by
+    # get_values
+    registers = {
+        'group_id': Register(48, 2, int32),
+        'operation_data_number': Register(88, 2, int32),
+        'operation_type': Register(90, 2, int32),
+        'position': Register(92, 2, scaled(int32, 2)),
+        'operating_speed': Register(94, 2, int32),
+        'starting_changing_rate': Register(96, 2, scaled(int32, 3)),
+        'stopping_deceleration': Register(98, 2, scaled(int32, 3)),
+        'operating_current': Register(100, 2, scaled(int32, 1)),
+        'operation_trigger': Register(102, 2, int32),
+        'status': Register(126, 2, int32),
+        'alarm': Register(128, 2, int32),
+        'command_position': Register(198, 2, scaled(int32, 2)),
+    }
+
     def __init__(self, port, slave_adress=1):
         self.instrument = minimalmodbus.Instrument(
             port, slave_adress, mode=minimalmodbus.MODE_RTU
@@ -15,6 +39,14 @@ class Motor(object):
         self.instrument.serial.parity = minimalmodbus.serial.PARITY_EVEN
         self.instrument.serial.stopbits = 1
         self.instrument.serial.timeout = 1  # seconds
+        self.register_map = RegisterMap(
+            self.registers, instrument_read_block(self.instrument), max_gap=32
+        )
+
+    def get_values(self, names=None):
+        """Read the values in the register table (all by default) in as few block
+        reads as possible and return them as a dict"""
+        return self.register_map.read(names)
 
     """ Maintenance """
 
@@ -71,23 +103,23 @@ class Motor(object):
         return status
 
     def clear_ETO(self):
-        " Clear the ETO (External Torque Off) mode "
+        "Clear the ETO (External Torque Off) mode"
         self.instrument.write_long(416, 1, signed=True)
         self.instrument.write_long(416, 0, signed=True)
 
     def save_RAM_to_non_volatile(self):
-        " Writes the parameters saved in the RAM to the non-volatile memory, which can be rewritten approx. 100,000 times "
+        "Writes the parameters saved in the RAM to the non-volatile memory, which can be rewritten approx. 100,000 times"
         self.instrument.write_long(402, 1, signed=True)
         time.sleep(0.1)
         self.instrument.write_long(402, 0, signed=True)
 
     def load_non_volatile_to_RAM(self):
-        " Read the parameters saved in the non-volatile memory to the RAM. NB! All operation data and parameters saved in the RAM are overwritten "
+        "Read the parameters saved in the non-volatile memory to the RAM. NB! All operation data and parameters saved in the RAM are overwritten"
         self.instrument.write_long(400, 1, signed=True)
         self.instrument.write_long(400, 0, signed=True)
 
     def load_RAM_to_direct(self):
-        " Read and write the operation data number to be used in direct data operation "
+        "Read and write the operation data number to be used in direct data operation"
         operation_number = self.instrument.read_long(88, signed=True)
         self.instrument.write_long(88, operation_number, signed=True)
 
@@ -292,36 +324,36 @@ class Motor(object):
     """ Write """
 
     def set_initial_position(self, operation_number, setting):
-        """ Setting range: -2,147,438,648 to 2,147,438,648 steps """
+        """Setting range: -2,147,438,648 to 2,147,438,648 steps"""
         self.instrument.write_long(
             1024 + operation_number * 2, setting * 100, signed=True
         )
 
     def set_initial_operating_speed(self, setting):
-        """ Setting range: -4,000,000 to 4,000,000 Hz  """
+        """Setting range: -4,000,000 to 4,000,000 Hz"""
         self.instrument.write_long(1152, int(setting), signed=True)
 
     def set_initial_starting_speed(self, setting):
-        """ Setting range: 0 to 4,000,000 Hz  """
+        """Setting range: 0 to 4,000,000 Hz"""
         self.instrument.write_long(644, int(setting), signed=True)
 
     def set_initial_starting_changing_rate(self, setting):
-        """ Setting range: 1 to 1,000,000,000 (unit is kHz/s, s or ms/kHz) """
+        """Setting range: 1 to 1,000,000,000 (unit is kHz/s, s or ms/kHz)"""
         self.instrument.write_long(1536, int(setting * 1000), signed=True)
 
     def set_initial_stopping_deceleration(self, setting):
-        """ Setting range: 1 to 1,000,000,000 (unit is kHz/s, s or ms/kHz) """
+        """Setting range: 1 to 1,000,000,000 (unit is kHz/s, s or ms/kHz)"""
         self.instrument.write_long(1664, int(setting * 1000), signed=True)
 
     def set_initial_operating_current(self, setting):
-        """ Setting range: 0 to 1,000 (1=0.1 %) """
+        """Setting range: 0 to 1,000 (1=0.1 %)"""
         self.instrument.write_long(1792, int(setting * 10), signed=True)
 
     def set_initial_operation_type(self, operation_number, setting):
         self.instrument.write_long(1280 + operation_number * 2, setting, signed=True)
 
     def set_initial_group_id(self, parent_slave):
-        """ Setting range: -1: Disable (no group transmission, initial value); 1 to 31: Group ID 1 to 31. NB! Do not use 0 """
+        """Setting range: -1: Disable (no group transmission, initial value); 1 to 31: Group ID 1 to 31. NB! Do not use 0"""
         self.instrument.write_long(5012, int(parent_slave), signed=True)
 
     def set_initial_positive_software_limit(self, setting):
@@ -1,6 +1,6 @@
 """Live vaslues used for the microreacotr setups"""
 # pylint: disable=no-member
-import socket
+import asyncio
 from datetime import datetime
 import time as t
 import dash
@@ -8,6 +8,9 @@ from dash.dependencies import Input, Output
 import dash_core_components as dcc
 import dash_html_components as html
 import plotly.graph_objs as go
+from PyExpLabSys.common.socket_clients import OLD_DATA
+from PyExpLabSys.common.async_socket_clients import multi_request, get_fields
+from PyExpLabSys.common.decimation import decimate_indices
 from PyExpLabSys.common.supported_versions import python3_only
 
 python3_only(__file__)
@@ -42,57 +45,91 @@ HOURS = 18
 MAX_LENGTH = int(HOURS * 3600 / INTERVAL)
 
 ALL_DATA = {name: {'x': [], 'y': []} for name in NAMES}
+# The number of points to send to a plot, about twice the width of a plot in pixels
+PLOT_POINTS = 1000
 
 
-def communicate_sock(network_adress, com, port=9000):
-    """This is the socekt communications function"""
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.settimeout(1)
+# Requests for the values, that are read with a single command each
+RAW_REQUESTS = {
+    'thermocouple_temp': ('rasppi12', 9000, 'microreactorng_temp_sample#raw'),
+    'rtd_temp': ('rasppi05', 9000, 'temperature#raw'),
+    'chamber_pressure': ('microreactorng', 7654, 'read_pressure#labview'),
+    'buffer_pressure': ('rasppi36', 9000, 'microreactorng_pressure_buffer#raw'),
+    'containment_pressure': ('microreactorng', 7654, 'read_containment#labview'),
+}
+# Values from the pull socket on rasppi16, which are all read with one request
+FIELDS = {
+    'reactor_pressure': ('rasppi16', 9000, 'M11200362H'),
+    'flow1': ('rasppi16', 9000, 'M11200362C'),
+    'flow2': ('rasppi16', 9000, 'M11200362A'),
+    'flow3': ('rasppi16', 9000, 'M11200362E'),
+    'flow4': ('rasppi16', 9000, 'M11200362D'),
+    'flow5': ('rasppi16', 9000, 'M11210022B'),
+    'flow6': ('rasppi16', 9000, 'M11200362G'),
+}
+# Value used when a value could not be read
+ERROR_VALUE = -500.0
 
+
+def parse_raw(received):
+    """Parse a raw reply, expected string recived: 'time_since_epoch,value'"""
+    if isinstance(received, Exception):
+        return ERROR_VALUE
     try:
-        command = com.encode()
-        sock.sendto(command, (network_adress, port))
-        received_bytes = sock.recv(1024)  #
-        received = received_bytes.decode('ascii')
-        # expected string recived: 'time_since_epoch,value'
-        value = float(received[received.find(',') + 1 :])
+        return float(received[received.find(',') + 1 :])
     except ValueError:
-        value = -500.0  # None
+        return ERROR_VALUE
+
 
-    return value
+def parse_field(value):
+    """Parse a value from a pull socket, [time_since_epoch, value]"""
+    if isinstance(value, Exception) or value == OLD_DATA:
+        return ERROR_VALUE
+    return value[1]
+
+
+async def fetch_values(timeout=1):
+    """Send all requests concurrently and return the values"""
+    replies, fields = await asyncio.gather(
+        multi_request(RAW_REQUESTS, timeout=timeout),
+        get_fields(FIELDS, timeout=timeout),
+    )
+    values = {name: parse_raw(reply) for name, reply in replies.items()}
+    values.update({name: parse_field(value) for name, value in fields.items()})
+    return values
 
 
 def all_values_update():
     """Function to call update all values"""
     time = datetime.now()
 
+    # All values are requested at the same time, so a host that does not answer only
+    # costs one timeout
+    fetched = asyncio.run(fetch_values())
+
     # Temperature values from thermocouple and RTD
-    thermocouple_temp = communicate_sock('rasppi12', 'microreactorng_temp_sample#raw')
-    rtd_temp = communicate_sock('rasppi05', 'temperature#raw')
+    thermocouple_temp = fetched['thermocouple_temp']
+    rtd_temp = fetched['rtd_temp']
     if isinstance(rtd_temp, float):
         rtd_temp = round(rtd_temp, 1)
 
     # Pressure values from NextGeneration setup
-    chamber_pressure = communicate_sock(
-        'microreactorng', 'read_pressure#labview', port=7654
-    )
-    reactor_pressure = communicate_sock('rasppi16', 'M11200362H#raw')
+    chamber_pressure = fetched['chamber_pressure']
+    reactor_pressure = fetched['reactor_pressure']
     if reactor_pressure == 0:
         reactor_pressure = 1e-4
     if isinstance(reactor_pressure, float):
         reactor_pressure = round(reactor_pressure, 3)
-    buffer_pressure = communicate_sock('rasppi36', 'microreactorng_pressure_buffer#raw')
-    containment_pressure = communicate_sock(
-        'microreactorng', 'read_containment#labview', port=7654
-    )
+    buffer_pressure = fetched['buffer_pressure']
+    containment_pressure = fetched['containment_pressure']
 
     # Flow values from NextGeneration setup
-    flow1 = communicate_sock('rasppi16', 'M11200362C#raw')
-    flow2 = communicate_sock('rasppi16', 'M11200362A#raw')
-    flow3 = communicate_sock('rasppi16', 'M11200362E#raw')
-    flow4 = communicate_sock('rasppi16', 'M11200362D#raw')
-    flow5 = communicate_sock('rasppi16', 'M11210022B#raw')
-    flow6 = communicate_sock('rasppi16', 'M11200362G#raw')
+    flow1 = fetched['flow1']
+    flow2 = fetched['flow2']
+    flow3 = fetched['flow3']
+    flow4 = fetched['flow4']
+    flow5 = fetched['flow5']
+    flow6 = fetched['flow6']
 
     for i in [flow1, flow2, flow3, flow4, flow5, flow6]:
         if i is not None and len(str(i)) > 3:
@@ -123,6 +160,18 @@ def all_values_update():
     t.sleep(1)
 
 
+def plot_data(name):
+    """Return the data for name decimated to PLOT_POINTS points with min/max envelopes,
+    so that the plots cost the same no matter how much data is kept
+    """
+    data = ALL_DATA[name]
+    indices = decimate_indices(data['y'], PLOT_POINTS)
+    return {
+        'x': [data['x'][index] for index in indices],
+        'y': [data['y'][index] for index in indices],
+    }
+
+
 ### Colours for dash app and plots ####
 COLOURS = {
     'background': '#607D8B',
@@ -285,14 +334,15 @@ def update_press_graph(n):
         ymax = max(i for i in lst if i is not None) * 1.001
     data = [
         go.Scatter(
-            ALL_DATA['containment_pressure'],
+            plot_data('containment_pressure'),
             marker=dict(color=COLOURS['containment_pressure']),
         ),
         go.Scatter(
-            ALL_DATA['reactor_pressure'], marker=dict(color=COLOURS['reactor_pressure'])
+            plot_data('reactor_pressure'),
+            marker=dict(color=COLOURS['reactor_pressure']),
         ),
         go.Scatter(
-            ALL_DATA['buffer_pressure'], marker=dict(color=COLOURS['buffer_pressure'])
+            plot_data('buffer_pressure'), marker=dict(color=COLOURS['buffer_pressure'])
         ),
     ]
     layout = go.Layout(
@@ -345,9 +395,9 @@ def update_temp_graph(n):
         ymin = min(y_axis) * 0.999
         ymax = max(y_axis) * 1.001
     data = [
-        go.Scatter(ALL_DATA['rtd_temp'], marker=dict(color=COLOURS['rtd_temp'])),
+        go.Scatter(plot_data('rtd_temp'), marker=dict(color=COLOURS['rtd_temp'])),
         go.Scatter(
-            ALL_DATA['thermocouple_temp'],
+            plot_data('thermocouple_temp'),
             marker=dict(color=COLOURS['thermocouple_temp']),
         ),
     ]
@@ -399,13 +449,13 @@ def update_flow_graph(n):
         else:
             ymax = 10
     data = [
-        go.Scatter(ALL_DATA['flow1'], marker=dict(color=COLOURS['flow1'])),
-        go.Scatter(ALL_DATA['flow2'], marker=dict(color=COLOURS['flow2'])),
-        go.Scatter(ALL_DATA['flow3'], marker=dict(color=COLOURS['flow3'])),
-        go.Scatter(ALL_DATA['flow4'], marker=dict(color=COLOURS['flow4'])),
-        go.Scatter(ALL_DATA['flow5'], marker=dict(color=COLOURS['flow5'])),
+        go.Scatter(plot_data('flow1'), marker=dict(color=COLOURS['flow1'])),
+        go.Scatter(plot_data('flow2'), marker=dict(color=COLOURS['flow2'])),
+        go.Scatter(plot_data('flow3'), marker=dict(color=COLOURS['flow3'])),
+        go.Scatter(plot_data('flow4'), marker=dict(color=COLOURS['flow4'])),
+        go.Scatter(plot_data('flow5'), marker=dict(color=COLOURS['flow5'])),
         go.Scatter(
-            ALL_DATA['flow6'],
+            plot_data('flow6'),
             marker=dict(color=COLOURS['flow6']),
         ),
     ]
@@ -448,7 +498,7 @@ def update_not_in_use_graph(n):
         ymax = max(i for i in lst if i is not None) * 1.001
     data = [
         go.Scatter(
-            ALL_DATA['chamber_pressure'],
+            plot_data('chamber_pressure'),
             marker=dict(color=COLOURS['main_chamber_pressure']),
         )
     ]
@@ -478,7 +528,7 @@ def update_not_in_use_graph(n):
     [Input('intermediate-values', 'children')],
 )
 def update_table(n):
-    """"Update table values"""
+    """ "Update table values"""
     ### Pressure values ###
     chamber_pressure = ALL_DATA['chamber_pressure']
     reactor_pressure = ALL_DATA['reactor_pressure']
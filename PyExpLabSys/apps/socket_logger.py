@@ -6,9 +6,10 @@ import sys
 import socket
 import time
 from PyExpLabSys.common.utilities import get_logger
-from PyExpLabSys.common.value_logger import ValueLogger
+from PyExpLabSys.common.value_logger import ValueLogger, ValueLoggerGroup
 from PyExpLabSys.common.database_saver import ContinuousDataSaver
 from PyExpLabSys.common.sockets import DateDataPullSocket
+from PyExpLabSys.common.scheduler import Scheduler
 from PyExpLabSys.common.supported_versions import python2_and_3
 
 python2_and_3(__file__)
@@ -31,59 +32,60 @@ LOGGER = get_logger(
 
 
 class SocketReaderClass(threading.Thread):
-    """ Read the wanted socket """
+    """Read the wanted socket and publish the values"""
 
-    def __init__(self, host, port, command):
+    def __init__(self, host, port, command, publish, interval=1):
         threading.Thread.__init__(self)
         self.host = host
         self.port = port
         self.command = command + '#raw'
         self.command = self.command.encode()
+        self.publish = publish
+        self.interval = interval
         self.current_value = None
         self.quit = False
-        self.ttl = 10
+        # Give up after this many seconds without a value
+        self.ttl = 20
+        self.last_success = time.time()
 
     def value(self):
-        """ return current value """
-        self.ttl = self.ttl - 1
-        print(self.ttl)
-        if self.ttl > 0:
-            return self.current_value
-        else:
-            self.quit = True
-            # Consider to keep program running even in case of
-            # socket failures
+        """return current value"""
+        return self.current_value
+
+    def update(self):
+        """Read the socket once and publish the value"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.settimeout(min(1, self.interval))
+        try:
+            sock.sendto(self.command, (self.host, self.port))
+            received = sock.recv(1024)
+            received = received.decode('ascii')
+            self.current_value = float(received[received.find(',') + 1 :])
+            self.last_success = time.time()
+            self.publish(self.current_value)
+        except (socket.timeout, ValueError) as e:
+            print(e)  # LOG THIS
+            if time.time() - self.last_success > self.ttl:
+                # Consider to keep program running even in case of
+                # socket failures
+                self.quit = True
+        sock.close()
+
+    def register(self, scheduler, name):
+        """Register update as a task with a scheduler, instead of starting the
+        thread"""
+        return scheduler.add_task(name, self.update, self.interval)
 
     def run(self):
         while not self.quit:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.settimeout(1)
-            try:
-                sock.sendto(self.command, (self.host, self.port))
-                received = sock.recv(1024)
-                received = received.decode('ascii')
-                self.current_value = float(received[received.find(',') + 1 :])
-                self.ttl = 20
-            except (socket.timeout, ValueError) as e:
-                print(e)  # LOG THIS
-            time.sleep(1)
+            self.update()
+            time.sleep(self.interval)
 
 
 def main():
-    """ Main function """
+    """Main function"""
 
-    codenames = []
-    for channel in settings.channels.values():
-        channel['reader'] = SocketReaderClass(
-            channel['host'], channel['port'], channel['command']
-        )
-        channel['reader'].start()
-        channel['logger'] = ValueLogger(
-            channel['reader'], comp_val=channel['comp_value']
-        )
-        channel['logger'].daemon = True
-        channel['logger'].start()
-        codenames.append(channel['codename'])
+    codenames = [channel['codename'] for channel in settings.channels.values()]
 
     try:
         port = settings.port_number
@@ -102,23 +104,48 @@ def main():
     )
     db_logger.start()
 
-    time.sleep(2)
+    def save(codename, points):
+        """Save the points of a triggered logger"""
+        for point in points:
+            print(codename, point)
+            db_logger.save_point(codename, point)
+
+    # The readers push their values into one group of value loggers, that evaluates
+    # them in a single thread and calls save on triggers
+    logger_group = ValueLoggerGroup(callback=save)
+    logger_group.start()
+    # All socket readers are run as tasks by one scheduler thread
+    scheduler = Scheduler()
+    for channel in settings.channels.values():
+        codename = channel['codename']
+        channel['logger'] = ValueLogger(None, comp_val=channel['comp_value'])
+        logger_group.add_logger(codename, channel['logger'])
+        publish_to_group = logger_group.publisher(codename)
+
+        def publish(value, codename=codename, publish_to_group=publish_to_group):
+            """Publish a new value to the pull socket and the value logger"""
+            pullsocket.set_point_now(codename, value)
+            publish_to_group(value)
+
+        channel['reader'] = SocketReaderClass(
+            channel['host'],
+            channel['port'],
+            channel['command'],
+            publish,
+            interval=channel.get('interval', 1),
+        )
+        channel['reader'].register(scheduler, codename)
+    scheduler.start()
 
     everything_ok = True
     while everything_ok:
-        time.sleep(0.25)
+        time.sleep(1)
         for channel in settings.channels.values():
-            if not channel['reader'].is_alive():
+            if channel['reader'].quit:
                 everything_ok = False
                 # Report error here!!!
                 # Consider to keep program running even in case of
                 # socket failures
-            value = channel['logger'].read_value()
-            pullsocket.set_point_now(channel['codename'], value)
-            if channel['logger'].read_trigged():
-                print(value)
-                db_logger.save_point_now(channel['codename'], value)
-                channel['logger'].clear_trigged()
 
 
 if __name__ == '__main__':
@@ -2,6 +2,7 @@
 from __future__ import print_function
 import threading
 import time
+import logging
 from PyExpLabSys.common.sockets import DateDataPullSocket
 from PyExpLabSys.common.sockets import DataPushSocket
 from PyExpLabSys.common.sockets import LiveSocket
@@ -12,6 +13,9 @@ except ImportError:
     # Newer versions of ABElectronics Python code import from this location
     from ADCDACPi import ADCDACPi
 
+LOG = logging.getLogger(__name__)
+LOG.addHandler(logging.NullHandler())
+
 
 class AnalogMFC(object):
     """Driver for controling an analog MFC (or PC) with
@@ -25,7 +29,7 @@ class AnalogMFC(object):
         self.daq.set_adc_refvoltage(3.3)
 
     def read_flow(self):
-        """ Read the flow (or pressure) value """
+        """Read the flow (or pressure) value"""
         value = 0
         for _ in range(0, 10):  # Average to minimiza noise
             value += self.daq.read_adc_voltage(1, 1)
@@ -35,7 +39,7 @@ class AnalogMFC(object):
         return flow
 
     def set_flow(self, flow):
-        """ Set the wanted flow (or pressure) """
+        """Set the wanted flow (or pressure)"""
         voltage = flow * self.voltagespan / self.fullrange
         print('Voltage: ' + str(voltage))
         self.daq.set_dac_voltage(1, voltage)
@@ -43,7 +47,7 @@ class AnalogMFC(object):
 
 
 class FlowControl(threading.Thread):
-    """ Keep updated values of the current flow or pressure """
+    """Keep updated values of the current flow or pressure"""
 
     def __init__(self, mfcs, name):
         threading.Thread.__init__(self)
@@ -68,23 +72,32 @@ class FlowControl(threading.Thread):
         self.running = True
 
     def value(self, device):
-        """ Return the current value of a device """
+        """Return the current value of a device"""
         return self.values[device]
 
+    def update(self):
+        """Set the flows requested on the push socket and read all flows"""
+        qsize = self.pushsocket.queue.qsize()
+        while qsize > 0:
+            LOG.debug('queue-size: %s', qsize)
+            element = self.pushsocket.queue.get()
+            mfc = list(element.keys())[0]
+            self.mfcs[mfc].set_flow(element[mfc])
+            qsize = self.pushsocket.queue.qsize()
+
+        for mfc in self.mfcs:
+            flow = self.mfcs[mfc].read_flow()
+            self.values[mfc] = flow
+            LOG.debug('%s: %s', mfc, flow)
+            self.pullsocket.set_point_now(mfc, flow)
+            self.livesocket.set_point_now(mfc, flow)
+
+    def register(self, scheduler, period=0.1, name=None):
+        """Register update as a task with a :class:`.Scheduler`, instead of starting
+        the thread. The task name defaults to the (unique) thread name."""
+        return scheduler.add_task(name or self.name, self.update, period)
+
     def run(self):
         while self.running:
             time.sleep(0.1)
-            qsize = self.pushsocket.queue.qsize()
-            while qsize > 0:
-                print('queue-size: ' + str(qsize))
-                element = self.pushsocket.queue.get()
-                mfc = list(element.keys())[0]
-                self.mfcs[mfc].set_flow(element[mfc])
-                qsize = self.pushsocket.queue.qsize()
-
-            for mfc in self.mfcs:
-                flow = self.mfcs[mfc].read_flow()
-                self.values[mfc] = flow
-                print(flow)
-                self.pullsocket.set_point_now(mfc, flow)
-                self.livesocket.set_point_now(mfc, flow)
+            self.update()
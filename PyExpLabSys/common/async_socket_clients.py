@@ -0,0 +1,171 @@
+"""This file implements asyncio clients for the pull sockets
+
+The functions in this module send their requests concurrently, so that getting
+values from many sockets, possibly on many hosts, takes as long as the slowest
+reply (or the timeout) instead of the sum of them, and a host that does not answer
+only costs its own timeout::
+
+    import asyncio
+    from PyExpLabSys.common.async_socket_clients import multi_request, get_fields
+
+    replies = asyncio.run(multi_request({
+        'temperature': ('rasppi05', 9000, 'temperature#raw'),
+        'pressure': ('rasppi16', 9000, 'M11200362H#raw', 0.5),  # 0.5 s timeout
+    }))
+    values = asyncio.run(get_fields({
+        'flow1': ('rasppi16', 9000, 'M11200362C'),
+        'flow2': ('rasppi16', 9000, 'M11200362A'),
+    }))
+
+Every request is sent from its own UDP socket, so the replies are correlated with the
+requests by the socket they arrive on, also for several requests to the same host and
+port. Failed requests do not raise; their results are the exceptions (e.g.
+:class:`asyncio.TimeoutError`), so the results of the other requests are still
+available.
+
+This module is Python 3 only.
+"""
+
+import json
+import asyncio
+
+from PyExpLabSys.common.supported_versions import python3_only
+
+python3_only(__file__)
+
+#: The default timeout in seconds of a request
+TIMEOUT = 1.0
+
+
+class _ReplyProtocol(asyncio.DatagramProtocol):
+    """Protocol that sets the result of a future to the first datagram it receives"""
+
+    def __init__(self, future):
+        self.future = future
+
+    def datagram_received(self, data, addr):
+        if not self.future.done():
+            self.future.set_result(data)
+
+    def error_received(self, exc):
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+async def _request(host, port, command):
+    """Send command and return the reply as bytes"""
+    loop = asyncio.get_event_loop()
+    future = loop.create_future()
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: _ReplyProtocol(future), remote_addr=(host, port)
+    )
+    try:
+        transport.sendto(command.encode('utf-8'))
+        return await future
+    finally:
+        transport.close()
+
+
+async def request(host, command, port=9000, timeout=TIMEOUT):
+    """Send a command to a socket and return the reply
+
+    Args:
+        host (str): The host name or IP address
+        command (str): The command, e.g. 'codename#raw'
+        port (int): The port
+        timeout (float): The timeout in seconds, including the name lookup
+
+    Returns:
+        bytes: The reply
+
+    Raises:
+        asyncio.TimeoutError: If no reply arrived in time
+        OSError: On network errors, like a refused connection
+    """
+    return await asyncio.wait_for(_request(host, port, command), timeout)
+
+
+async def multi_request(requests, timeout=TIMEOUT):
+    """Send many requests concurrently and return the decoded replies
+
+    Args:
+        requests (dict): Keys to requests mapping. A request is a (host, port,
+            command) or a (host, port, command, timeout) tuple
+        timeout (float): The timeout for the requests, that do not have their own
+
+    Returns:
+        dict: Keys to results mapping. The result is the reply as a str or the
+        exception, if the request failed
+    """
+    keys = list(requests)
+    coroutines = []
+    for key in keys:
+        host, port, command = requests[key][:3]
+        request_timeout = requests[key][3] if len(requests[key]) > 3 else timeout
+        coroutines.append(request(host, command, port=port, timeout=request_timeout))
+    results = await asyncio.gather(*coroutines, return_exceptions=True)
+    return {
+        key: result.decode('utf-8') if isinstance(result, bytes) else result
+        for key, result in zip(keys, results)
+    }
+
+
+async def get_many(host, codenames, port=9000, timeout=TIMEOUT):
+    """Get several values from one pull socket with a single ``json_wn`` request
+
+    Args:
+        host (str): The host name or IP address
+        codenames (list): The codenames to get
+        port (int): The port
+        timeout (float): The timeout in seconds
+
+    Returns:
+        dict: Codenames to values mapping. The values are [x, y] lists or
+        :data:`.socket_clients.OLD_DATA`
+
+    Raises:
+        ValueError: If a codename is not on the socket
+        asyncio.TimeoutError: If no reply arrived in time
+    """
+    reply = await request(host, 'json_wn', port=port, timeout=timeout)
+    data = json.loads(reply.decode('utf-8'))
+    unknown = set(codenames) - set(data)
+    if unknown:
+        message = 'Unknown codenames {} on the socket at {}:{}'
+        raise ValueError(message.format(sorted(unknown), host, port))
+    return {codename: data[codename] for codename in codenames}
+
+
+async def get_fields(fields, timeout=TIMEOUT):
+    """Get values from many pull sockets, with one ``json_wn`` request per socket
+
+    Args:
+        fields (dict): Keys to (host, port, codename) tuples mapping
+        timeout (float): The timeout in seconds of each request
+
+    Returns:
+        dict: Keys to results mapping. The result is the value ([x, y] list or
+        :data:`.socket_clients.OLD_DATA`) or the exception, if the request for the
+        socket failed
+    """
+    sockets = {}
+    for key, (host, port, codename) in fields.items():
+        sockets.setdefault((host, port), []).append((key, codename))
+    addresses = list(sockets)
+    results = await asyncio.gather(
+        *[
+            get_many(
+                host,
+                [codename for _, codename in sockets[(host, port)]],
+                port=port,
+                timeout=timeout,
+            )
+            for host, port in addresses
+        ],
+        return_exceptions=True
+    )
+    out = {}
+    for address, result in zip(addresses, results):
+        for key, codename in sockets[address]:
+            out[key] = result if isinstance(result, Exception) else result[codename]
+    return out
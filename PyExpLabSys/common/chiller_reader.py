@@ -9,7 +9,7 @@ python2_and_3(__file__)
 
 
 class ChillerReader(threading.Thread):
-    """ Reader class that will monitor a polyscience chiller """
+    """Reader class that will monitor a polyscience chiller"""
 
     def __init__(self, serial_port):
         threading.Thread.__init__(self)
@@ -24,9 +24,10 @@ class ChillerReader(threading.Thread):
         self.ttl = 100
         self.quit = False
         self.daemon = True
+        self.task = None
 
     def value(self, channel):
-        """ Return the value of the reader """
+        """Return the value of the reader"""
         self.ttl = self.ttl - 1
         if self.ttl < 0:
             self.quit = True
@@ -42,14 +43,32 @@ class ChillerReader(threading.Thread):
             return_val = self.status['setpoint']
         return return_val
 
+    def update(self):
+        """Read all values from the chiller"""
+        self.status['temp'] = self.chiller.read_temperature()
+        self.status['flow'] = self.chiller.read_flow_rate()
+        self.status['temp_amb'] = self.chiller.read_ambient_temperature()
+        self.status['pressure'] = self.chiller.read_pressure()
+        self.status['setpoint'] = self.chiller.read_setpoint()
+        self.status['running'] = self.chiller.read_status()
+        self.ttl = 100
+
+    def register(self, scheduler, period=1.0, name=None):
+        """Register the reader as a task with a :class:`.Scheduler`, instead of
+        starting it as a thread. The task name defaults to the (unique) thread name."""
+        self.task = scheduler.add_task(
+            name or self.name, self._scheduled_update, period
+        )
+        return self.task
+
+    def _scheduled_update(self):
+        """Update, or cancel the task after quit has been set"""
+        if self.quit:
+            self.task.cancel()
+            return
+        self.update()
+
     def run(self):
         while not self.quit:
-            print(self.ttl)
-            self.status['temp'] = self.chiller.read_temperature()
-            self.status['flow'] = self.chiller.read_flow_rate()
-            self.status['temp_amb'] = self.chiller.read_ambient_temperature()
-            self.status['pressure'] = self.chiller.read_pressure()
-            self.status['setpoint'] = self.chiller.read_setpoint()
-            self.status['running'] = self.chiller.read_status()
-            self.ttl = 100
+            self.update()
             time.sleep(1)
@@ -0,0 +1,733 @@
+# pylint: disable=too-many-arguments,too-many-instance-attributes,no-member
+
+"""Storage backends for the savers in :mod:`PyExpLabSys.common.database_saver`
+
+The savers in :mod:`.database_saver` form their queries in the MySQL dialect and
+execute them on a connection, that they get from a backend. A backend is an object
+with two methods:
+
+* ``connect()``, which returns a new connection. The connection must implement the
+  parts of the DB API 2.0 (:pep:`249`) that the savers use: ``cursor()``, ``commit()``
+  and ``close()`` on the connection and ``execute(query, args)``, ``fetchall()`` and
+  ``lastrowid`` on the cursor.
+* ``translate(query)``, which translates a query in the MySQL dialect, with ``%s``
+  placeholders, to the dialect of the backend.
+
+Three backends are available:
+
+* :class:`.MySQLBackend`, the default, which connects to the MySQL server in the
+  settings, like the savers always have
+* :class:`.SQLiteBackend`, which saves to a local SQLite file
+* :class:`.ParquetBackend` and :class:`.HDF5Backend`, which appends the data to local
+  columnar files in row groups
+
+The latter two make it possible to log at full rate locally and ship the data later,
+and to run the savers on a machine with no database server.
+
+A backend can be wrapped in a :class:`.ConnectionPool`, which is itself a backend, to
+share connections between savers. When no backend is given, the savers use a process
+wide pool of MySQL connections per username, see :func:`.get_shared_pool`.
+
+To use another backend, pass it to the saver, e.g::
+
+    from PyExpLabSys.common.database_saver import ContinuousDataSaver
+    from PyExpLabSys.common.database_backends import SQLiteBackend
+
+    backend = SQLiteBackend('/home/pi/data.sqlite', schema=SQLITE_SCHEMA)
+    saver = ContinuousDataSaver('dateplots_dummy', None, None, backend=backend)
+
+"""
+
+import os
+import re
+import time
+import socket
+import sqlite3
+import logging
+import threading
+
+try:
+    import MySQLdb
+except ImportError:
+    try:
+        import pymysql as MySQLdb
+
+        MySQLdb.install_as_MySQLdb()
+    except ImportError:
+        MySQLdb = None  # pylint: disable=invalid-name
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # pylint: disable=invalid-name
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None  # pylint: disable=invalid-name
+
+try:
+    import h5py
+except ImportError:
+    h5py = None  # pylint: disable=invalid-name
+
+from ..settings import Settings
+
+SETTINGS = Settings()
+
+LOG = logging.getLogger(__name__)
+LOG.addHandler(logging.NullHandler())
+
+# The time in seconds to cache the result of a hostname lookup
+HOST_CACHE_TIME = 300
+# Cache of hostname lookups {hostname: (ip_address, lookup_time)}
+_HOST_CACHE = {}
+# Process wide connection pools {(username, password): ConnectionPool}
+_SHARED_POOLS = {}
+_SHARED_POOLS_LOCK = threading.Lock()
+
+# Placeholders wrapped in FROM_UNIXTIME, which converts unix time to a MySQL timestamp
+FROM_UNIXTIME = re.compile(r'FROM_UNIXTIME\(\s*%s\s*\)', re.IGNORECASE)
+# The INSERT queries the savers form e.g:
+# INSERT INTO table (a, b, c) VALUES (%s, FROM_UNIXTIME(%s), %s), (%s, ...);
+INSERT = re.compile(
+    r'^\s*INSERT\s+INTO\s+`?(\w+)`?\s*\(([^)]*)\)\s*VALUES\s*(.*?)\s*;?\s*$',
+    re.IGNORECASE | re.DOTALL,
+)
+# The simple SELECT queries that the columnar backends answer from lookup tables e.g:
+# SELECT codename, id FROM dateplots_descriptions WHERE codename IN (%s, %s)
+SIMPLE_SELECT = re.compile(
+    r'^\s*SELECT\s+([\w`,\s]+?)\s+FROM\s+`?(\w+)`?\s+WHERE\s+`?(\w+)`?\s*'
+    r'(?:=\s*%s|IN\s*\(\s*%s(?:\s*,\s*%s)*\s*\))\s*;?\s*$',
+    re.IGNORECASE,
+)
+
+
+class MySQLBackend(object):
+    """Backend for the MySQL server in the settings
+
+    The host and database are ``SETTINGS.sql_server_host`` and
+    ``SETTINGS.sql_database``, read at the time of each call to :meth:`connect`.
+
+    Attributes:
+        username (str): The MySQL username
+        password (str): The MySQL password
+    """
+
+    def __init__(self, username, password):
+        """Initialize local variables
+
+        Args:
+            username (str): The MySQL username
+            password (str): The MySQL password
+        """
+        self.username = username
+        self.password = password
+
+    def connect(self):
+        """Return a new MySQLdb connection"""
+        if MySQLdb is None:
+            raise RuntimeError(
+                'The MySQL backend requires MySQLdb (mysqlclient) or pymysql'
+            )
+        return MySQLdb.connect(
+            host=resolve_host(SETTINGS.sql_server_host),
+            user=self.username,
+            passwd=self.password,
+            db=SETTINGS.sql_database,
+        )
+
+    @staticmethod
+    def translate(query):
+        """Return query unchanged, the savers queries are in the MySQL dialect"""
+        return query
+
+
+def resolve_host(hostname):
+    """Return the IP address of hostname, cached for ``HOST_CACHE_TIME`` seconds"""
+    now = time.time()
+    try:
+        ip_address, lookup_time = _HOST_CACHE[hostname]
+        if now - lookup_time < HOST_CACHE_TIME:
+            return ip_address
+    except KeyError:
+        pass
+    ip_address = socket.gethostbyname(hostname)
+    _HOST_CACHE[hostname] = (ip_address, now)
+    return ip_address
+
+
+class SQLiteBackend(object):
+    """Backend for a local SQLite file
+
+    Queries are translated from the MySQL dialect by replacing the ``%s`` placeholders
+    with ``?``. Timestamps given to ``FROM_UNIXTIME`` are saved as unix time. The tables
+    must exist, or be created by the ``schema`` script, e.g. for continuous data::
+
+        SQLITE_SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS dateplots_descriptions
+            (id INTEGER PRIMARY KEY, codename TEXT UNIQUE);
+        CREATE TABLE IF NOT EXISTS dateplots_dummy
+            (id INTEGER PRIMARY KEY, type INTEGER, time REAL, value REAL);
+        '''
+
+    Attributes:
+        path (str): The path of the SQLite file
+        schema (str): SQL script executed on every connect or None
+    """
+
+    def __init__(self, path, schema=None):
+        """Initialize local variables
+
+        Args:
+            path (str): The path of the SQLite file
+            schema (str): Optional SQL script executed on every connect, typically a
+                number of ``CREATE TABLE IF NOT EXISTS`` statements
+        """
+        self.path = path
+        self.schema = schema
+
+    def connect(self):
+        """Return a new sqlite3 connection"""
+        # The connections are handed between threads e.g. by a connection pool, but
+        # only ever used by one at a time
+        connection = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+        if self.schema is not None:
+            connection.executescript(self.schema)
+        return connection
+
+    @staticmethod
+    def translate(query):
+        """Return query translated from the MySQL to the SQLite dialect"""
+        return FROM_UNIXTIME.sub('%s', query).replace('%s', '?')
+
+
+class ColumnarFileBackend(object):
+    """Base class for backends that append the data to local columnar files
+
+    The connections from these backends only understand the INSERT queries that the
+    savers form and ``SELECT columns FROM table WHERE other_column=%s`` (or
+    ``other_column IN (%s, ...)``) queries, which are answered from the
+    ``lookup_tables``. Timestamps given to ``FROM_UNIXTIME`` are
+    saved as unix time.
+
+    Rows are buffered in memory per table and written in row groups of
+    ``row_group_size`` rows, when a connection commits. The remaining rows are written
+    when the last open connection is closed or on :meth:`flush`. All connections from
+    one backend share the same buffers and files.
+
+    Every table gets an ``id`` column, unless one is inserted explicitly, that numbers
+    the rows continuing from what is already on disk. It is used as ``lastrowid``, so
+    e.g. :meth:`.DataSetSaver.add_measurement` gets a unique measurement id.
+
+    Subclasses must implement :meth:`_write_row_group`, :meth:`_row_count` and
+    :meth:`_close_files`.
+
+    Attributes:
+        directory (str): The directory the files are written to
+        row_group_size (int): The number of rows per table to buffer before writing
+        lookup_tables (dict): Mapping of table names to lists of rows (dicts) used to
+            answer SELECT queries
+    """
+
+    def __init__(self, directory, row_group_size=10000, lookup_tables=None):
+        """Initialize local variables
+
+        Args:
+            directory (str): The directory to write the files to. It is created if
+                it does not exist.
+            row_group_size (int): The number of rows per table to buffer before a
+                row group is written. Default is 10000.
+            lookup_tables (dict): Mapping of table names to lists of rows (dicts) used
+                to answer SELECT queries, e.g. ``{'dateplots_descriptions': [{'id': 1,
+                'codename': 'dummy_sine_one'}]}``
+        """
+        self.directory = directory
+        self.row_group_size = row_group_size
+        self.lookup_tables = lookup_tables or {}
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._lock = threading.RLock()
+        self._open_connections = 0
+        # Buffers are {table: {column: [values]}} and row counters {table: int}
+        self._buffers = {}
+        self._row_counts = {}
+
+    def connect(self):
+        """Return a new connection"""
+        with self._lock:
+            self._open_connections += 1
+        return ColumnarFileConnection(self)
+
+    @staticmethod
+    def translate(query):
+        """Return query unchanged, the connections parse the MySQL dialect"""
+        return query
+
+    def insert(self, table, columns, rows):
+        """Add rows to the buffer of table
+
+        Args:
+            table (str): The table name
+            columns (list): The column names
+            rows (list): List of rows, which are sequences of values
+
+        Returns:
+            int: The id of the last inserted row
+        """
+        with self._lock:
+            if table not in self._row_counts:
+                self._row_counts[table] = self._row_count(table)
+            buffer_ = self._buffers.setdefault(table, {})
+            if not buffer_:
+                for column in columns:
+                    buffer_[column] = []
+                if 'id' not in buffer_:
+                    buffer_['id'] = []
+            elif set(columns) | {'id'} != set(buffer_):
+                msg = 'Columns {} do not match the earlier inserts to {}: {}'
+                raise ValueError(msg.format(columns, table, list(buffer_)))
+
+            for row in rows:
+                self._row_counts[table] += 1
+                for column, value in zip(columns, row):
+                    buffer_[column].append(value)
+                if 'id' not in columns:
+                    buffer_['id'].append(self._row_counts[table])
+            return self._row_counts[table]
+
+    def select(self, columns, table, where_column, values):
+        """Return the rows for a simple select from the lookup tables
+
+        Args:
+            columns (list): The column names to return
+            table (str): The table name
+            where_column (str): The column name to select on
+            values (sequence): The values of where_column to select
+
+        Returns:
+            list: List of tuples of the values of columns
+        """
+        try:
+            rows = self.lookup_tables[table]
+        except KeyError:
+            msg = 'Table {} is not in the lookup tables of {}'
+            raise ValueError(msg.format(table, self.__class__.__name__))
+        return [
+            tuple(row[column] for column in columns)
+            for row in rows
+            if row[where_column] in values
+        ]
+
+    def flush(self, minimum_rows=0):
+        """Write the buffered rows of all tables that has at least minimum_rows"""
+        with self._lock:
+            for table, buffer_ in self._buffers.items():
+                number_of_rows = len(buffer_.get('id', ()))
+                if number_of_rows > 0 and number_of_rows >= minimum_rows:
+                    start = time.time()
+                    self._write_row_group(table, buffer_)
+                    LOG.debug(
+                        'Wrote %s rows to %s in %.3f s',
+                        number_of_rows,
+                        table,
+                        time.time() - start,
+                    )
+                    for values in buffer_.values():
+                        del values[:]
+
+    def close_connection(self):
+        """Register that a connection is closed, flush and close files for the last"""
+        with self._lock:
+            self._open_connections -= 1
+            if self._open_connections <= 0:
+                self._open_connections = 0
+                self.flush()
+                self._close_files()
+
+    def _write_row_group(self, table, columns):
+        """Write a row group
+
+        Args:
+            table (str): The table name
+            columns (dict): Mapping of column names to lists of values
+        """
+        raise NotImplementedError
+
+    def _row_count(self, table):
+        """Return the number of rows already on disk for table"""
+        raise NotImplementedError
+
+    def _close_files(self):
+        """Close all open files"""
+        raise NotImplementedError
+
+
+class ColumnarFileConnection(object):
+    """Connection (and cursor) for a :class:`ColumnarFileBackend`
+
+    The connection is its own cursor. See :class:`ColumnarFileBackend` for the queries
+    that are understood.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.lastrowid = None
+        self._results = []
+        self._closed = False
+
+    def cursor(self):
+        """Return the cursor, which is the connection itself"""
+        return self
+
+    def execute(self, query, args=None):
+        """Execute an INSERT or simple SELECT query
+
+        Args:
+            query (str): The query in the MySQL dialect, see
+                :class:`ColumnarFileBackend` for the supported queries
+            args (sequence): The query arguments
+        """
+        args = list(args or ())
+        match = INSERT.match(query)
+        if match:
+            table, column_string, values_string = match.groups()
+            columns = [column.strip(' `') for column in column_string.split(',')]
+            number_of_markers = values_string.count('%s')
+            if number_of_markers != len(args) or number_of_markers % len(columns) != 0:
+                msg = 'Cannot map {} arguments to the columns {} in {}'
+                raise ValueError(msg.format(len(args), columns, table))
+            rows = [
+                args[start : start + len(columns)]
+                for start in range(0, len(args), len(columns))
+            ]
+            self.lastrowid = self.backend.insert(table, columns, rows)
+            return len(rows)
+
+        match = SIMPLE_SELECT.match(query)
+        if match:
+            column_string, table, where_column = match.groups()
+            columns = [column.strip(' `') for column in column_string.split(',')]
+            self._results = self.backend.select(columns, table, where_column, args)
+            return len(self._results)
+
+        msg = '{} only supports INSERT and simple SELECT queries, got: {}'
+        raise NotImplementedError(msg.format(self.backend.__class__.__name__, query))
+
+    def fetchall(self):
+        """Return the results of the last SELECT query"""
+        results, self._results = self._results, []
+        return results
+
+    def commit(self):
+        """Write the tables that have buffered at least a row group of rows"""
+        self.backend.flush(self.backend.row_group_size)
+
+    def close(self):
+        """Close the connection"""
+        if not self._closed:
+            self._closed = True
+            self.backend.close_connection()
+
+
+class ParquetBackend(ColumnarFileBackend):
+    """Backend that appends the data to Parquet files (requires pyarrow)
+
+    Every table is a directory in ``directory`` and every time the backend is used, a
+    new file (named by the unix time) is written, in which each row group is
+    appended. The column types are inferred from the first row group. The table can be
+    read e.g. with ``pyarrow.parquet.read_table(os.path.join(directory, table))``.
+
+    .. note:: A Parquet file is only readable after it has been closed, that is when
+        the last connection from the backend is closed.
+    """
+
+    def __init__(self, directory, row_group_size=10000, lookup_tables=None):
+        if pyarrow is None:
+            raise RuntimeError('The Parquet backend requires pyarrow')
+        super(ParquetBackend, self).__init__(directory, row_group_size, lookup_tables)
+        self._writers = {}
+
+    def _write_row_group(self, table, columns):
+        """Write a row group"""
+        arrow_table = pyarrow.table(columns)
+        writer = self._writers.get(table)
+        if writer is None:
+            table_directory = os.path.join(self.directory, table)
+            if not os.path.isdir(table_directory):
+                os.makedirs(table_directory)
+            filename = '{:.6f}.parquet'.format(time.time())
+            writer = pyarrow.parquet.ParquetWriter(
+                os.path.join(table_directory, filename), arrow_table.schema
+            )
+            self._writers[table] = writer
+        else:
+            arrow_table = arrow_table.select(writer.schema.names).cast(writer.schema)
+        writer.write_table(arrow_table)
+
+    def _row_count(self, table):
+        """Return the number of rows already on disk for table, from the file footers"""
+        table_directory = os.path.join(self.directory, table)
+        if not os.path.isdir(table_directory):
+            return 0
+        return sum(
+            pyarrow.parquet.ParquetFile(
+                os.path.join(table_directory, name)
+            ).metadata.num_rows
+            for name in os.listdir(table_directory)
+            if name.endswith('.parquet')
+        )
+
+    def _close_files(self):
+        """Close all open files"""
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+
+class HDF5Backend(ColumnarFileBackend):
+    """Backend that appends the data to HDF5 files (requires h5py and numpy)
+
+    Every table is a file named ``table.h5`` in ``directory``, with a resizable 1D
+    dataset per column, which each row group is appended to. The column types are
+    inferred from the first row group and strings are saved as variable length UTF-8.
+    """
+
+    def __init__(self, directory, row_group_size=10000, lookup_tables=None):
+        if h5py is None or numpy is None:
+            raise RuntimeError('The HDF5 backend requires h5py and numpy')
+        super(HDF5Backend, self).__init__(directory, row_group_size, lookup_tables)
+        self._files = {}
+
+    def _file(self, table):
+        """Return the open file for table"""
+        if table not in self._files:
+            path = os.path.join(self.directory, table + '.h5')
+            self._files[table] = h5py.File(path, 'a')
+        return self._files[table]
+
+    def _write_row_group(self, table, columns):
+        """Write a row group"""
+        file_ = self._file(table)
+        for column, values in columns.items():
+            if column in file_:
+                dataset = file_[column]
+                array = numpy.asarray(values, dtype=dataset.dtype)
+            else:
+                array = numpy.asarray(values)
+                if array.dtype.kind in 'USO':
+                    array = numpy.asarray(values, dtype=h5py.string_dtype())
+                dataset = file_.create_dataset(
+                    column,
+                    shape=(0,),
+                    maxshape=(None,),
+                    dtype=array.dtype,
+                    chunks=(max(len(array), 1),),
+                )
+            start = dataset.shape[0]
+            dataset.resize((start + len(array),))
+            dataset[start:] = array
+        file_.flush()
+
+    def _row_count(self, table):
+        """Return the number of rows already on disk for table"""
+        if not os.path.isfile(os.path.join(self.directory, table + '.h5')):
+            return 0
+        file_ = self._file(table)
+        if 'id' not in file_:
+            return 0
+        return file_['id'].shape[0]
+
+    def _close_files(self):
+        """Close all open files"""
+        for file_ in self._files.values():
+            file_.close()
+        self._files = {}
+
+
+POOL_LOG = logging.getLogger(__name__ + '.ConnectionPool')
+POOL_LOG.addHandler(logging.NullHandler())
+
+
+class ConnectionPool(object):
+    """A thread safe pool of connections from a backend, which is itself a backend
+
+    :meth:`connect` hands out an idle connection from the pool if there is one, and
+    otherwise opens a new one from the wrapped backend. Closing the handed out
+    connection returns it to the pool, after ending any open transaction with
+    ``rollback()``, so the next borrower does not read from a stale snapshot or wait on
+    locks held by it. A connection that fails the rollback is closed instead. Before an
+    idle connection is handed out, it is health checked with ``ping()``, if the
+    connection has such a method (MySQL connections do), and replaced if the check
+    fails.
+
+    If opening a new connection fails, new attempts are refused (with a
+    :py:class:`ConnectionError`) for a back off time, which starts at ``min_backoff``
+    and is doubled for every consecutive failure, up to ``max_backoff``. This prevents
+    reconnect storms, when several savers lose the connection at the same time.
+
+    The translations of queries by the wrapped backend are cached.
+
+    Attributes:
+        backend (object): The wrapped backend
+        max_idle (int): The maximum number of idle connections kept in the pool
+        min_backoff (float): The first back off time in seconds after a failed connect
+        max_backoff (float): The maximum back off time in seconds
+        opened (int): The number of connections opened from the backend
+        reused (int): The number of times an idle connection was handed out
+    """
+
+    def __init__(self, backend, max_idle=4, min_backoff=1.0, max_backoff=60.0):
+        """Initialize local variables
+
+        Args:
+            backend (object): The backend to pool connections from
+            max_idle (int): The maximum number of idle connections kept in the pool.
+                Default is 4.
+            min_backoff (float): The first back off time in seconds after a failed
+                connect. Default is 1.0.
+            max_backoff (float): The maximum back off time in seconds. Default is 60.0.
+        """
+        POOL_LOG.info('Init with backend: %s', backend)
+        self.backend = backend
+        self.max_idle = max_idle
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.opened = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+        self._idle = []
+        self._backoff = 0.0
+        self._next_attempt = 0.0
+        self._translations = {}
+
+    def connect(self):
+        """Return a :class:`PooledConnection`, from the pool or newly opened
+
+        Raises:
+            ConnectionError: If in the back off time after a failed connect
+        """
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                connection = self._idle.pop()
+            if self._is_healthy(connection):
+                self.reused += 1
+                return PooledConnection(self, connection)
+
+        with self._lock:
+            now = time.time()
+            if now < self._next_attempt:
+                msg = 'Not connecting, backing off for another {:.1f} s after failure'
+                raise ConnectionError(msg.format(self._next_attempt - now))
+            try:
+                connection = self.backend.connect()
+            except Exception:
+                self._backoff = min(
+                    max(2 * self._backoff, self.min_backoff), self.max_backoff
+                )
+                self._next_attempt = now + self._backoff
+                POOL_LOG.error('Connect failed, back off for %.1f s', self._backoff)
+                raise
+            self._backoff = 0.0
+            self.opened += 1
+        POOL_LOG.debug('Opened new connection, %s in total', self.opened)
+        return PooledConnection(self, connection)
+
+    @staticmethod
+    def _is_healthy(connection):
+        """Return whether connection passes the health check, close it if not"""
+        ping = getattr(connection, 'ping', None)
+        if ping is None:
+            return True
+        try:
+            ping()
+            return True
+        # The exceptions depend on the database module
+        except Exception as exception:  # pylint: disable=broad-except
+            POOL_LOG.info('Idle connection failed health check: %s', exception)
+            try:
+                connection.close()
+            except Exception:  # pylint: disable=broad-except
+                pass
+            return False
+
+    def release(self, connection):
+        """Return a connection to the pool or close it if the pool is full
+
+        Any open transaction is rolled back first. If that fails, the connection is
+        considered dead and is closed.
+        """
+        rollback = getattr(connection, 'rollback', None)
+        if rollback is not None:
+            try:
+                rollback()
+            # The exceptions depend on the database module
+            except Exception as exception:  # pylint: disable=broad-except
+                POOL_LOG.info('Released connection failed rollback: %s', exception)
+                try:
+                    connection.close()
+                except Exception:  # pylint: disable=broad-except
+                    pass
+                return
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def translate(self, query):
+        """Return the (cached) translation of query by the wrapped backend"""
+        try:
+            return self._translations[query]
+        except KeyError:
+            translated = self.backend.translate(query)
+            # Bound the cache, queries with formatted values would grow it forever
+            if len(self._translations) > 1000:
+                self._translations.clear()
+            self._translations[query] = translated
+            return translated
+
+    def close(self):
+        """Close all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+class PooledConnection(object):
+    """A connection handed out by a :class:`ConnectionPool`
+
+    All attributes are those of the wrapped connection, except :meth:`close`, which
+    returns it to the pool.
+    """
+
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def close(self):
+        """Return the connection to the pool"""
+        if self._connection is not None:
+            self._pool.release(self._connection)
+            self._connection = None
+
+
+def get_shared_pool(username, password):
+    """Return the process wide :class:`ConnectionPool` of MySQL connections for username
+
+    This is the backend the savers in :mod:`.database_saver` use, when none is given.
+    """
+    with _SHARED_POOLS_LOCK:
+        try:
+            return _SHARED_POOLS[(username, password)]
+        except KeyError:
+            pool = ConnectionPool(MySQLBackend(username, password))
+            _SHARED_POOLS[(username, password)] = pool
+            return pool
@@ -1,30 +1,36 @@
 # pylint: disable=too-many-arguments,too-many-instance-attributes,no-member
 
-"""Classes for saving coninuous data and data sets to a database"""
+"""Classes for saving coninuous data and data sets to a database
+
+Per default the data is saved to the MySQL database in the settings. Other storage
+backends, e.g. a local SQLite file, can be used by passing a ``backend`` to the savers.
+See :mod:`PyExpLabSys.common.database_backends` for details.
+"""
 
 import re
 import time
 import logging
+import os
+import json
 import threading
-import socket
+import pickle
+import sqlite3
 from collections import namedtuple
-from queue import Queue
-
-try:
-    import MySQLdb
-except ImportError:
-    import pymysql as MySQLdb
-
-    MySQLdb.install_as_MySQLdb()
+from functools import lru_cache
+from queue import Queue, Empty
 
-from ..settings import Settings
-
-SETTINGS = Settings()
+from .database_backends import get_shared_pool
 
 # Used for check of valid, un-escaped column names, to prevent injection
 COLUMN_NAME = re.compile(r'^[0-9a-zA-Z$_]*$')
 # namedtuple used for custom column formatting, see MeasurementSaver.__init__
 CustomColumn = namedtuple('CustomColumn', ['value', 'format_string'])
+# Used to split a single row INSERT query into the part before the values and the
+# value marker group, e.g. '(%s, FROM_UNIXTIME(%s), %s)', for multi row inserts
+SINGLE_ROW_INSERT = re.compile(
+    r'^(\s*INSERT\s.+?\sVALUES\s*)(\([^()]*(?:\([^()]*\)[^()]*)*\))\s*;?\s*$',
+    re.IGNORECASE | re.DOTALL,
+)
 
 # Loging object for the DataSetSaver (DSS) shortened, because it will be
 # written a lot
@@ -32,6 +38,14 @@ DSS_LOG = logging.getLogger(__name__ + '.MeasurementSaver')
 DSS_LOG.addHandler(logging.NullHandler())
 
 
+def _as_list(values):
+    """Return values as a list, using the fast tolist method of e.g. numpy arrays"""
+    try:
+        return values.tolist()
+    except AttributeError:
+        return list(values)
+
+
 class DataSetSaver(object):
     """A class to save a measurement
 
@@ -43,9 +57,8 @@ class DataSetSaver(object):
         insert_measurement_query (str): The query used to insert a measurement
         insert_point_query (str): The query used to insert a point
         insert_batch_query (str): The query used to insert a batch of points
-        connection (MySQLdb connection): The database connection used to register new
-            measurements
-        cursor (MySQLdb cursor): The db cursor used to register new measurements
+        backend (object): The storage backend, see :mod:`.database_backends`. A
+            connection is taken from it for each new measurement.
 
     """
 
@@ -56,6 +69,7 @@ class DataSetSaver(object):
         username,
         password,
         measurement_specs=None,
+        backend=None,
     ):
         """Initialize local parameters
 
@@ -66,6 +80,10 @@ class DataSetSaver(object):
             passwork (str): The database password
             measurement_specs (sequence): A sequence of ``measurement_codename,
                 metadata`` pairs, see below
+            backend (object): The storage backend to save to. Default is the process
+                wide pool of MySQL connections for ``username``, see
+                :func:`.get_shared_pool`. See :mod:`.database_backends` for
+                alternatives.
 
         ``measurement_specs`` is used if you want to initialize all the measurements
         at ``__init__`` time. You can also do it later with :meth:`add_measurement`.
@@ -113,7 +131,10 @@ class DataSetSaver(object):
         # Initialize instance variables
         self.measurements_table = measurements_table
         self.xy_values_table = xy_values_table
-        self.sql_saver = SqlSaver(username, password)
+        if backend is None:
+            backend = get_shared_pool(username, password)
+        self.backend = backend
+        self.sql_saver = SqlSaver(username, password, backend=backend)
 
         # Initialize queries
         query = 'INSERT INTO {} ({{}}) values ({{}})'
@@ -124,15 +145,8 @@ class DataSetSaver(object):
         self.insert_batch_query = query.format(xy_values_table)
         query = 'SELECT DISTINCT {{}} from {}'
         self.select_distict_query = query.format(measurements_table)
-
-        # Init local database connection
-        self.connection = MySQLdb.connect(
-            host=socket.gethostbyname(SETTINGS.sql_server_host),
-            user=username,
-            passwd=password,
-            db=SETTINGS.sql_database,
-        )
-        self.cursor = self.connection.cursor()
+        # Cache of batch insert queries, keyed by number of points
+        self._batch_queries = {}
 
         # Initialize measurement ids
         self.measurement_ids = {}
@@ -183,8 +197,14 @@ class DataSetSaver(object):
         query = self.insert_measurement_query.format(column_string, value_marker_string)
 
         # Make the insert and save the measurement_table id for use in saving data
-        self.cursor.execute(query, values)
-        self.measurement_ids[codename] = self.cursor.lastrowid
+        connection = self.backend.connect()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(self.backend.translate(query), values)
+            self.measurement_ids[codename] = cursor.lastrowid
+            connection.commit()
+        finally:
+            connection.close()
         DSS_LOG.debug('Measurement codenamed: \'%s\' added', codename)
 
     def save_point(self, codename, point):
@@ -210,8 +230,10 @@ class DataSetSaver(object):
 
         Args:
             codename (str): The codename for the measurement to save the points for
-            x_values (sequence): A sequence of x values
-            y_values (sequence): A sequence of y values
+            x_values (sequence): A sequence of x values. Numpy arrays are converted
+                without per point Python work
+            y_values (sequence): A sequence of y values. Numpy arrays are converted
+                without per point Python work
             batchsize (int): The number of points to send in the same batch.
                 Defaults to 1000, see the warning below before changing it
 
@@ -239,28 +261,29 @@ class DataSetSaver(object):
             message = 'No entry in measurements_ids for codename: \'{}\''
             raise ValueError(message.format(codename))
 
-        # Gather values in batches of batchsize, start enumerate from 1, to make
-        # the criteria
-        values = []
-        number_of_values = 0
-        for x_value, y_value in zip(x_values, y_values):
-            # Add this point
-            values.extend([measurement_id, x_value, y_value])
-            number_of_values += 1
-
-            # Save a batch (> should not be necessary)
-            if number_of_values >= batchsize:
-                value_marker_string = ', '.join(['(%s, %s, %s)'] * number_of_values)
-                query = self.insert_batch_query.format(value_marker_string)
-                self.sql_saver.enqueue_query(query, values)
-                values = []
-                number_of_values = 0
-
-        # Save the remaining number of points (smaller than the batchsize)
-        if number_of_values > 0:
-            value_marker_string = ', '.join(['(%s, %s, %s)'] * number_of_values)
+        # Form one flat list of measurement_id, x, y values. Arrays (e.g. numpy) are
+        # converted to lists of Python numbers in one call, which avoids per point
+        # Python work and makes the values safe to hand to the database module
+        number_of_points = len(x_values)
+        values = [measurement_id] * (3 * number_of_points)
+        values[1::3] = _as_list(x_values)
+        values[2::3] = _as_list(y_values)
+
+        # Enqueue in batches of batchsize, the last one possibly smaller
+        for start in range(0, number_of_points, batchsize):
+            end = min(start + batchsize, number_of_points)
+            query = self._batch_query(end - start)
+            self.sql_saver.enqueue_query(query, values[3 * start : 3 * end])
+
+    def _batch_query(self, number_of_points):
+        """Return the batch insert query for number_of_points (cached)"""
+        try:
+            return self._batch_queries[number_of_points]
+        except KeyError:
+            value_marker_string = ', '.join(['(%s, %s, %s)'] * number_of_points)
             query = self.insert_batch_query.format(value_marker_string)
-            self.sql_saver.enqueue_query(query, values)
+            self._batch_queries[number_of_points] = query
+            return query
 
     def get_unique_values_from_measurements(
         self, column
@@ -275,8 +298,14 @@ class DataSetSaver(object):
                 SQL processing e.g. UNIX_TIMESTAMP(time). The value of column will
                 be formatted directly into the query.
         """
-        self.cursor.execute(self.select_distict_query.format(column))
-        return set(item[0] for item in self.cursor.fetchall())
+        query = self.backend.translate(self.select_distict_query.format(column))
+        connection = self.backend.connect()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(query)
+            return set(item[0] for item in cursor.fetchall())
+        finally:
+            connection.close()
 
     def start(self):
         """Start the DataSetSaver
@@ -292,8 +321,6 @@ class DataSetSaver(object):
         instance nicely.
         """
         DSS_LOG.info('stop called')
-        self.cursor.close()
-        self.connection.close()
         self.sql_saver.stop()
         DSS_LOG.debug('stopped')
 
@@ -316,12 +343,40 @@ class ContinuousDataSaver(object):
     Continuous measurements are measurements of a single parameters as a function of
     datetime. The class can ONLY be used with the new layout of tables for continous data,
     where there is only one table per setup, as apposed to the old layout where there was
-    one table per measurement type per setup. The class sends data to the hostname and
-    database named in SETTINGS.sql_server_host and SETTINGS.sql_database respectively.
+    one table per measurement type per setup. Per default, the class sends data to the
+    hostname and database named in SETTINGS.sql_server_host and SETTINGS.sql_database
+    respectively, see the ``backend`` argument for alternatives.
+
+    **Codename cache**
+
+    The codenames are translated to measurement ids with a single lookup in the
+    ``dateplots_descriptions`` table. If ``codename_cache_path`` is given, the
+    translations are also saved in that (JSON) file. If the database cannot be reached
+    at the time of the lookup, the translations are taken from the cache instead, so
+    the saver can start and (with a ``spool_path``) save points while offline. The
+    cached translations are checked against the database when it can be reached again,
+    see :meth:`reconcile_codenames`.
+
+    Attributes:
+        codename_translation (dict): Mapping of codenames to measurement ids
+        codename_cache_path (str): The path of the codename cache file or None
+        unverified_codenames (set): The codenames whose translations were taken from
+            the cache and have not yet been checked against the database
+        reconcile_interval (float): The minimum time in seconds between attempts to
+            check unverified codenames from :meth:`save_point`
     """
 
     def __init__(
-        self, continuous_data_table, username, password, measurement_codenames=None
+        self,
+        continuous_data_table,
+        username,
+        password,
+        measurement_codenames=None,
+        batch_max_rows=None,
+        batch_max_latency=1.0,
+        spool_path=None,
+        backend=None,
+        codename_cache_path=None,
     ):
         """Initialize the continous logger
 
@@ -333,6 +388,20 @@ class ContinuousDataSaver(object):
                 logger will send data to. These codenames can be given here, to initialize
                 them at the time of initialization or later by the use of the
                 :meth:`add_continuous_measurement` method.
+            batch_max_rows (int): If given, the underlying :class:`.SqlSaver` is run in
+                batching mode, where up to this many points are saved in one multi row
+                INSERT and commit. See :class:`.SqlSaver` for details.
+            batch_max_latency (float): The maximum time in seconds a point waits for
+                more points in batching mode. Default is 1.0.
+            spool_path (str): If given, the path of an on-disk spool that points are
+                saved to while the database is unreachable. See :class:`.SqlSaver` for
+                details.
+            backend (object): The storage backend to save to. Default is the process
+                wide pool of MySQL connections for ``username``, see
+                :func:`.get_shared_pool`. See :mod:`.database_backends` for
+                alternatives.
+            codename_cache_path (str): If given, the path of a file to cache the
+                codename translations in, see the class documentation
 
         .. note:: The codenames are the 'official' codenames defined in the database for
             contionuous measurements NOT codenames that can be userdefined
@@ -340,32 +409,41 @@ class ContinuousDataSaver(object):
         """
         CDS_LOG.info(
             '__init__ with continuous_data_table=%s, username=%s, password=*****, '
-            'measurement_codenames=%s',
+            'measurement_codenames=%s, batch_max_rows=%s, batch_max_latency=%s, '
+            'spool_path=%s, codename_cache_path=%s',
             continuous_data_table,
             username,
             measurement_codenames,
+            batch_max_rows,
+            batch_max_latency,
+            spool_path,
+            codename_cache_path,
         )
 
         # Initialize instance variables
         self.continuous_data_table = continuous_data_table
-        self.sql_saver = SqlSaver(username, password)
+        if backend is None:
+            backend = get_shared_pool(username, password)
+        self.backend = backend
+        self.sql_saver = SqlSaver(
+            username,
+            password,
+            batch_max_rows=batch_max_rows,
+            batch_max_latency=batch_max_latency,
+            spool_path=spool_path,
+            backend=backend,
+        )
         self.username = username
         self.password = password
 
-        # Init local database connection
-        self.connection = MySQLdb.connect(
-            host=socket.gethostbyname(SETTINGS.sql_server_host),
-            user=username,
-            passwd=password,
-            db=SETTINGS.sql_database,
-        )
-        self.cursor = self.connection.cursor()
-
         # Dict used to translate code_names to measurement numbers
         self.codename_translation = {}
+        self.codename_cache_path = codename_cache_path
+        self.unverified_codenames = set()
+        self.reconcile_interval = 60
+        self._last_reconcile = time.time()
         if measurement_codenames is not None:
-            for codename in measurement_codenames:
-                self.add_continuous_measurement(codename)
+            self.add_continuous_measurements(measurement_codenames)
 
     def add_continuous_measurement(self, codename):
         """Add a continuous measurement codename to this saver
@@ -377,18 +455,143 @@ class ContinuousDataSaver(object):
             for contionuous measurements NOT codenames that can be userdefined
 
         """
-        CDS_LOG.info('Add measurements for codename \'%s\'', codename)
-        query = 'SELECT id FROM dateplots_descriptions WHERE codename=\'{}\''
-        self.cursor.execute(query.format(codename))
-        results = self.cursor.fetchall()
-        if len(results) != 1:
+        self.add_continuous_measurements([codename])
+
+    def add_continuous_measurements(self, codenames):
+        """Add several continuous measurement codenames to this saver in one lookup
+
+        If the database cannot be reached and a codename cache is used, the
+        translations are taken from the cache. See the class documentation.
+
+        Args:
+            codenames (sequence): Codenames for the measurements to add
+
+        Raises:
+            ValueError: If a codename does not have exactly one entry in
+                dateplots_descriptions (or in the cache, when offline)
+
+        .. note:: The codenames are the 'official' codenames defined in the database
+            for contionuous measurements NOT codenames that can be userdefined
+
+        """
+        codenames = list(codenames)
+        CDS_LOG.info('Add measurements for codenames %s', codenames)
+        try:
+            translation = self._lookup_codenames(codenames)
+        # The exceptions depend on the backend
+        except Exception as exception:  # pylint: disable=broad-except
+            if self.codename_cache_path is None or isinstance(exception, ValueError):
+                raise
+            CDS_LOG.warning(
+                'Codename lookup failed: %s. Use the codename cache', exception
+            )
+            cache = self._read_codename_cache()
+            missing = [codename for codename in codenames if codename not in cache]
+            if missing:
+                message = 'Codenames {} are not in the codename cache {}'.format(
+                    missing, self.codename_cache_path
+                )
+                CDS_LOG.critical(message)
+                raise ValueError(message)
+            translation = {codename: cache[codename] for codename in codenames}
+            self.unverified_codenames.update(codenames)
+
+        self.codename_translation.update(translation)
+        if self.codename_cache_path is not None and not self.unverified_codenames:
+            self._write_codename_cache()
+
+    def _lookup_codenames(self, codenames):
+        """Return the translation of codenames from a single database lookup
+
+        Raises:
+            ValueError: If a codename does not have exactly one entry in
+                dateplots_descriptions
+        """
+        # An empty IN () is a syntax error
+        if not codenames:
+            return {}
+        markers = ', '.join(['%s'] * len(codenames))
+        query = 'SELECT codename, id FROM dateplots_descriptions WHERE codename IN ({})'
+        query = self.backend.translate(query.format(markers))
+        connection = self.backend.connect()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(query, codenames)
+            results = cursor.fetchall()
+        finally:
+            connection.close()
+
+        translation, counts = {}, {}
+        for codename, id_ in results:
+            translation[codename] = id_
+            counts[codename] = counts.get(codename, 0) + 1
+        invalid = [codename for codename in codenames if counts.get(codename) != 1]
+        if invalid:
             message = (
-                'Measurement code name \'{}\' does not have exactly one entry in '
-                'dateplots_descriptions'.format(codename)
+                'Measurement code names {} do not have exactly one entry in '
+                'dateplots_descriptions'.format(invalid)
             )
             CDS_LOG.critical(message)
             raise ValueError(message)
-        self.codename_translation[codename] = results[0][0]
+        return translation
+
+    def reconcile_codenames(self):
+        """Check the translations taken from the codename cache against the database
+
+        If a translation has changed in the database, the new one is used from now on
+        and an error is logged, since points may have been saved with the old one.
+
+        Returns:
+            bool: Whether all translations are now verified
+        """
+        if not self.unverified_codenames:
+            return True
+        self._last_reconcile = time.time()
+        codenames = sorted(self.unverified_codenames)
+        try:
+            translation = self._lookup_codenames(codenames)
+        except ValueError:
+            raise
+        # The exceptions depend on the backend
+        except Exception as exception:  # pylint: disable=broad-except
+            CDS_LOG.info('Codename reconciliation failed: %s', exception)
+            return False
+
+        for codename, id_ in translation.items():
+            if self.codename_translation[codename] != id_:
+                CDS_LOG.error(
+                    'Cached id %s for codename %s differs from the database id %s',
+                    self.codename_translation[codename],
+                    codename,
+                    id_,
+                )
+        self.codename_translation.update(translation)
+        self.unverified_codenames.clear()
+        if self.codename_cache_path is not None:
+            self._write_codename_cache()
+        CDS_LOG.info('Codenames reconciled with the database')
+        return True
+
+    def _read_codename_cache(self):
+        """Return the contents of the codename cache or an empty dict"""
+        try:
+            with open(self.codename_cache_path) as file_:
+                return json.load(file_)
+        except (IOError, ValueError):
+            CDS_LOG.exception('Could not read codename cache')
+            return {}
+
+    def _write_codename_cache(self):
+        """Merge the codename translations into the codename cache file"""
+        cache = {}
+        if os.path.exists(self.codename_cache_path):
+            cache = self._read_codename_cache()
+        cache.update(self.codename_translation)
+        # Write to a temporary file and rename, so the cache is never half written
+        temporary_path = self.codename_cache_path + '.tmp'
+        with open(temporary_path, 'w') as file_:
+            json.dump(cache, file_, indent=4, sort_keys=True)
+        os.replace(temporary_path, self.codename_cache_path)
 
     def save_point_now(self, codename, value):
         """Save a value and use now (a call to :func:`time.time`) as the timestamp
@@ -420,6 +623,12 @@ class ContinuousDataSaver(object):
             message = '\'point\' must be a iterable with 2 values, got {}'.format(point)
             raise ValueError(message)
 
+        if (
+            self.unverified_codenames
+            and time.time() - self._last_reconcile > self.reconcile_interval
+        ):
+            self.reconcile_codenames()
+
         # Save the point
         CDS_LOG.debug('Save point (%s, %s) for codename: %s', unixtime, value, codename)
         measurement_number = self.codename_translation[codename]
@@ -455,17 +664,79 @@ class SqlSaver(threading.Thread):
         that they must be on the form of a ``(query, query_args)`` tuple. (These are the
         arguments to the execute method on the cursor object)
 
+    **Batching mode**
+
+    Per default, each query is executed and committed on its own. If ``batch_max_rows``
+    is given, the saver instead drains all the elements waiting in the queue (up to
+    ``batch_max_rows`` elements, waiting at most ``batch_max_latency`` seconds for more
+    to arrive) and executes them in a single transaction. Consecutive single row
+    INSERT queries with the same query string, like the ones from
+    :meth:`ContinuousDataSaver.save_point`, are coalesced into a single multi row
+    INSERT. All other queries are executed one by one in the transaction, in the order
+    they were enqueued.
+
+    **Spool**
+
+    Per default, if the database cannot be reached, the saver keeps retrying the
+    current query every 5 seconds, while the queue grows in memory. If ``spool_path`` is
+    given, queries are instead written to an on-disk :class:`.SqlSpool` when the
+    database is unreachable, or when the queue holds more than ``spool_threshold``
+    elements. The spooled queries are replayed in chunks as soon as the database can be
+    reached again, also after a restart of the program using the same ``spool_path``.
+
+    A query that fails for another reason than the connection, e.g. a syntax error,
+    would block the replay forever. If a chunk fails to replay ``max_replay_attempts``
+    times in a row, its queries are instead replayed one at a time, and a query that
+    fails while the database can still be reached is moved to the dead letter table
+    of the spool (see :meth:`.SqlSpool.dead_letter`) and logged.
+
+    .. note:: Spooled queries are removed from the spool after they have been committed
+        to the database. If the program is killed in between the two, the replayed
+        chunk may be saved twice.
+
+    .. note:: The spool is replayed before the queue. So queries that were spooled
+        because the queue was over the ``spool_threshold`` are saved before the older
+        queries still waiting in the queue. The queries are not reordered otherwise.
+
     Attributes:
         queue (Queue.Queue): The queue the queries and qeury arguments are stored in. See
             note below.
         commits (int): The number of commits the saver has performed
         commit_time (float): The timespan the last commit took
+        batch_max_rows (int): The maximum number of queue elements per transaction in
+            batching mode or None if batching mode is not enabled
+        batch_max_latency (float): The maximum time in seconds to wait for more queue
+            elements, before the elements gathered so far are committed
+        last_batch_size (int): The number of queue elements in the last transaction
+        spool (:class:`.SqlSpool`): The spool or None if no ``spool_path`` was given
+        spool_threshold (int): The queue size above which new queries are spooled
+        replay_chunk_size (int): The maximum number of spooled queries to replay in one
+            transaction
+        replay_rate (float): The number of spooled queries per second replayed in the
+            last replay chunk
+        replayed (int): The total number of replayed spooled queries
+        max_replay_attempts (int): The number of times in a row a chunk may fail to
+            replay, before its queries are replayed one at a time
+        dead_lettered (int): The number of spooled queries moved to the dead letter
+            table
+        backend (object): The storage backend, see :mod:`.database_backends`
         connection (MySQLdb connection): The MySQLdb database connection
         cursor (MySQLdb cursor): The MySQLdb database cursor
 
     """
 
-    def __init__(self, username, password, queue=None):
+    def __init__(
+        self,
+        username,
+        password,
+        queue=None,
+        batch_max_rows=None,
+        batch_max_latency=1.0,
+        spool_path=None,
+        spool_threshold=10000,
+        replay_chunk_size=1000,
+        backend=None,
+    ):
         """Initialize local variables
 
         Args:
@@ -473,20 +744,60 @@ class SqlSaver(threading.Thread):
             password (str): The password for the MySQL database
             queue (Queue.Queue): A custom queue to use. If it is left out, a new
                 :py:class:`Queue.Queue` object will be used.
+            batch_max_rows (int): If given, enables the batching mode and sets the
+                maximum number of queue elements that are committed in one transaction
+            batch_max_latency (float): The maximum number of seconds to wait for more
+                elements to arrive in the queue, before a batch is committed. Only used
+                in batching mode. Default is 1.0.
+            spool_path (str): If given, the path of the SQLite file used as spool, see
+                the class documentation
+            spool_threshold (int): The queue size above which new queries are spooled
+                instead of being put in the queue. Default is 10000.
+            replay_chunk_size (int): The maximum number of spooled queries to replay in
+                one transaction. Default is 1000.
+            backend (object): The storage backend to save to. Default is the process
+                wide pool of MySQL connections for ``username``, see
+                :func:`.get_shared_pool`. See :mod:`.database_backends` for
+                alternatives.
         """
 
         SQL_SAVER_LOG.info(
-            'Init with username: %s, password: ***** and queue: %s', username, queue
+            'Init with username: %s, password: *****, queue: %s, batch_max_rows: %s, '
+            'batch_max_latency: %s and spool_path: %s',
+            username,
+            queue,
+            batch_max_rows,
+            batch_max_latency,
+            spool_path,
         )
         super(SqlSaver, self).__init__()
         # threading.Thread.__init__(self)
         self.daemon = True
 
+        if batch_max_rows is not None and batch_max_rows < 1:
+            msg = 'batch_max_rows must be a positive integer or None, got: {}'
+            raise ValueError(msg.format(batch_max_rows))
+
         # Initialize internal variables
         self.username = username
         self.password = password
+        if backend is None:
+            backend = get_shared_pool(username, password)
+        self.backend = backend
         self.commits = 0
         self.commit_time = 0
+        self.batch_max_rows = batch_max_rows
+        self.batch_max_latency = batch_max_latency
+        self.last_batch_size = 0
+        self.spool_threshold = spool_threshold
+        self.replay_chunk_size = replay_chunk_size
+        self.replay_rate = 0.0
+        self.replayed = 0
+        self.max_replay_attempts = 3
+        self.dead_lettered = 0
+        self._replay_failures = 0
+        self.reconnect_interval = 5
+        self._last_connect_attempt = 0
         self._stop_called = False  # Only used to modify logging output
 
         # Set queue or initialize a new one
@@ -495,16 +806,49 @@ class SqlSaver(threading.Thread):
         else:
             self.queue = queue
 
-        # Initialize database connection
+        # Initialize the spool and database connection. With a spool, an unreachable
+        # database is not fatal, the queries are just spooled until it comes back
+        self.connection = None
+        self.cursor = None
+        self.spool = None if spool_path is None else SqlSpool(spool_path)
         SQL_SAVER_LOG.debug('Open connection to MySQL database')
-        self.connection = MySQLdb.connect(
-            host=socket.gethostbyname(SETTINGS.sql_server_host),
-            user=username,
-            passwd=password,
-            db=SETTINGS.sql_database,
-        )
+        if self.spool is None:
+            self._connect()
+        else:
+            self._reconnect()
+        SQL_SAVER_LOG.debug('Init done')
+
+    @property
+    def spool_depth(self):
+        """The number of queries waiting in the spool (0 if there is no spool)"""
+        if self.spool is None:
+            return 0
+        return self.spool.depth
+
+    def _connect(self):
+        """Open the database connection and cursor"""
+        self._last_connect_attempt = time.time()
+        self.connection = self.backend.connect()
         self.cursor = self.connection.cursor()
-        SQL_SAVER_LOG.debug('Connection opened, init done')
+
+    def _reconnect(self):
+        """Try to (re-)connect, at most every ``reconnect_interval`` seconds
+
+        Returns:
+            bool: Whether there is an open connection
+        """
+        if self.cursor is not None:
+            return True
+        if time.time() - self._last_connect_attempt < self.reconnect_interval:
+            return False
+        try:
+            self._connect()
+        # See note on exceptions in _execute_and_commit
+        except Exception as exception:  # Failed to connect
+            SQL_SAVER_LOG.error('Connecting to the database failed: %s', exception)
+            return False
+        SQL_SAVER_LOG.info('Connected to the database')
+        return True
 
     def stop(self):
         """Add stop word to queue to exit the loop when the queue is empty"""
@@ -524,6 +868,10 @@ class SqlSaver(threading.Thread):
     def enqueue_query(self, query, query_args=None):
         """Enqueue a qeury and arguments
 
+        If a spool is used and the queue holds more than ``spool_threshold`` elements,
+        the query is written directly to the spool instead. Note that it is then saved
+        before the queries already in the queue.
+
         Args:
             query (str): The SQL query to be executed
             query_args (sequence or mapping): Optional sequence or mapping of arguments
@@ -533,61 +881,238 @@ class SqlSaver(threading.Thread):
         SQL_SAVER_LOG.debug(
             'Enqueue query\n\'%.70s...\'\nwith args: %.60s...', query, query_args
         )
-        self.queue.put((query, query_args))
+        if self.spool is not None and self.queue.qsize() >= self.spool_threshold:
+            self.spool.push([(query, query_args)])
+        else:
+            self.queue.put((query, query_args))
 
     def run(self):
         """Execute SQL inserts from the queue until stopped"""
         SQL_SAVER_LOG.info('run started')
-        while True:
+        stop = False
+        while not stop:
+            timeout = None
+            if self.spool is not None:
+                if self.spool.depth > 0 and self._reconnect():
+                    self._replay_spool()
+                # Without a connection, only block for a while, to be able to reconnect
+                # and with more spooled queries to replay, do not block at all
+                if self.cursor is None:
+                    timeout = self.reconnect_interval
+                elif self.spool.depth > 0:
+                    timeout = 0
+
             start = time.time()
-            query, args = self.queue.get()
+            elements = self._get_elements(timeout)
+            if not elements:
+                continue
 
             # If stop has been called this log output is elavated to info level, because
             # if not the user os waiting without information and may think that the
             # process hangs
             if self._stop_called:
-                SQL_SAVER_LOG.info('Dequeued element, %s remaining', self.queue.qsize())
+                SQL_SAVER_LOG.info(
+                    'Dequeued %s element(s), %s remaining',
+                    len(elements),
+                    self.queue.qsize(),
+                )
             else:
                 SQL_SAVER_LOG.debug(
-                    'Dequeued element, %s remaining', self.queue.qsize()
+                    'Dequeued %s element(s), %s remaining',
+                    len(elements),
+                    self.queue.qsize(),
                 )
 
-            if query == 'STOP':  # Magic key-word to stop Sql Saver
-                break
-
-            success = False
-            while not success:
-                try:
-                    self.cursor.execute(query, args=args)
-                    success = True
-                    SQL_SAVER_LOG.debug(
-                        'Executed query\n\'%.70s\'\nwith args: %.60s', query, args
-                    )
-                # Naming exceptions is a bit tricky here, since we import different
-                # sql-libraries at runtime, not all exceptions are available and we
-                # end up with a NameError instead. Catching all should be ok here.
-                except Exception as e:  # Failed to perfom commit
-                    msg = 'Executing a query raised an error: {}'.format(e)
-                    SQL_SAVER_LOG.error(msg)
-                    time.sleep(5)
-                    try:
-                        self.connection = MySQLdb.connect(
-                            host=socket.gethostbyname(SETTINGS.sql_server_host),
-                            user=self.username,
-                            passwd=self.password,
-                            db=SETTINGS.sql_database,
-                        )
-                        self.cursor = self.connection.cursor()
-                    except Exception:  # Failed to re-connect
-                        pass
-
-            self.connection.commit()
+            # Magic key-word to stop Sql Saver. It is always the last element
+            if elements[-1][0] == 'STOP':
+                elements.pop()
+                stop = True
+            if not elements:
+                continue
+
+            if self.spool is None:
+                self._execute_and_commit(elements)
+            elif not self._execute_or_spool(elements):
+                continue
             self.commits += 1
+            self.last_batch_size = len(elements)
             self.commit_time = time.time() - start
 
-        self.connection.close()
+        if self.connection is not None:
+            self.connection.close()
+        if self.spool is not None:
+            SQL_SAVER_LOG.info('%s queries left in spool', self.spool.depth)
+            self.spool.close()
         SQL_SAVER_LOG.debug('run stopped')
 
+    def _get_elements(self, timeout=None):
+        """Return the list of queue elements for the next transaction
+
+        Blocks until at least one element is available or the timeout runs out, in
+        which case an empty list is returned. In batching mode, keep getting elements
+        until there are ``batch_max_rows`` of them, the ``batch_max_latency`` has passed
+        or the stop element is encountered.
+
+        Args:
+            timeout (float): The maximum time to wait for the first element or None to
+                wait forever
+        """
+        try:
+            elements = [self.queue.get(timeout=timeout)]
+        except Empty:
+            return []
+        if self.batch_max_rows is None:
+            return elements
+
+        deadline = time.time() + self.batch_max_latency
+        while len(elements) < self.batch_max_rows and elements[-1][0] != 'STOP':
+            try:
+                # Drain what is already waiting without blocking, then wait for the
+                # remaining latency
+                elements.append(self.queue.get_nowait())
+            except Empty:
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    break
+                try:
+                    elements.append(self.queue.get(timeout=timeout))
+                except Empty:
+                    break
+        return elements
+
+    def _execute(self, elements):
+        """Execute the queries in elements and commit
+
+        Args:
+            elements (list): List of ``(query, query_args)`` tuples
+        """
+        for query, args in coalesce_inserts(elements):
+            self.cursor.execute(self.backend.translate(query), args)
+            SQL_SAVER_LOG.debug(
+                'Executed query\n\'%.70s\'\nwith args: %.60s', query, args
+            )
+        self.connection.commit()
+
+    def _execute_and_commit(self, elements):
+        """Execute the queries in elements and commit, re-connect and retry on error
+
+        Args:
+            elements (list): List of ``(query, query_args)`` tuples
+        """
+        success = False
+        while not success:
+            try:
+                self._execute(elements)
+                success = True
+            # Naming exceptions is a bit tricky here, since we import different
+            # sql-libraries at runtime, not all exceptions are available and we
+            # end up with a NameError instead. Catching all should be ok here.
+            except Exception as e:  # Failed to perfom commit
+                msg = 'Executing a query raised an error: {}'.format(e)
+                SQL_SAVER_LOG.error(msg)
+                time.sleep(5)
+                # Release the failed connection, e.g. back to the pool, before
+                # connecting again
+                self._drop_connection()
+                try:
+                    self._connect()
+                except Exception:  # Failed to re-connect
+                    pass
+
+    def _execute_or_spool(self, elements):
+        """Execute the queries in elements and commit, spool them on error
+
+        Args:
+            elements (list): List of ``(query, query_args)`` tuples
+
+        Returns:
+            bool: Whether the queries were committed to the database
+        """
+        if self._reconnect():
+            try:
+                self._execute(elements)
+                return True
+            # See note on exceptions in _execute_and_commit
+            except Exception as exception:  # Failed to perfom commit
+                SQL_SAVER_LOG.error(
+                    'Executing a query raised an error: %s. Spool %s queries',
+                    exception,
+                    len(elements),
+                )
+                self._drop_connection()
+        self.spool.push(elements)
+        return False
+
+    def _replay_spool(self):
+        """Replay a chunk of spooled queries"""
+        if self._replay_failures >= self.max_replay_attempts:
+            self._replay_one_by_one()
+            return
+        rows = self.spool.peek(self.replay_chunk_size)
+        start = time.time()
+        try:
+            self._execute([(query, args) for _, query, args in rows])
+        # See note on exceptions in _execute_and_commit
+        except Exception as exception:  # Failed to perfom commit
+            SQL_SAVER_LOG.error('Replaying spooled queries failed: %s', exception)
+            self._drop_connection()
+            self._replay_failures += 1
+            return
+        self._replay_failures = 0
+        self.spool.remove(rows[-1][0])
+        self.replayed += len(rows)
+        self.replay_rate = len(rows) / max(time.time() - start, 1e-6)
+        SQL_SAVER_LOG.debug(
+            'Replayed %s spooled queries at %.1f queries/s, %s remaining',
+            len(rows),
+            self.replay_rate,
+            self.spool.depth,
+        )
+
+    def _replay_one_by_one(self):
+        """Replay the chunk that keeps failing one query at a time
+
+        The first query that fails is moved to the dead letter table, if a new
+        connection can be opened right after, since then the database is reachable
+        and the query itself is the problem.
+        """
+        for id_, query, args in self.spool.peek(self.replay_chunk_size):
+            try:
+                self._execute([(query, args)])
+            # See note on exceptions in _execute_and_commit
+            except Exception as exception:  # pylint: disable=broad-except
+                self._drop_connection()
+                try:
+                    self._connect()
+                except Exception:  # pylint: disable=broad-except
+                    SQL_SAVER_LOG.error('Replaying spooled query failed: %s', exception)
+                    self._drop_connection()
+                    return
+                SQL_SAVER_LOG.error(
+                    'Spooled query\n\'%.70s\'\nwith args: %.60s\nkeeps failing with: '
+                    '%s. Move it to the dead letter table',
+                    query,
+                    args,
+                    exception,
+                )
+                self.spool.dead_letter(id_, str(exception))
+                self.dead_lettered += 1
+                self._replay_failures = 0
+                return
+            self.spool.remove(id_)
+            self.replayed += 1
+        self._replay_failures = 0
+
+    def _drop_connection(self):
+        """Close and forget the current connection, it will be re-opened later"""
+        try:
+            self.connection.close()
+        except Exception:  # The connection is likely broken already
+            pass
+        self.connection = None
+        self.cursor = None
+        self._last_connect_attempt = time.time()
+
     def wait_for_queue_to_empty(self):
         """Wait for the queue to empty
 
@@ -598,6 +1123,184 @@ class SqlSaver(threading.Thread):
             time.sleep(0.01)
 
 
+SQL_SPOOL_LOG = logging.getLogger(__name__ + '.SqlSpool')
+SQL_SPOOL_LOG.addHandler(logging.NullHandler())
+
+
+class SqlSpool(object):
+    """An append only on-disk spool of ``(query, query_args)`` elements
+
+    The spool is a SQLite database with a table of spooled elements and a table of dead
+    letters, the elements that could not be saved, see :meth:`dead_letter`. The query
+    arguments are stored pickled, so all values that are valid as MySQL query arguments
+    can be spooled. The spool is safe to use from several threads.
+
+    Attributes:
+        path (str): The path of the SQLite file
+        depth (int): The number of elements in the spool
+        connection (sqlite3.Connection): The SQLite connection
+    """
+
+    def __init__(self, path):
+        """Open (and if necessary create) the spool
+
+        Args:
+            path (str): The path of the SQLite file
+        """
+        SQL_SPOOL_LOG.info('Init with path: %s', path)
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS spool '
+            '(id INTEGER PRIMARY KEY AUTOINCREMENT, query TEXT, args BLOB)'
+        )
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS dead_letter '
+            '(id INTEGER PRIMARY KEY, query TEXT, args BLOB, error TEXT, time REAL)'
+        )
+        self.connection.commit()
+        self.depth = self.connection.execute('SELECT COUNT(*) FROM spool').fetchone()[0]
+        SQL_SPOOL_LOG.debug('Opened spool with %s elements', self.depth)
+
+    def push(self, elements):
+        """Append elements to the spool
+
+        Args:
+            elements (list): List of ``(query, query_args)`` tuples
+        """
+        rows = [(query, pickle.dumps(args)) for query, args in elements]
+        with self._lock:
+            self.connection.executemany(
+                'INSERT INTO spool (query, args) VALUES (?, ?)', rows
+            )
+            self.connection.commit()
+            self.depth += len(rows)
+
+    def peek(self, count):
+        """Return the oldest elements in the spool without removing them
+
+        Args:
+            count (int): The maximum number of elements to return
+
+        Returns:
+            list: List of ``(id, query, query_args)`` tuples, oldest first
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT id, query, args FROM spool ORDER BY id LIMIT ?', (count,)
+            ).fetchall()
+        return [(id_, query, pickle.loads(args)) for id_, query, args in rows]
+
+    def remove(self, last_id):
+        """Remove all elements up to and including ``last_id`` from the spool
+
+        Args:
+            last_id (int): The id of the last element to remove, as returned by
+                :meth:`peek`
+        """
+        with self._lock:
+            cursor = self.connection.execute(
+                'DELETE FROM spool WHERE id <= ?', (last_id,)
+            )
+            self.connection.commit()
+            self.depth -= cursor.rowcount
+
+    def dead_letter(self, id_, error):
+        """Move an element from the spool to the dead letter table
+
+        The dead letters are kept for manual inspection and are not replayed.
+
+        Args:
+            id_ (int): The id of the element, as returned by :meth:`peek`
+            error (str): The error the element failed with
+        """
+        with self._lock:
+            self.connection.execute(
+                'INSERT INTO dead_letter (id, query, args, error, time) '
+                'SELECT id, query, args, ?, ? FROM spool WHERE id = ?',
+                (error, time.time(), id_),
+            )
+            cursor = self.connection.execute('DELETE FROM spool WHERE id = ?', (id_,))
+            self.connection.commit()
+            self.depth -= cursor.rowcount
+
+    def dead_letters(self):
+        """Return the dead letters
+
+        Returns:
+            list: List of ``(id, query, query_args, error)`` tuples, oldest first
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT id, query, args, error FROM dead_letter ORDER BY id'
+            ).fetchall()
+        return [
+            (id_, query, pickle.loads(args), error) for id_, query, args, error in rows
+        ]
+
+    def close(self):
+        """Close the spool"""
+        with self._lock:
+            self.connection.close()
+
+
+def coalesce_inserts(elements):
+    """Coalesce consecutive single row INSERTs with the same query into multi row ones
+
+    Args:
+        elements (list): List of ``(query, query_args)`` tuples
+
+    Returns:
+        list: List of ``(query, query_args)`` tuples, where runs of consecutive single
+        row INSERT queries with identical query strings and sequence arguments have been
+        replaced by a single multi row INSERT. Order is preserved.
+    """
+    statements = []
+    run_query, run_args = None, []
+
+    def flush_run():
+        """Append the current run of identical queries to statements"""
+        if len(run_args) == 1:
+            statements.append((run_query, run_args[0]))
+        elif run_args:
+            query = _multi_row_insert(run_query, len(run_args))
+            flat_args = [arg for args in run_args for arg in args]
+            statements.append((query, flat_args))
+
+    for query, args in elements:
+        if query == run_query and isinstance(args, (list, tuple)):
+            run_args.append(args)
+            continue
+
+        flush_run()
+        if isinstance(args, (list, tuple)) and _split_single_row_insert(query):
+            run_query, run_args = query, [args]
+        else:
+            statements.append((query, args))
+            run_query, run_args = None, []
+    flush_run()
+
+    return statements
+
+
+# The statements are cached, because the same few queries are coalesced over and over
+@lru_cache(maxsize=256)
+def _split_single_row_insert(query):
+    """Return the head and value marker group of a single row INSERT query or None"""
+    match = SINGLE_ROW_INSERT.match(query)
+    return None if match is None else match.groups()
+
+
+@lru_cache(maxsize=1024)
+def _multi_row_insert(query, number_of_rows):
+    """Return the multi row version of a single row INSERT query"""
+    head, row_markers = _split_single_row_insert(query)
+    return head + ', '.join([row_markers] * number_of_rows)
+
+
 def run_module():
     """Run the module to perform elementary functional test"""
     import numpy
@@ -0,0 +1,209 @@
+"""This module contains functions to decimate time series for plotting
+
+A plot can only show as many details as it has pixels (or characters) along the x
+axis, so plotting more points than that only costs time. The functions in this
+module reduce a series to a number of points that is proportional to the width of
+the plot, while keeping its visual shape:
+
+ * **minmax** (:func:`minmax_indices`): Splits the series into buckets, e.g. one per
+   pixel column, and keeps the minimum and the maximum of each bucket. The envelope
+   of the series, including single point spikes, is preserved exactly.
+ * **lttb** (:func:`lttb_indices`): Largest-Triangle-Three-Buckets, which keeps one
+   point per bucket, chosen to make the largest triangle with the point kept in the
+   previous bucket and the average of the next bucket. It gives a line that looks
+   like the original with fewer points than min/max, but may cut the tops of spikes.
+ * **stride** (:func:`stride_indices`): Evenly spread points. Fast, but may miss
+   spikes entirely.
+
+The functions return the indices of the points to keep, so they can also be used
+when the x values are not numbers, e.g. :py:class:`datetime.datetime` objects::
+
+    indices = decimate_indices(y_values, 1000)
+    x_plot = [x_values[index] for index in indices]
+    y_plot = [y_values[index] for index in indices]
+
+or, with numeric arrays, :func:`decimate` returns the decimated arrays directly::
+
+    x_plot, y_plot = decimate(x_values, y_values, 1000, method='lttb')
+
+The first and the last point are always kept. NaN values are ignored when finding
+the minima and maxima.
+
+This module is Python 2 and 3 compatible.
+"""
+
+from __future__ import division
+
+import logging
+import numpy
+
+LOG = logging.getLogger(__name__)
+LOG.addHandler(logging.NullHandler())
+
+#: The decimation methods understood by :func:`decimate_indices`
+METHODS = ('minmax', 'lttb', 'stride')
+
+
+def _bucket_starts(length, buckets, x=None):
+    """Return the start indices of the non-empty buckets
+
+    Without x the buckets have (almost) the same number of points, with x they span
+    the same x range. x must be sorted.
+    """
+    if x is None:
+        starts = numpy.arange(buckets) * length // buckets
+    else:
+        edges = numpy.linspace(x[0], x[-1], buckets + 1)[:-1]
+        starts = numpy.searchsorted(x, edges, side='left')
+    return numpy.unique(starts)
+
+
+def minmax_indices(y, buckets, x=None):
+    """Return the indices of the minimum and maximum point in each bucket
+
+    Args:
+        y (array_like): The y values
+        buckets (int): The number of buckets, e.g. the width of the plot in pixels
+        x (array_like): The sorted x values. If given, the buckets span equal x
+            ranges, otherwise they contain equal numbers of points.
+
+    Returns:
+        numpy.ndarray: The sorted indices of at most ``2 * buckets + 2`` points
+    """
+    y = numpy.asarray(y, dtype=float)
+    length = len(y)
+    if length <= 2 * buckets:
+        return numpy.arange(length)
+    if x is not None:
+        x = numpy.asarray(x, dtype=float)
+
+    starts = _bucket_starts(length, buckets, x)
+    counts = numpy.diff(numpy.append(starts, length))
+    bucket_numbers = numpy.repeat(numpy.arange(len(starts)), counts)
+    positions = numpy.arange(length)
+    nans = numpy.isnan(y)
+
+    indices = [[0, length - 1]]
+    for ufunc, fill in ((numpy.minimum, numpy.inf), (numpy.maximum, -numpy.inf)):
+        values = numpy.where(nans, fill, y)
+        extremes = ufunc.reduceat(values, starts)
+        # The index of the first occurrence of the extreme in each bucket
+        is_extreme = values == extremes[bucket_numbers]
+        indices.append(
+            numpy.minimum.reduceat(numpy.where(is_extreme, positions, length), starts)
+        )
+    return numpy.unique(numpy.concatenate(indices))
+
+
+def lttb_indices(y, threshold, x=None):
+    """Return the indices of the points selected by Largest-Triangle-Three-Buckets
+
+    Args:
+        y (array_like): The y values
+        threshold (int): The number of points to return
+        x (array_like): The sorted x values. Default is the indices.
+
+    Returns:
+        numpy.ndarray: The sorted indices of ``threshold`` points
+    """
+    y = numpy.asarray(y, dtype=float)
+    length = len(y)
+    if threshold >= length:
+        return numpy.arange(length)
+    if threshold < 3:
+        return stride_indices(length, threshold)
+    if x is None:
+        x = numpy.arange(length, dtype=float)
+    else:
+        x = numpy.asarray(x, dtype=float)
+
+    # The first and last points are buckets of their own, the rest are split evenly
+    every = (length - 2) / (threshold - 2)
+    indices = numpy.empty(threshold, dtype=int)
+    indices[0] = selected = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, length)
+        average_x = x[end:next_end].mean()
+        average_y = y[end:next_end].mean()
+
+        # Twice the area of the triangles with the selected point and the average
+        areas = numpy.abs(
+            (x[selected] - average_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (average_y - y[selected])
+        )
+        areas[numpy.isnan(areas)] = -1.0
+        selected = start + int(areas.argmax())
+        indices[bucket + 1] = selected
+    indices[-1] = length - 1
+    return indices
+
+
+def stride_indices(length, max_points):
+    """Return the indices of max_points evenly spread points, including the first and
+    the last point
+
+    Args:
+        length (int): The number of points
+        max_points (int): The maximum number of points to return. If 1, only the last
+            point is returned.
+
+    Returns:
+        numpy.ndarray: The sorted indices
+    """
+    if max_points >= length:
+        return numpy.arange(length)
+    if max_points < 2:
+        # Only room for the latest point (or none)
+        return numpy.arange(length - max(max_points, 0), length)
+    return numpy.linspace(0, length - 1, max_points).round().astype(int)
+
+
+def decimate_indices(y, max_points, method='minmax', x=None):
+    """Return the indices of at most max_points points of a series
+
+    Args:
+        y (array_like): The y values
+        max_points (int): The maximum number of points
+        method (str): The decimation method, one of :data:`METHODS`. For fewer than 4
+            points, the minmax method falls back to stride.
+        x (array_like): The sorted x values, if they are numbers. They are used to
+            place the buckets for unevenly sampled series.
+
+    Returns:
+        numpy.ndarray: The sorted indices of the points to keep
+
+    Raises:
+        ValueError: On unknown method
+    """
+    if method not in METHODS:
+        message = 'Unknown decimation method \'{}\', must be one of {}'
+        raise ValueError(message.format(method, METHODS))
+    length = len(y)
+    if length <= max_points:
+        return numpy.arange(length)
+    if method == 'minmax' and max_points >= 4:
+        # Leave room for the first and last point
+        return minmax_indices(y, (max_points - 2) // 2, x)
+    if method == 'lttb':
+        return lttb_indices(y, max_points, x)
+    return stride_indices(length, max_points)
+
+
+def decimate(x, y, max_points, method='minmax'):
+    """Return x and y decimated to at most max_points points
+
+    Args:
+        x (array_like): The sorted, numeric x values
+        y (array_like): The y values
+        max_points (int): The maximum number of points
+        method (str): The decimation method, see :func:`decimate_indices`
+
+    Returns:
+        tuple: The decimated x and y values as :py:class:`numpy.ndarray`
+    """
+    x = numpy.asarray(x)
+    y = numpy.asarray(y)
+    indices = decimate_indices(y, max_points, method, x)
+    return x[indices], y[indices]
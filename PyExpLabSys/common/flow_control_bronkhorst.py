@@ -2,17 +2,20 @@
 from __future__ import print_function
 import threading
 import time
+import logging
 import PyExpLabSys.drivers.bronkhorst as bronkhorst
 from PyExpLabSys.common.sockets import DateDataPullSocket
 from PyExpLabSys.common.sockets import DataPushSocket
 from PyExpLabSys.common.sockets import LiveSocket
 from PyExpLabSys.common.supported_versions import python2_and_3
 
+LOG = logging.getLogger(__name__)
+LOG.addHandler(logging.NullHandler())
 python2_and_3(__file__)
 
 
 class FlowControl(threading.Thread):
-    """ Keep updated values of the current flow """
+    """Keep updated values of the current flow"""
 
     def __init__(self, ranges, devices, socket_name):
         threading.Thread.__init__(self)
@@ -73,26 +76,33 @@ class FlowControl(threading.Thread):
         self.reactor_pressure = float('NaN')
 
     def value(self):
-        """ Helper function for the reactor logger functionality """
+        """Helper function for the reactor logger functionality"""
         return self.reactor_pressure
 
+    def update(self):
+        """Set the flows requested on the push socket and read all flows"""
+        qsize = self.pushsocket.queue.qsize()
+        LOG.debug('Qsize: %s', qsize)
+        while qsize > 0:
+            element = self.pushsocket.queue.get()
+            mfc = list(element.keys())[0]
+            self.mfcs[mfc].set_flow(str(element[mfc]))
+            qsize = self.pushsocket.queue.qsize()
+
+        for mfc in self.mfcs:
+            flow = self.mfcs[mfc].read_flow()
+            self.pullsocket.set_point_now(mfc, flow)
+            self.livesocket.set_point_now(mfc, flow)
+            if mfc == self.devices[0]:  # First device is considered pressure controller
+                LOG.debug('Pressure: %s', flow)
+                self.reactor_pressure = flow
+
+    def register(self, scheduler, period=0.1, name=None):
+        """Register update as a task with a :class:`.Scheduler`, instead of starting
+        the thread. The task name defaults to the (unique) thread name."""
+        return scheduler.add_task(name or self.name, self.update, period)
+
     def run(self):
         while self.running:
             time.sleep(0.1)
-            qsize = self.pushsocket.queue.qsize()
-            print("Qsize: " + str(qsize))
-            while qsize > 0:
-                element = self.pushsocket.queue.get()
-                mfc = list(element.keys())[0]
-                self.mfcs[mfc].set_flow(str(element[mfc]))
-                qsize = self.pushsocket.queue.qsize()
-
-            for mfc in self.mfcs:
-                flow = self.mfcs[mfc].read_flow()
-                self.pullsocket.set_point_now(mfc, flow)
-                self.livesocket.set_point_now(mfc, flow)
-                if (
-                    mfc == self.devices[0]
-                ):  # First device is considered pressure controller
-                    print("Pressure: " + str(flow))
-                    self.reactor_pressure = flow
+            self.update()
@@ -219,25 +219,29 @@ class ContinuousLogger(threading.Thread):
         codenames
         """
         LOGGER.debug('CL: init measurements numbers')
+        # Look up all codenames at once, in a parameterized query
+        marker = '%s' if SQL == 'mysqldb' else '?'
+        markers = ', '.join([marker] * len(measurement_codenames))
+        query = (
+            'SELECT codename, id FROM dateplots_descriptions '
+            'WHERE codename IN ({})'.format(markers)
+        )
+        LOGGER.debug('CL: Query: ' + query)
+        self._cursor.execute(query, list(measurement_codenames))
+        results = self._cursor.fetchall()
+        LOGGER.debug('CL: query returned {}'.format(str(results)))
+        ids = {}
+        for codename, id_ in results:
+            ids.setdefault(codename, []).append(id_)
         for codename in measurement_codenames:
-            query = (
-                'SELECT id FROM dateplots_descriptions '
-                'WHERE codename=\'{}\''.format(codename)
-            )
-            LOGGER.debug('CL: Query: ' + query)
-            self._cursor.execute(query)
-            results = self._cursor.fetchall()
-            LOGGER.debug(
-                'CL: query for {} returned {}' ''.format(codename, str(results))
-            )
-            if len(results) != 1:
+            if len(ids.get(codename, [])) != 1:
                 message = (
                     'Measurement code name \'{}\' does not have exactly'
                     ' one entry in dateplots_descriptions'.format(codename)
                 )
                 LOGGER.critical('CL: ' + message)
                 raise StartupException(message)
-            self._codename_translation[codename] = results[0][0]
+            self._codename_translation[codename] = ids[codename][0]
         LOGGER.info(
             'Codenames translated to measurement numbers: {}'
             ''.format(str(self._codename_translation))
@@ -12,7 +12,7 @@ python2_and_3(__file__)
 
 
 class CursesTui(threading.Thread):
-    """ Text user interface for heater heating control """
+    """Text user interface for heater heating control"""
 
     def __init__(self, heating_class):
         threading.Thread.__init__(self)
@@ -101,7 +101,7 @@ class CursesTui(threading.Thread):
         LOGGER.info('TUI ended')
 
     def stop(self):
-        """ Clean up console """
+        """Clean up console"""
         curses.nocbreak()
         self.screen.keypad(0)
         curses.echo()
@@ -110,7 +110,7 @@ class CursesTui(threading.Thread):
 
 
 class HeaterClass(threading.Thread):
-    """ Do the actual heating """
+    """Do the actual heating"""
 
     def __init__(self, power_calculator, pullsocket, power_supply):
         threading.Thread.__init__(self)
@@ -124,50 +124,85 @@ class HeaterClass(threading.Thread):
         self.values['actual_current_1'] = 0
         self.values['actual_current_2'] = 0
         self.quit = False
-
-    def run(self):
-        while not self.quit:
-            self.values['wanted_voltage'] = self.power_calculator.read_power()
-            self.pullsocket.set_point_now(
-                'wanted_voltage', self.values['wanted_voltage']
-            )
-            self.power_supply[1].set_voltage(self.values['wanted_voltage'])
-            time.sleep(0.1)
-            self.power_supply[2].set_voltage(self.values['wanted_voltage'] * 0.5)
-
-            ps_value = -11
-            while ps_value < -10:
-                ps_value = self.power_supply[1].read_actual_voltage()
-                LOGGER.info('Voltage 1: ' + str(ps_value))
-            self.values['actual_voltage_1'] = ps_value
-            self.pullsocket.set_point_now('actual_voltage_1', ps_value)
-            time.sleep(0.5)
-            ps_value = -11
-            while ps_value < -10:
-                ps_value = self.power_supply[1].read_actual_current()
-            self.values['actual_current_1'] = ps_value
-            self.pullsocket.set_point_now('actual_current_1', ps_value)
-            time.sleep(0.5)
-            ps_value = -11
-            while ps_value < -10:
-                ps_value = self.power_supply[2].read_actual_voltage()
-                LOGGER.info(ps_value)
-            self.values['actual_voltage_2'] = ps_value
-            self.pullsocket.set_point_now('actual_voltage_2', ps_value)
-            time.sleep(0.5)
-            ps_value = -11
-            while ps_value < -10:
-                ps_value = self.power_supply[2].read_actual_current()
-            self.values['actual_current_2'] = ps_value
-            self.pullsocket.set_point_now('actual_current_2', ps_value)
-            time.sleep(0.5)
+        self.steps = [
+            self.set_voltages,
+            self.read_current_1,
+            self.read_voltage_2,
+            self.read_current_2,
+        ]
+        self._step = 0
+        self.task = None
+
+    def set_voltages(self):
+        """Set the wanted voltage on both power supplies and read voltage 1"""
+        self.values['wanted_voltage'] = self.power_calculator.read_power()
+        self.pullsocket.set_point_now('wanted_voltage', self.values['wanted_voltage'])
+        self.power_supply[1].set_voltage(self.values['wanted_voltage'])
+        time.sleep(0.1)
+        self.power_supply[2].set_voltage(self.values['wanted_voltage'] * 0.5)
+        self._read_actual('actual_voltage_1', self.power_supply[1].read_actual_voltage)
+
+    def read_current_1(self):
+        """Read the current of power supply 1"""
+        self._read_actual('actual_current_1', self.power_supply[1].read_actual_current)
+
+    def read_voltage_2(self):
+        """Read the voltage of power supply 2"""
+        self._read_actual('actual_voltage_2', self.power_supply[2].read_actual_voltage)
+
+    def read_current_2(self):
+        """Read the current of power supply 2"""
+        self._read_actual('actual_current_2', self.power_supply[2].read_actual_current)
+
+    def _read_actual(self, name, read_function):
+        """Read an actual value, retrying on error values (< -10)"""
+        ps_value = -11
+        while ps_value < -10:
+            ps_value = read_function()
+            if name.startswith('actual_voltage'):
+                LOGGER.info('%s: %s', name, ps_value)
+        self.values[name] = ps_value
+        self.pullsocket.set_point_now(name, ps_value)
+
+    def shut_down(self):
+        """Set the voltages to 0 and turn off the outputs"""
         for i in range(1, 3):
             self.power_supply[i].set_voltage(0)
             LOGGER.info('%s set voltage', i)
             self.power_supply[i].output_status(False)
             LOGGER.info('%s output status', i)
+
+    def update(self):
+        """Do the next step of the heating cycle
+
+        A cycle sets the voltages and reads the actual voltages and currents in four
+        steps, so that the power supplies get 0.5 s between commands without blocking,
+        when run as a task with a period of 0.5 s. After quit is set, the power supplies
+        are shut down and the task is cancelled.
+        """
+        if self.quit:
+            self.shut_down()
+            self.stop()
+            if self.task is not None:
+                self.task.cancel()
+            return
+        self.steps[self._step]()
+        self._step = (self._step + 1) % len(self.steps)
+
+    def register(self, scheduler, period=0.5, name=None):
+        """Register update as a task with a :class:`.Scheduler`, instead of starting
+        the thread. The task name defaults to the (unique) thread name."""
+        self.task = scheduler.add_task(name or self.name, self.update, period)
+        return self.task
+
+    def run(self):
+        while not self.quit:
+            for step in self.steps:
+                step()
+                time.sleep(0.5)
+        self.shut_down()
         self.stop()
 
     def stop(self):
-        """ Clean up """
+        """Clean up"""
         time.sleep(0.5)
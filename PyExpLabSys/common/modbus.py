@@ -0,0 +1,331 @@
+"""This module contains a small Modbus transaction layer for reading many registers in
+few requests
+
+Drivers declare their values as a register table; a dict of value names to
+:class:`Register` definitions, and read them with a :class:`RegisterMap`. The register
+map plans the registers into as few block reads as possible (see
+:func:`plan_block_reads`), decodes all values from the bytes of those reads and caches
+the values of registers marked as static, like configuration and serial numbers.
+
+The layer does not talk to the device itself. Reads are done with a ``read_block``
+callable with the signature ``read_block(start, count) -> bytes``, that returns the
+``2 * count`` bytes of the registers in the order they are sent on the wire. For
+:py:class:`minimalmodbus.Instrument` based drivers, such a callable can be made with
+:func:`instrument_read_block`.
+
+Several slaves on the same RS-485 bus can be read back-to-back with a
+:class:`ModbusBus`.
+
+This module is Python 2 and 3 compatible.
+"""
+
+from __future__ import division
+
+import time
+import struct
+import logging
+import threading
+from collections import namedtuple
+
+LOG = logging.getLogger(__name__)
+LOG.addHandler(logging.NullHandler())
+
+#: The maximum number of registers in one read, according to the Modbus specification
+MAX_REGISTERS_PER_READ = 125
+
+#: The definition of a value in a register table. ``address`` is the (0-based) address
+#: of the first register, ``count`` the number of registers, ``decoder`` a function
+#: that converts the bytes of the registers to the value (see e.g. :func:`uint16`) and
+#: ``static`` whether the value is read only once and then cached.
+Register = namedtuple('Register', ['address', 'count', 'decoder', 'static'])
+Register.__new__.__defaults__ = (1, None, False)
+
+
+### Decoders
+def registers_to_bytes(registers):
+    """Convert a list of 16 bit register values to bytes, big endian"""
+    return struct.pack('>{}H'.format(len(registers)), *registers)
+
+
+def uint16(bytes_):
+    """Decode an unsigned 16 bit integer"""
+    return struct.unpack('>H', bytes_)[0]
+
+
+def int16(bytes_):
+    """Decode a signed 16 bit integer"""
+    return struct.unpack('>h', bytes_)[0]
+
+
+def scaled(decoder, number_of_decimals):
+    """Return a decoder, that divides the value of decoder by
+    10 ** number_of_decimals"""
+
+    def scaled_decoder(bytes_):
+        """Decode and scale"""
+        return decoder(bytes_) / 10 ** number_of_decimals
+
+    return scaled_decoder
+
+
+def converted(decoder, conversion_function):
+    """Return a decoder, that applies conversion_function to the value of decoder"""
+
+    def converted_decoder(bytes_):
+        """Decode and convert"""
+        return conversion_function(decoder(bytes_))
+
+    return converted_decoder
+
+
+def int32(bytes_):
+    """Decode a signed 32 bit integer (2 registers, big endian)"""
+    return struct.unpack('>l', bytes_)[0]
+
+
+def uint32(bytes_):
+    """Decode an unsigned 32 bit integer (2 registers, big endian)"""
+    return struct.unpack('>L', bytes_)[0]
+
+
+def float32(bytes_):
+    """Decode a 32 bit float (2 registers, big endian)"""
+    return struct.unpack('>f', bytes_)[0]
+
+
+def string(bytes_):
+    """Decode a string, 2 characters per register"""
+    return bytes_.decode('latin1')
+
+
+def boolean(bytes_):
+    """Decode a boolean, where 0 is False and 0xFFFF is True
+
+    Raises:
+        ValueError: For all other register values
+    """
+    value = uint16(bytes_)
+    if value == 0:
+        return False
+    elif value == 0xFFFF:
+        return True
+    raise ValueError('Only 0 or 65535 can be converted to a boolean')
+
+
+### Planning and reading
+def plan_block_reads(spans, max_registers=MAX_REGISTERS_PER_READ, max_gap=None):
+    """Group register spans into as few block reads as possible
+
+    The spans are sorted by address and a block is extended with the next span as long
+    as the block stays within ``max_registers`` and the gap to the next span is at most
+    ``max_gap`` registers.
+
+    Args:
+        spans (iterable): (address, number of registers) tuples
+        max_registers (int): The maximum number of registers in one read
+        max_gap (int): The maximum number of unused registers between two spans in a
+            block. None means no limit. Use 0 for devices that reject reads of
+            undefined registers.
+
+    Returns:
+        list: List of (start address, number of registers) tuples
+
+    Raises:
+        ValueError: If a single span is longer than max_registers
+    """
+    blocks = []
+    start = end = None
+    for address, count in sorted(set(spans)):
+        if count > max_registers:
+            message = 'A span of {} registers at {} exceeds the maximum of {} per read'
+            raise ValueError(message.format(count, address, max_registers))
+        span_end = address + count
+        if start is not None:
+            if span_end <= end:
+                # Contained in the current block
+                continue
+            if span_end - start <= max_registers and (
+                max_gap is None or address - end <= max_gap
+            ):
+                end = span_end
+                continue
+            blocks.append((start, end - start))
+        start, end = address, span_end
+    if start is not None:
+        blocks.append((start, end - start))
+    return blocks
+
+
+def instrument_read_block(instrument, functioncode=3):
+    """Return a ``read_block`` function for a :py:class:`minimalmodbus.Instrument`
+
+    Args:
+        instrument (minimalmodbus.Instrument): The instrument
+        functioncode (int): The Modbus function code, 3 (holding registers, default)
+            or 4 (input registers)
+    """
+
+    def read_block(start, count):
+        """Read count registers from start and return them as bytes"""
+        return registers_to_bytes(
+            instrument.read_registers(start, count, functioncode=functioncode)
+        )
+
+    return read_block
+
+
+class RegisterMap(object):
+    """Reads named values from a register table in as few block reads as possible
+
+    Attributes:
+        registers (dict): The register table, names to :class:`Register` mapping
+        timings (list): The (start, count, duration in seconds) of the block reads in
+            the last call to :meth:`read`
+    """
+
+    def __init__(
+        self, registers, read_block, max_registers=MAX_REGISTERS_PER_READ, max_gap=None
+    ):
+        """Initialize the register map
+
+        Args:
+            registers (dict): The register table, names to :class:`Register` mapping
+            read_block (callable): Function that reads a block of registers, see the
+                module documentation
+            max_registers (int): The maximum number of registers in one read
+            max_gap (int): The maximum number of unused registers that may be read
+                between two registers in one block. See :func:`plan_block_reads`
+        """
+        self.registers = registers
+        self.read_block = read_block
+        self.max_registers = max_registers
+        self.max_gap = max_gap
+        self.timings = []
+        self._static_values = {}
+        self._plans = {}
+
+    def plan(self, names):
+        """Return the block reads needed to read the registers for names
+
+        The plans are cached per set of names.
+        """
+        key = frozenset(names)
+        if key not in self._plans:
+            spans = [
+                (self.registers[name].address, self.registers[name].count)
+                for name in key
+            ]
+            self._plans[key] = plan_block_reads(spans, self.max_registers, self.max_gap)
+        return self._plans[key]
+
+    def read(self, names=None):
+        """Read the values for names
+
+        Values of static registers are only read the first time.
+
+        Args:
+            names (iterable): The names of the values to read. Default is all names in
+                the register table.
+
+        Returns:
+            dict: Names to values mapping
+
+        Raises:
+            KeyError: On unknown names
+        """
+        if names is None:
+            names = list(self.registers.keys())
+        else:
+            names = list(names)
+            for name in names:
+                if name not in self.registers:
+                    raise KeyError('Unknown register name: {}'.format(name))
+
+        values = {
+            name: self._static_values[name]
+            for name in names
+            if name in self._static_values
+        }
+        to_read = [name for name in names if name not in values]
+
+        self.timings = []
+        buffers = []
+        for start, count in self.plan(to_read):
+            start_time = time.time()
+            bytes_ = self.read_block(start, count)
+            self.timings.append((start, count, time.time() - start_time))
+            buffers.append((start, count, bytes_))
+        if self.timings:
+            LOG.debug(
+                'Read %s values in %s block reads in %.3f s',
+                len(to_read),
+                len(self.timings),
+                sum(timing[2] for timing in self.timings),
+            )
+
+        for name in to_read:
+            register = self.registers[name]
+            for start, count, bytes_ in buffers:
+                if start <= register.address < start + count:
+                    offset = 2 * (register.address - start)
+                    break
+            raw = bytes_[offset : offset + 2 * register.count]
+            value = raw if register.decoder is None else register.decoder(raw)
+            if register.static:
+                self._static_values[name] = value
+            values[name] = value
+        return values
+
+    def invalidate(self, names=None):
+        """Forget the cached values of static registers
+
+        Args:
+            names (iterable): The names to forget. Default is all.
+        """
+        if names is None:
+            self._static_values.clear()
+        else:
+            for name in names:
+                self._static_values.pop(name, None)
+
+
+class ModbusBus(object):
+    """Reads the register maps of several slaves on one RS-485 bus back-to-back
+
+    RS-485 is half duplex, so the transactions of the slaves cannot overlap. The bus
+    holds a lock for the duration of a sweep, so that other users of the bus cannot
+    interleave their transactions, and runs the block reads of all slaves directly
+    after each other.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.slaves = {}
+
+    def add_slave(self, name, register_map):
+        """Add a slave
+
+        Args:
+            name (object): The name to return the values of this slave under
+            register_map (RegisterMap): The register map of the slave
+        """
+        self.slaves[name] = register_map
+
+    def read_all(self, names=None):
+        """Read values from all slaves
+
+        Args:
+            names (dict): Optional slave name to value names mapping. Default is all
+                values for all slaves.
+
+        Returns:
+            dict: Slave name to (value name to value mapping) mapping
+        """
+        values = {}
+        with self.lock:
+            for slave_name, register_map in self.slaves.items():
+                slave_names = None if names is None else names.get(slave_name)
+                if names is not None and slave_names is None:
+                    continue
+                values[slave_name] = register_map.read(slave_names)
+        return values
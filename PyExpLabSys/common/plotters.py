@@ -1,7 +1,7 @@
 # pylint: disable=R0913,R0912
 
 """This module contains plotters for experimental data gathering applications.
-It contains a plotter for data sets.
+It contains a plotter for data sets and a plotter for continuous data.
 """
 
 import time
@@ -195,7 +195,7 @@ class DataPlotter(object):
             point. If set, this value will over write the ``auto_update`` value
         :return: plot content or None
         """
-        self._data[plot].append((numpy.float(point[0]), numpy.float(point[1])))
+        self._data[plot].append((float(point[0]), float(point[1])))
         if update or (update is None and self.auto_update):
             self.update()
 
@@ -218,6 +218,72 @@ class DataPlotter(object):
         return self._plot
 
 
+class CircularSeries(object):
+    """A series of (x, y) points in preallocated circular storage
+
+    Appending a point is O(1) and does not allocate. When the storage is full, the
+    oldest point is overwritten. Every point is written twice, at position ``i`` and
+    ``i + capacity`` of an array of twice the capacity, so that the points are always
+    available as one contiguous view (see :attr:`points`), without copying. x must be
+    non-decreasing, so that the points before some x can be dropped with a binary
+    search (see :meth:`trim`).
+    """
+
+    def __init__(self, capacity):
+        """Initialize the storage
+
+        Args:
+            capacity (int): The maximum number of points
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be positive')
+        self.capacity = capacity
+        self._storage = numpy.empty((2 * capacity, 2))
+        # The logical indices of the first point and of the next point to write
+        self._first = 0
+        self._next = 0
+
+    def __len__(self):
+        return self._next - self._first
+
+    def append(self, x, y):
+        """Append a point"""
+        position = self._next % self.capacity
+        self._storage[position, 0] = self._storage[position + self.capacity, 0] = x
+        self._storage[position, 1] = self._storage[position + self.capacity, 1] = y
+        self._next += 1
+        if self._next - self._first > self.capacity:
+            self._first += 1
+
+    def clear(self):
+        """Remove all points"""
+        self._first = self._next
+
+    def trim(self, start):
+        """Drop the points with x smaller than or equal to start"""
+        drop = numpy.searchsorted(self.x, start, side='right')
+        self._first += int(drop)
+
+    @property
+    def points(self):
+        """The points as an (n, 2) array view, oldest first
+
+        The view is overwritten by later appends, copy it to keep it.
+        """
+        offset = self._first % self.capacity
+        return self._storage[offset : offset + len(self)]
+
+    @property
+    def x(self):  # pylint: disable=invalid-name
+        """The x values as an array view"""
+        return self.points[:, 0]
+
+    @property
+    def y(self):  # pylint: disable=invalid-name
+        """The y values as an array view"""
+        return self.points[:, 1]
+
+
 class ContinuousPlotter(object):
     """This class provides a data plotter for continuous data"""
 
@@ -231,6 +297,7 @@ class ContinuousPlotter(object):
         preload=60,
         auto_update=True,
         backend='none',
+        capacity=100000,
         **kwargs
     ):
         """Initialize the plotting backend, data and local setting
@@ -253,8 +320,11 @@ class ContinuousPlotter(object):
         :param auto_update: Whether all data actions should trigger a update
         :type auto_update: bool
         :param backend: The plotting backend to use. Current only option is
-            'none'
+            'none', which keeps the data of the plotting window in
+            :class:`.CircularSeries`, without plotting it
         :type backend: str
+        :param capacity: The maximum number of points to keep per plot
+        :type capacity: int
 
         Kwargs
 
@@ -284,6 +354,8 @@ class ContinuousPlotter(object):
             message = 'timespan must be positive'
         if preload < 0:
             message = 'preload must be positive or 0'
+        if capacity < 1:
+            message = 'capacity must be positive'
         if backend not in ['none']:
             message = 'Backend must be \'none\''
         for plot in all_plots:
@@ -292,15 +364,13 @@ class ContinuousPlotter(object):
         if message is not None:
             raise ValueError(message)
 
-        # Initiate the backend
+        # Initiate the backend, the 'none' backend does not plot
         self._plot = None
-        print(right_log, left_log)
-        # TODO
 
         # Initiate the data
         self._data = {}
         for plot in all_plots:
-            self._data[plot] = []
+            self._data[plot] = CircularSeries(capacity)
 
         self.timespan = timespan
         self.preload = preload
@@ -309,16 +379,13 @@ class ContinuousPlotter(object):
         self.start = time.time()
         self.end = self.start + timespan
 
-        message = 'No plotter for continuous data implemented'
-        raise NotImplementedError(message)
-
     def add_point_now(self, plot, value, update=None):
         """Add a point to a plot using now as the time
 
         :param plot: The codename for the plot
         :type plot: str
         :param value: The value to add
-        :type value: numpy.float
+        :type value: float
         :param update: Whether a update should be performed after adding the
             point. If set, this value will over write the ``auto_update`` value
         :return: plot content or None
@@ -331,12 +398,12 @@ class ContinuousPlotter(object):
         :param plot: The codename for the plot
         :type plot: str
         :param point: The point to add
-        :type point: Iterable with unix time and value as two numpy.float
+        :type point: Iterable with unix time and value as two floats
         :param update: Whether a update should be performed after adding the
             point. If set, this value will over write the ``auto_update`` value
         :return: plot content or None
         """
-        self._data[plot].append((numpy.float(point[0]), numpy.float(point[1])))
+        self._data[plot].append(point[0], point[1])
         if update or (update is None and self.auto_update):
             self.update()
 
@@ -345,26 +412,35 @@ class ContinuousPlotter(object):
         now = time.time()
         if now > self.end:
             self._reduce(now)
-        self._plot.update(self._data, (self.start, self.end))
+        if self._plot is not None:
+            self._plot.update(self.data, (self.start, self.end))
 
     def _reduce(self, now):
         """Update the plotting window and reduce the data accordingly"""
         self.end = now + self.preload
         self.start = self.end - self.timespan
-        for plot, dataseries in self._data.items():
-            for index, point in enumerate(dataseries):
-                if point[0] > self.start:
-                    self._data[plot] = dataseries[index:]
-                    break
+        # The points before the window are dropped with a binary search
+        for series in self._data.values():
+            series.trim(self.start)
 
     @property
     def data(self):
-        """Get and set the data"""
-        return self._data
+        """Get and set the data
+
+        The data is a dict of codenames to (n, 2) arrays of the points in the
+        plotting window. The arrays are views, that are overwritten by later points.
+        When set, the points for each codename can be given as any iterable of
+        (x, y) points.
+        """
+        return {plot: series.points for plot, series in self._data.items()}
 
     @data.setter
     def data(self, data):  # pylint: disable=C0111
-        self._data = data
+        for plot, points in data.items():
+            series = self._data[plot]
+            series.clear()
+            for x_value, y_value in points:
+                series.append(x_value, y_value)
 
     @property
     def plot(self):
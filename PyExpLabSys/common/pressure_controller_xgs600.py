@@ -2,12 +2,16 @@
 from __future__ import print_function
 import time
 import threading
+import logging
 import queue
 from PyExpLabSys.drivers.xgs600 import XGS600Driver as xgs600
 from PyExpLabSys.common.sockets import DateDataPullSocket
 from PyExpLabSys.common.sockets import DataPushSocket
 from PyExpLabSys.common.sockets import LiveSocket
 
+LOG = logging.getLogger(__name__)
+LOG.addHandler(logging.NullHandler())
+
 
 class XGS600Control(threading.Thread):
     """Read all pressures and control states of
@@ -70,6 +74,8 @@ class XGS600Control(threading.Thread):
             self.db_saver.start()
 
         self.queue = self.pushsocket.queue
+        self.steps = [self.read_pressures, self.read_setpoint_states]
+        self._step = 0
 
     def value(self):
         """Return two lists
@@ -90,8 +96,8 @@ class XGS600Control(threading.Thread):
 
         self.livesocket.set_point_now(self.codenames[0], self.pressures)
         self.livesocket.set_point_now(self.codenames[1], self.setpointstates)
-        print('press:', self.pressures)
-        print('state:', self.setpointstates)
+        LOG.debug('press: %s', self.pressures)
+        LOG.debug('state: %s', self.setpointstates)
 
     def database_saver(self):
         """
@@ -144,46 +150,70 @@ class XGS600Control(threading.Thread):
                 self.updated[channel - 1] = 0
                 print(channel, valve_state, valve_setpoint)
 
-    def run(self):
-        while not self.quit:
-            while True:
-                try:
-                    element = self.queue.get(timeout=0.25)
-                except queue.Empty:
-                    break
-                valve = list(element.keys())[0]
-                state = element[valve]
-                channel = self.valve_properties[valve][0]
-                user_label = self.valve_properties[valve][1]
-                setpoint_on = self.valve_properties[valve][2]
-                setpoint_off = self.valve_properties[valve][3]
-
-                if state.lower() == 'off' or state == 0:
-                    self.xgs600.set_setpoint(channel, state)
+    def read_pressures(self, queue_timeout=0.0):
+        """Set the setpoint states requested on the push socket and read pressures
 
-                else:
-                    self.xgs600.set_setpoint_on(
-                        channel,
-                        sensor_code='user_label',
-                        sensor_count=user_label,
-                        pressure_on=setpoint_on,
-                    )
+        Args:
+            queue_timeout (float): The time to wait for requests on the push socket
+        """
+        while True:
+            try:
+                element = self.queue.get(timeout=queue_timeout)
+            except queue.Empty:
+                break
+            valve = list(element.keys())[0]
+            state = element[valve]
+            channel = self.valve_properties[valve][0]
+            user_label = self.valve_properties[valve][1]
+            setpoint_on = self.valve_properties[valve][2]
+            setpoint_off = self.valve_properties[valve][3]
 
-                    self.xgs600.set_setpoint_off(
-                        channel,
-                        sensor_code='user_label',
-                        sensor_count=user_label,
-                        pressure_off=setpoint_off,
-                    )
+            if state.lower() == 'off' or state == 0:
+                self.xgs600.set_setpoint(channel, state)
 
-                    self.xgs600.set_setpoint(channel, state)
+            else:
+                self.xgs600.set_setpoint_on(
+                    channel,
+                    sensor_code='user_label',
+                    sensor_count=user_label,
+                    pressure_on=setpoint_on,
+                )
 
-            # Read values of pressures and states of setpoint
-            self.pressures = self.xgs600.read_all_pressures()
-            time.sleep(0.1)
-            self.setpointstates = self.xgs600.read_setpoint_state()
-            time.sleep(0.1)
+                self.xgs600.set_setpoint_off(
+                    channel,
+                    sensor_code='user_label',
+                    sensor_count=user_label,
+                    pressure_off=setpoint_off,
+                )
+
+                self.xgs600.set_setpoint(channel, state)
+
+        self.pressures = self.xgs600.read_all_pressures()
+
+    def read_setpoint_states(self):
+        """Read setpoint states, update the sockets and log to the database"""
+        self.setpointstates = self.xgs600.read_setpoint_state()
+        self.update_new_setpoint()
+        self.database_saver()
 
-            self.update_new_setpoint()
+    def update(self):
+        """Do the next step of the update cycle
 
-            self.database_saver()
+        A cycle sets the requested setpoint states and reads the pressures in the first
+        step and reads the setpoint states and logs in the second, so that the xgs600
+        gets time between commands without blocking, when run as a task.
+        """
+        self.steps[self._step]()
+        self._step = (self._step + 1) % len(self.steps)
+
+    def register(self, scheduler, period=0.25, name=None):
+        """Register update as a task with a :class:`.Scheduler`, instead of starting
+        the thread. The task name defaults to the (unique) thread name."""
+        return scheduler.add_task(name or self.name, self.update, period)
+
+    def run(self):
+        while not self.quit:
+            self.read_pressures(queue_timeout=0.25)
+            time.sleep(0.1)
+            self.read_setpoint_states()
+            time.sleep(0.1)
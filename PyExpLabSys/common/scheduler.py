@@ -0,0 +1,223 @@
+"""This module contains a scheduler that runs periodic tasks in a single thread
+
+Instead of a thread per device, with a ``while`` loop and a fixed ``time.sleep``,
+the periodic work of many devices can be registered as tasks with one
+:class:`Scheduler`. Each task has its own period and the scheduler runs the task with
+the earliest deadline next, so the tasks keep their periods, independent of how long
+the other tasks take, as long as the total work fits in the time available.
+
+For every task the scheduler keeps statistics (see :meth:`Task.statistics`) of the
+jitter (how late the task was started compared to its deadline), the duration of the
+runs and the number of overruns (runs that did not finish before the next deadline).
+After an overrun, the runs that were missed are skipped, so the task does not run
+back-to-back to catch up.
+
+Example::
+
+    scheduler = Scheduler()
+    scheduler.add_task('pressure', read_pressure, period=0.1)
+    scheduler.add_task('temperature', read_temperature, period=1.0)
+    scheduler.start()
+    ...
+    print(scheduler.statistics())
+
+The reader and controller classes in :mod:`PyExpLabSys.common`, that used to be run as
+threads, have an ``update`` method, that does one iteration of the old loop, and a
+``register`` method to register it as a task.
+
+This module is Python 2 and 3 compatible.
+"""
+
+from __future__ import division
+
+import math
+import time
+import heapq
+import logging
+import threading
+import itertools
+
+LOG = logging.getLogger(__name__)
+LOG.addHandler(logging.NullHandler())
+
+
+class Task(object):
+    """A periodic task
+
+    Attributes:
+        name (str): The name of the task
+        function (callable): The function to call, without arguments
+        period (float): The period in seconds
+        deadline (float): The time of the next scheduled run
+        cancelled (bool): Whether the task has been cancelled
+        runs (int): The number of runs
+        errors (int): The number of runs that raised an exception
+        overruns (int): The number of runs that did not finish before the next deadline
+        skipped (int): The number of runs skipped after overruns
+    """
+
+    def __init__(self, name, function, period, deadline):
+        self.name = name
+        self.function = function
+        self.period = period
+        self.deadline = deadline
+        self.cancelled = False
+        self.runs = 0
+        self.errors = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.last_duration = None
+        self.max_duration = 0.0
+        self._duration_sum = 0.0
+        self.max_jitter = 0.0
+        # Running mean and sum of squared deviations of the jitter (Welford)
+        self._jitter_mean = 0.0
+        self._jitter_m2 = 0.0
+
+    def cancel(self):
+        """Cancel the task. It will not be run again."""
+        self.cancelled = True
+
+    def run(self, now):
+        """Run the task and update deadline and statistics
+
+        Args:
+            now (float): The time the run was started
+        """
+        jitter = now - self.deadline
+        try:
+            self.function()
+        except Exception:  # pylint: disable=broad-except
+            self.errors += 1
+            LOG.exception('Exception in scheduled task %s', self.name)
+        end = time.time()
+
+        self.runs += 1
+        delta = jitter - self._jitter_mean
+        self._jitter_mean += delta / self.runs
+        self._jitter_m2 += delta * (jitter - self._jitter_mean)
+        self.max_jitter = max(self.max_jitter, jitter)
+        self.last_duration = end - now
+        self.max_duration = max(self.max_duration, self.last_duration)
+        self._duration_sum += self.last_duration
+
+        self.deadline += self.period
+        if end > self.deadline:
+            # Skip the runs that were missed
+            self.overruns += 1
+            missed = int(math.ceil((end - self.deadline) / self.period))
+            self.skipped += missed
+            self.deadline += missed * self.period
+            LOG.debug('Task %s overran, skipping %s runs', self.name, missed)
+
+    def statistics(self):
+        """Return the statistics of the task
+
+        Returns:
+            dict: With the keys 'period', 'runs', 'errors', 'overruns', 'skipped',
+            'mean_jitter', 'std_jitter', 'max_jitter', 'last_duration',
+            'mean_duration' and 'max_duration'. Times are in seconds.
+        """
+        runs = self.runs
+        return {
+            'period': self.period,
+            'runs': runs,
+            'errors': self.errors,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'mean_jitter': self._jitter_mean,
+            'std_jitter': math.sqrt(self._jitter_m2 / runs) if runs else 0.0,
+            'max_jitter': self.max_jitter,
+            'last_duration': self.last_duration,
+            'mean_duration': self._duration_sum / runs if runs else None,
+            'max_duration': self.max_duration,
+        }
+
+
+class Scheduler(threading.Thread):
+    """Runs periodic tasks in a single thread, earliest deadline first"""
+
+    def __init__(self, name='Scheduler'):
+        threading.Thread.__init__(self, name=name)
+        self.daemon = True
+        self.tasks = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._quit = False
+
+    def add_task(self, name, function, period, offset=0.0):
+        """Add a periodic task
+
+        Args:
+            name (str): The name of the task, must be unique
+            function (callable): The function to call, without arguments
+            period (float): The period in seconds
+            offset (float): The delay before the first run, e.g. to spread out tasks
+                with the same period
+
+        Returns:
+            Task: The task
+
+        Raises:
+            ValueError: If the name is already used or the period is not positive
+        """
+        if period <= 0:
+            raise ValueError('The period must be positive')
+        with self._lock:
+            if name in self.tasks and not self.tasks[name].cancelled:
+                raise ValueError('A task named \'{}\' already exists'.format(name))
+            task = Task(name, function, period, time.time() + offset)
+            self.tasks[name] = task
+            heapq.heappush(self._heap, (task.deadline, next(self._counter), task))
+        self._wakeup.set()
+        return task
+
+    def remove_task(self, name):
+        """Cancel and remove the task called name
+
+        Raises:
+            KeyError: On unknown name
+        """
+        with self._lock:
+            self.tasks.pop(name).cancel()
+
+    def statistics(self):
+        """Return the statistics of all tasks, as a dict of names to statistics, see
+        :meth:`Task.statistics`
+        """
+        with self._lock:
+            return {name: task.statistics() for name, task in self.tasks.items()}
+
+    def run(self):
+        while not self._quit:
+            with self._lock:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                task = self._heap[0][2] if self._heap else None
+            if task is None:
+                timeout = None
+            else:
+                timeout = task.deadline - time.time()
+            if timeout is None or timeout > 0:
+                # Wait for the deadline or until tasks are added or stop is called
+                self._wakeup.wait(timeout)
+                self._wakeup.clear()
+                continue
+
+            with self._lock:
+                heapq.heappop(self._heap)
+            task.run(time.time())
+            with self._lock:
+                if not task.cancelled:
+                    heapq.heappush(
+                        self._heap, (task.deadline, next(self._counter), task)
+                    )
+
+    def stop(self):
+        """Stop the scheduler thread"""
+        self._quit = True
+        self._wakeup.set()
+        if self.is_alive():
+            self.join()
@@ -4,12 +4,65 @@ from __future__ import unicode_literals, print_function
 
 
 import socket
+import struct
 import sys
 import json
 
 
 OLD_DATA = 'OLD_DATA'
-CHUNK_SIZE = 1024
+# The reply of the pull sockets to unknown commands (sic)
+UNKNOWN_COMMAND = 'UNKNOWN_COMMMAND'
+#: The largest possible UDP datagram, replies are read in one call with this size
+MAX_DATAGRAM_SIZE = 65535
+# The binary format, see PyExpLabSys.common.sockets.pack_bin
+BIN_MAGIC = b'PBIN'
+BIN_WN_MAGIC = b'PBWN'
+BIN_HEADER = struct.Struct('<4sH')
+BIN_OLD_FLAG = 0x8000
+
+
+def unpack_bin(data, codenames=None):
+    """Unpack a reply to one of the ``bin`` commands of the pull sockets
+
+    Args:
+        data (bytes): The reply
+        codenames (list): The codenames of the socket, needed to resolve the
+            codename indices of a ``bin`` reply. A ``bin_wn`` reply contains them.
+
+    Returns:
+        list: List of (codename, point) tuples where point is a [x, y] list or
+            :data:`OLD_DATA`
+
+    Raises:
+        ValueError: If the data is not a reply in the binary format
+    """
+    try:
+        magic, number = BIN_HEADER.unpack_from(data)
+    except struct.error:
+        raise ValueError('Reply is not in the binary format: {!r}'.format(data[:50]))
+    offset = BIN_HEADER.size
+    if magic == BIN_WN_MAGIC:
+        (length,) = struct.unpack_from('<H', data, offset)
+        offset += 2
+        codenames = data[offset : offset + length].decode('ascii').split(',')
+        offset += length
+    elif magic != BIN_MAGIC:
+        raise ValueError('Reply is not in the binary format: {!r}'.format(data[:50]))
+    if codenames is None:
+        raise ValueError('The codenames are needed to unpack a bin reply')
+
+    indices = struct.unpack_from('<{}H'.format(number), data, offset)
+    offset += 2 * number
+    values = struct.unpack_from('<{}d'.format(2 * number), data, offset)
+    out = []
+    for position, index in enumerate(indices):
+        if index & BIN_OLD_FLAG:
+            out.append((codenames[index & ~BIN_OLD_FLAG], OLD_DATA))
+        else:
+            out.append(
+                (codenames[index], list(values[2 * position : 2 * position + 2]))
+            )
+    return out
 
 
 class DateDataPullClient(object):
@@ -25,9 +78,16 @@ class DateDataPullClient(object):
         port=9000,
         exception_on_old_data=True,
         timeout=None,
+        binary=False,
     ):
-        """Initialize the DateDataPullClient object"""
+        """Initialize the DateDataPullClient object
+
+        Args:
+            binary (bool): Whether to get the data with the compact binary
+                ``bin`` commands instead of json
+        """
         self.exception_on_old_data = exception_on_old_data
+        self.binary = binary
         self.socket_ = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         if timeout is not None:
             self.socket_.settimeout(timeout)
@@ -46,17 +106,15 @@ class DateDataPullClient(object):
         self.codenames = json.loads(codenames_json)
         self.codenames_set = set(self.codenames)
 
+    def _communicate_bytes(self, command):
+        """Encode and send a command for a socket and return the reply as bytes"""
+        self.socket_.sendto(command.encode('utf-8'), self.host_port)
+        # A reply is a single datagram, which must be read in one call
+        return self.socket_.recv(MAX_DATAGRAM_SIZE)
+
     def _communicate(self, command):
         """Encode, send and decode a command for a socket"""
-        self.socket_.sendto(command.encode('utf-8'), self.host_port)
-        # Received all
-        received = b''
-        while True:
-            chunk = self.socket_.recv(CHUNK_SIZE)
-            received += chunk
-            if len(chunk) < CHUNK_SIZE:
-                break
-        return received.decode('utf-8')
+        return self._communicate_bytes(command).decode('utf-8')
 
     def get_field(self, fieldname):
         """Return field by name"""
@@ -65,21 +123,97 @@ class DateDataPullClient(object):
             msg = 'Unknown fieldnames, valid fields are: {}'.format(self.codenames)
             raise ValueError(msg)
 
-        data_json = self._communicate('{}#json'.format(fieldname))
-        data = json.loads(data_json)
+        if self.binary:
+            data = unpack_bin(
+                self._communicate_bytes('{}#bin'.format(fieldname)), self.codenames
+            )[0][1]
+        else:
+            data_json = self._communicate('{}#json'.format(fieldname))
+            data = json.loads(data_json)
         if data == OLD_DATA and self.exception_on_old_data:
             raise ValueError('Old data')
         return data
 
     def get_all_fields(self):
         """Return all fields"""
-        data_json = self._communicate('json_wn')
-        data = json.loads(data_json)
+        if self.binary:
+            data = dict(unpack_bin(self._communicate_bytes('bin'), self.codenames))
+        else:
+            data_json = self._communicate('json_wn')
+            data = json.loads(data_json)
+        for fieldname, value in data.items():
+            if value == OLD_DATA and self.exception_on_old_data:
+                raise ValueError('Old data, for field "{}"'.format(fieldname))
+        return data
+
+    def get_many(self, fieldnames):
+        """Return several fields by name, with a single ``json_wn`` request
+
+        Args:
+            fieldnames (list): The names of the fields
+
+        Returns:
+            dict: Field names to values mapping
+        """
+        unknown = set(fieldnames) - self.codenames_set
+        if unknown:
+            msg = 'Unknown fieldnames {}, valid fields are: {}'.format(
+                sorted(unknown), self.codenames
+            )
+            raise ValueError(msg)
+
+        all_data = json.loads(self._communicate('json_wn'))
+        data = {fieldname: all_data[fieldname] for fieldname in fieldnames}
         for fieldname, value in data.items():
             if value == OLD_DATA and self.exception_on_old_data:
                 raise ValueError('Old data, for field "{}"'.format(fieldname))
         return data
 
+    def get_history(self, fieldname, since=None, max_points=None, method=None):
+        """Return the point history of a field, from a socket that keeps one
+
+        Replies are limited in size, so if the history does not fit in one
+        reply, the rest is requested until all points are received.
+
+        Args:
+            fieldname (str): The name of the field
+            since (float): If given, only return the points with x larger than
+                this, e.g. the x of the last point received earlier
+            max_points (int): If given, the socket decimates the points to at
+                most this many
+            method (str): The decimation method, see
+                :mod:`PyExpLabSys.common.decimation`. Default is minmax.
+
+        Returns:
+            list: List of [x, y] lists, oldest first
+
+        Raises:
+            ValueError: On unknown fieldname or if the socket does not keep a
+                history for the field
+        """
+        if fieldname not in self.codenames_set:
+            msg = 'Unknown fieldnames, valid fields are: {}'.format(self.codenames)
+            raise ValueError(msg)
+
+        points = []
+        while True:
+            arguments = [
+                '' if since is None else repr(float(since)),
+                '' if max_points is None else str(int(max_points)),
+                method or '',
+            ]
+            command = ':'.join(['{}#history'.format(fieldname)] + arguments).rstrip(':')
+            reply = self._communicate(command)
+            if reply == UNKNOWN_COMMAND:
+                raise ValueError(
+                    'No history for field "{}": {}'.format(fieldname, reply)
+                )
+            data = json.loads(reply)
+            points.extend(data['points'])
+            if not data['more'] or not data['points']:
+                return points
+            since = data['points'][-1][0]
+
     def get_status(self):
         """Return the system status of the socket host"""
         status_json = self._communicate("status")
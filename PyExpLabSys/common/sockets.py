@@ -50,6 +50,7 @@ except ImportError:
     import socketserver as SocketServer
 import time
 import json
+import struct
 
 try:
     import Queue
@@ -57,6 +58,19 @@ except ImportError:
     # Queue was renamed to queue in Python 3
     import queue as Queue
 import logging
+
+try:
+    import asyncio
+except ImportError:
+    # asyncio is only available on Python 3
+    asyncio = None  # pylint: disable=invalid-name
+try:
+    import numpy
+    from . import decimation
+except ImportError:
+    # numpy is only needed for the point history of the pull sockets
+    numpy = None  # pylint: disable=invalid-name
+    decimation = None  # pylint: disable=invalid-name
 from .utilities import call_spec_string
 from .system_status import SystemStatus
 from ..settings import Settings
@@ -113,6 +127,308 @@ def socket_server_status():
     return status_dict
 
 
+def status_reply():
+    """Returns the reply to the status command, which is a json encoded dict
+    with the system status and the status of all socket servers
+
+    The system status is served from its pre-serialized snapshot. The first call
+    starts the background refresh of the system status.
+    """
+    SYSTEM_STATUS.start_refresh()
+    return '{{"system_status": {}, "socket_server_status": {}}}'.format(
+        SYSTEM_STATUS.complete_status_json(), json.dumps(socket_server_status())
+    )
+
+
+def pack_bin(indices, points, codenames=None):
+    """Pack points in the binary format of the ``bin`` commands
+
+    All numbers are little endian. The format is:
+
+     * A header of 4 magic bytes, :data:`.BIN_MAGIC` or, if codenames are
+       included, :data:`.BIN_WN_MAGIC`, followed by the number of points ``n``
+       as an unsigned short
+     * If codenames are included, their length in bytes as an unsigned short
+       followed by the codenames, comma separated and ascii encoded
+     * ``n`` unsigned shorts with the indices of the codenames of the points in
+       the list of codenames of the socket. If the data for a point is too old
+       the index is or'ed with :data:`.BIN_OLD_FLAG`
+     * ``n`` pairs of doubles with the points. Values that cannot be converted
+       to floats are sent as NaN.
+
+    Args:
+        indices (list): The codename indices of the points, including the old
+            data flag
+        points (list): The (x, y) points
+        codenames (list): If given, the codenames to include in the header
+
+    Returns:
+        bytes: The packed points
+    """
+    values = []
+    for point in points:
+        for value in point:
+            try:
+                values.append(float(value))
+            except (TypeError, ValueError):
+                values.append(float('nan'))
+    number = len(indices)
+    if codenames is None:
+        header = BIN_HEADER.pack(BIN_MAGIC, number)
+    else:
+        names = ','.join(codenames).encode('ascii')
+        header = (
+            BIN_HEADER.pack(BIN_WN_MAGIC, number)
+            + struct.pack('<H', len(names))
+            + names
+        )
+    return (
+        header
+        + struct.pack('<{}H'.format(number), *indices)
+        + struct.pack('<{}d'.format(len(values)), *values)
+    )
+
+
+class HistoryBuffer(object):
+    """Fixed size ring buffer with the latest (x, y) points of a codename
+
+    The points are stored in a preallocated :py:mod:`numpy` array, so that
+    appending a point does not allocate and the oldest points are overwritten
+    when the buffer is full. Values that cannot be converted to floats are
+    stored as NaN.
+    """
+
+    def __init__(self, size):
+        """Initialize the buffer
+
+        Args:
+            size (int): The number of points to keep
+        """
+        if numpy is None:
+            raise RuntimeError('numpy is required for the point history')
+        self.size = size
+        self.points = numpy.empty((size, 2))
+        # The total number of points appended
+        self.count = 0
+
+    def append(self, point):
+        """Append a point"""
+        index = self.count % self.size
+        try:
+            self.points[index] = point
+        except (TypeError, ValueError):
+            self.points[index] = (float('nan'), float('nan'))
+            for column, value in enumerate(point):
+                try:
+                    self.points[index, column] = float(value)
+                except (TypeError, ValueError):
+                    pass
+        self.count += 1
+
+    def get(self, since=None):
+        """Return the points, oldest first
+
+        Args:
+            since (float): If given, only return the points with x larger than
+                this
+
+        Returns:
+            numpy.ndarray: An (n, 2) array of points
+        """
+        if self.count <= self.size:
+            points = self.points[: self.count]
+        else:
+            start = self.count % self.size
+            points = numpy.concatenate((self.points[start:], self.points[:start]))
+        if since is not None:
+            points = points[points[:, 0] > since]
+        return points
+
+
+SERVERLOG = logging.getLogger(__name__ + '.servers')
+SERVERLOG.addHandler(logging.NullHandler())
+
+
+class ThreadingUDPServer(SocketServer.ThreadingMixIn, SocketServer.UDPServer):
+    """A UDP server that handles each request in a new daemon thread"""
+
+    daemon_threads = True
+
+
+class AsyncioUDPServer(object):
+    """A UDP server whose socket is served by an asyncio datagram endpoint
+
+    All :class:`AsyncioUDPServer` instances share a single event loop, running
+    in a daemon thread (see :func:`asyncio_event_loop`), which receives the
+    datagrams for all of them. The requests are handled by instances of the
+    request handler class in the executor of the loop, so that a slow request
+    does not hold up the others.
+
+    The server has the parts of the :py:class:`SocketServer.UDPServer`
+    interface that the socket servers and request handlers in this module use,
+    so it can be used in place of one.
+    """
+
+    def __init__(
+        self, server_address, RequestHandlerClass  # pylint: disable=invalid-name
+    ):
+        """Initialize the server
+
+        The socket is bound here, like it is for
+        :py:class:`SocketServer.UDPServer`, but datagrams are not received
+        before :meth:`serve_forever` is called.
+
+        Args:
+            server_address (tuple): The (host, port) address to bind to
+            RequestHandlerClass (Sub-class of SocketServer.BaseRequestHandler):
+                The request handler class
+        """
+        if asyncio is None:
+            raise RuntimeError('The asyncio server type requires Python 3')
+        self.RequestHandlerClass = RequestHandlerClass  # pylint: disable=invalid-name
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self.socket.bind(server_address)
+        except socket.error:
+            self.socket.close()
+            raise
+        self.server_address = self.socket.getsockname()
+        self._loop = None
+        self._transport = None
+        self._shutdown_request = threading.Event()
+        self._is_shut_down = threading.Event()
+        self._is_shut_down.set()
+
+    def serve_forever(self):
+        """Receive datagrams in the shared event loop until :meth:`shutdown`"""
+        self._is_shut_down.clear()
+        try:
+            self._loop = asyncio_event_loop()
+            endpoint = self._loop.create_datagram_endpoint(
+                lambda: _DatagramProtocol(self), sock=self.socket
+            )
+            asyncio.run_coroutine_threadsafe(endpoint, self._loop).result()
+            self._shutdown_request.wait()
+            self._loop.call_soon_threadsafe(self._transport.close)
+        finally:
+            self._is_shut_down.set()
+
+    def shutdown(self):
+        """Stop :meth:`serve_forever` and wait until it has stopped"""
+        self._shutdown_request.set()
+        self._is_shut_down.wait()
+
+    def server_close(self):
+        """Close the socket"""
+        if self._transport is None:
+            self.socket.close()
+
+    def process_request(self, data, client_address):
+        """Handle a single datagram in the executor of the event loop"""
+        request = (data, _TransportSocket(self._transport))
+        self._loop.run_in_executor(None, self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        """Instantiate the request handler, which handles the request"""
+        try:
+            self.RequestHandlerClass(request, client_address, self)
+        except Exception:  # pylint: disable=broad-except
+            SERVERLOG.exception(
+                'Exception while handling request from %s', client_address
+            )
+
+
+class _TransportSocket(object):
+    """Makes a datagram transport look enough like a socket for the request
+    handlers to send replies through it
+    """
+
+    def __init__(self, transport):
+        self._transport = transport
+
+    def sendto(self, data, address):
+        """Send data to address"""
+        self._transport.sendto(data, address)
+
+
+if asyncio is not None:
+
+    class _DatagramProtocol(asyncio.DatagramProtocol):
+        """Passes the datagrams received on an endpoint on to the server"""
+
+        def __init__(self, server):
+            super(_DatagramProtocol, self).__init__()
+            self.server = server
+
+        def connection_made(self, transport):
+            # Set here, since datagrams may arrive before the endpoint
+            # coroutine returns the transport
+            self.server._transport = transport  # pylint: disable=protected-access
+
+        def datagram_received(self, data, addr):
+            self.server.process_request(data, addr)
+
+        def error_received(self, exc):
+            SERVERLOG.error(
+                'Error received on port %s: %s', self.server.server_address[1], exc
+            )
+
+
+_ASYNCIO_LOOP = None
+_ASYNCIO_LOOP_LOCK = threading.Lock()
+
+
+def asyncio_event_loop():
+    """Returns the event loop shared by all asyncio socket servers
+
+    The loop is created and started in a daemon thread on first use.
+    """
+    global _ASYNCIO_LOOP  # pylint: disable=global-statement
+    with _ASYNCIO_LOOP_LOCK:
+        if _ASYNCIO_LOOP is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name='SocketServersEventLoop'
+            )
+            thread.daemon = True
+            thread.start()
+            _ASYNCIO_LOOP = loop
+    return _ASYNCIO_LOOP
+
+
+def make_server(port, handler_class, server_type='udp'):
+    """Returns a socket server of the requested type
+
+    Args:
+        port (int): The network port to serve on
+        handler_class (Sub-class of SocketServer.BaseRequestHandler): The
+            request handler class
+        server_type (str): The concurrency model of the server. One of
+            :data:`.SERVER_TYPES`:
+
+             * ``'udp'`` (default) a :py:class:`SocketServer.UDPServer` that
+               handles one request at a time
+             * ``'threading'`` a :class:`.ThreadingUDPServer` that handles
+               each request in its own thread
+             * ``'asyncio'`` an :class:`.AsyncioUDPServer` that receives on
+               an event loop shared by all asyncio servers and handles the
+               requests in its executor
+
+    Raises:
+        ValueError: On an unknown server type
+    """
+    if server_type == 'udp':
+        return SocketServer.UDPServer(('', port), handler_class)
+    elif server_type == 'threading':
+        return ThreadingUDPServer(('', port), handler_class)
+    elif server_type == 'asyncio':
+        return AsyncioUDPServer(('', port), handler_class)
+    message = 'Unknown server type \'{}\'. Must be one of: {}'.format(
+        server_type, SERVER_TYPES
+    )
+    raise ValueError(message)
+
+
 PULLUHLOG = logging.getLogger(__name__ + '.PullUDPHandler')
 PULLUHLOG.addHandler(logging.NullHandler())
 
@@ -147,6 +463,26 @@ class PullUDPHandler(SocketServer.BaseRequestHandler):
            form ``x,y``
          * **codename#json** (*str*): Return the value for ``codename`` as a
            list (e.g ``[x1, y1]``) contained in a :py:mod:`json` string
+         * **bin** (*bytes*): Return all values packed in the binary format
+           described in :func:`.pack_bin`. The order is the same as in ``raw``.
+         * **bin_wn** (*bytes*): (wn = with names) Same as bin, but with the
+           comma separated codenames in the header
+         * **codename#bin** (*bytes*): Return the value for ``codename`` in
+           the binary format
+         * **codename#history[:since[:max_points[:method]]]** (*str*): Return the
+           point history of ``codename``, if the socket keeps one (see the
+           ``history`` argument of the pull sockets), as a :py:mod:`json`
+           string of a dict: ``{"points": [[x1, y1], ...], "more": false}``.
+           The points are oldest first. If ``since`` is given, only the points
+           with x larger than ``since`` are returned, so a client can fetch
+           only the points that are new since its last request. If
+           ``max_points`` is given, the points are decimated to at most that
+           many, with ``method`` (one of
+           :data:`PyExpLabSys.common.decimation.METHODS`, default ``minmax``,
+           see :mod:`PyExpLabSys.common.decimation`). At most
+           :data:`.HISTORY_MAX_POINTS` points fit in a reply; if there are
+           more, the oldest are returned and ``more`` is true, so the rest can
+           be requested with the last x as ``since``.
          * **codenames_raw** (*str*): Return the list of codenames on the form
            ``name1,name2``
          * **codenames_json** (*str*): Return a list of the codenames contained
@@ -166,14 +502,83 @@ class PullUDPHandler(SocketServer.BaseRequestHandler):
             self.port,
         )
 
+        response = self._response(command)
+        sock.sendto(response, self.client_address)
+        PULLUHLOG.debug('Sent back \'%s\' to %s', response, self.client_address)
+
+    def _response(self, command):
+        """Returns the encoded response for a command
+
+        The encoded responses are cached per command in the ``'cache'`` entry
+        in :data:`.DATA`, so that repeated requests for unchanged data are
+        served without formatting anything. The cache is replaced by an empty
+        one on every ``set_point`` and each entry is only valid until the
+        first of the points it was formed from times out.
+
+        Args:
+            command (str): Complete command
+
+        Returns:
+            bytes: The encoded data (or error) to be sent back
+        """
+        if command in UNCACHED_COMMANDS:
+            data = self._format(command)
+            return data if isinstance(data, bytes) else data.encode('ascii')
+
+        port_data = DATA.get(self.port, {})
+        cache = port_data.get('cache')
+        if cache is not None:
+            entry = cache.get(command)
+            if entry is not None and time.time() < entry[1]:
+                return entry[0]
+
+        # Format under the lock, so that points and timestamps cannot be
+        # changed half way through
+        with PULL_LOCK:
+            cache = port_data.get('cache')
+            started = time.time()
+            data = self._format(command)
+            if cache is not None:
+                valid_until = self._valid_until(started)
+
+        response = data if isinstance(data, bytes) else data.encode('ascii')
+        # If a point was set after we let go of the lock, cache is no longer in
+        # DATA and the entry simply goes away with it
+        if cache is not None and data != UNKNOWN_COMMAND:
+            cache[command] = (response, valid_until)
+        return response
+
+    def _format(self, command):
+        """Returns a string for a single value or all values command"""
         if command.count('#') == 1:
-            data = self._single_value(command)
+            return self._single_value(command)
+        # The "name" and "status" commands are also handled here
+        return self._all_values(command)
+
+    def _valid_until(self, started):
+        """Returns the time at which the first not yet timed out point will
+        time out, or infinity if that never happens
+
+        Args:
+            started (float): The time at which the formatting of the response
+                started
+        """
+        port_data = DATA[self.port]
+        if port_data['type'] == 'date':
+            references = {
+                codename: point[0] for codename, point in port_data['data'].items()
+            }
         else:
-            # The "name" and "status" commands are also handled here
-            data = self._all_values(command)
+            references = port_data['timestamps']
 
-        sock.sendto(data.encode('ascii'), self.client_address)
-        PULLUHLOG.debug('Sent back \'%s\' to %s', data, self.client_address)
+        valid_until = float('inf')
+        for codename, timeout in port_data.get('timeouts', {}).items():
+            if timeout is None:
+                continue
+            expiry = references[codename] + timeout
+            if started <= expiry < valid_until:
+                valid_until = expiry
+        return valid_until
 
     def _single_value(self, command):
         """Returns a string for a single point
@@ -198,6 +603,14 @@ class PullUDPHandler(SocketServer.BaseRequestHandler):
                 out = json.dumps(OLD_DATA)
             else:
                 out = json.dumps(DATA[self.port]['data'][name])
+        # Return packed in the binary format
+        elif command == 'bin' and name in DATA[self.port]['data']:
+            out = self._bin([name])
+        # Return the point history
+        elif command.split(':')[0] == 'history' and name in DATA[self.port].get(
+            'history', {}
+        ):
+            out = self._history(name, command.split(':')[1:])
         # The command is unknown
         else:
             out = UNKNOWN_COMMAND
@@ -254,6 +667,12 @@ class PullUDPHandler(SocketServer.BaseRequestHandler):
                 if self._old_data(codename):
                     datacopy[codename] = OLD_DATA
             out = json.dumps(datacopy)
+        # Return all measurements packed in the binary format
+        elif command == 'bin':
+            out = self._bin(DATA[self.port]['codenames'])
+        # Return all measurements packed in the binary format with names
+        elif command == 'bin_wn':
+            out = self._bin(DATA[self.port]['codenames'], with_names=True)
         # Return all codesnames in a raw string
         elif command == 'codenames_raw':
             out = ','.join(DATA[self.port]['codenames'])
@@ -265,18 +684,71 @@ class PullUDPHandler(SocketServer.BaseRequestHandler):
             out = DATA[self.port]['name']
         # Return status of system and all socket servers
         elif command == 'status':
-            out = json.dumps(
-                {
-                    'system_status': SYSTEM_STATUS.complete_status(),
-                    'socket_server_status': socket_server_status(),
-                }
-            )
+            out = status_reply()
         # The command is not known
         else:
             out = UNKNOWN_COMMAND
 
         return out
 
+    def _history(self, codename, arguments):
+        """Returns the history reply for codename
+
+        Args:
+            codename (str): The codename
+            arguments (list): The arguments of the command as strings; since,
+                max_points and method, all optional
+
+        Returns:
+            str: The json encoded history (or an error) to be sent back
+        """
+        if len(arguments) > 3:
+            return UNKNOWN_COMMAND
+        # Missing and empty arguments mean the defaults
+        since, max_points, method = (list(arguments) + ['', '', ''])[:3]
+        try:
+            since = float(since) if since else None
+            max_points = int(max_points) if max_points else None
+        except ValueError:
+            return UNKNOWN_COMMAND
+        method = method or 'minmax'
+        if method not in decimation.METHODS:
+            return UNKNOWN_COMMAND
+
+        points = DATA[self.port]['history'][codename].get(since)
+        if max_points is not None:
+            indices = decimation.decimate_indices(
+                points[:, 1], min(max_points, HISTORY_MAX_POINTS), method, points[:, 0]
+            )
+            points = points[indices]
+        more = len(points) > HISTORY_MAX_POINTS
+        if more:
+            points = points[:HISTORY_MAX_POINTS]
+        return json.dumps({'points': points.tolist(), 'more': more})
+
+    def _bin(self, codenames, with_names=False):
+        """Returns the points for codenames packed with :func:`.pack_bin`
+
+        Args:
+            codenames (list): The codenames to pack
+            with_names (bool): Whether to include the codenames in the header
+
+        Returns:
+            bytes: The packed points
+        """
+        all_codenames = DATA[self.port]['codenames']
+        indices = []
+        points = []
+        for codename in codenames:
+            index = all_codenames.index(codename)
+            if self._old_data(codename):
+                indices.append(index | BIN_OLD_FLAG)
+                points.append((float('nan'), float('nan')))
+            else:
+                indices.append(index)
+                points.append(DATA[self.port]['data'][codename])
+        return pack_bin(indices, points, all_codenames if with_names else None)
+
     def _old_data(self, codename):
         """Checks if the data for codename has timed out
 
@@ -342,6 +814,8 @@ class CommonDataPullSocket(threading.Thread):
         activity_timeout,
         init_timeouts=True,
         handler_class=PullUDPHandler,
+        server_type='udp',
+        history=None,
     ):
         """Initializes internal variables and data structure in the
         :data:`.DATA` module variable
@@ -372,6 +846,13 @@ class CommonDataPullSocket(threading.Thread):
                 socket servers.
             activity_timeout (float or int): The timespan in seconds which
                 constitutes in-activity
+            server_type (str): The concurrency model of the socket server. See
+                :func:`.make_server` for the possible values
+            history (int or dict): If given, the socket keeps the latest points
+                of the codenames in a :class:`.HistoryBuffer`, served with the
+                ``codename#history`` command. An int is the number of points to
+                keep for all codenames and a dict maps codenames to the number
+                of points to keep for them. Requires :py:mod:`numpy`.
         """
         CDPULLSLOG.info('Initialize with: %s', call_spec_string())
         # Init thread
@@ -435,9 +916,22 @@ class CommonDataPullSocket(threading.Thread):
             if init_timeouts:
                 DATA[port]['timeouts'][name] = timeout
 
+        # Init the history buffers
+        if history is not None:
+            if not isinstance(history, dict):
+                history = {codename: history for codename in codenames}
+            for codename in history:
+                if codename not in DATA[port]['data']:
+                    message = 'Unknown codename \'{}\' in history'.format(codename)
+                    CDPULLSLOG.error(message)
+                    raise ValueError(message)
+            DATA[port]['history'] = {
+                codename: HistoryBuffer(size) for codename, size in history.items()
+            }
+
         # Setup server
         try:
-            self.server = SocketServer.UDPServer(('', port), handler_class)
+            self.server = make_server(port, handler_class, server_type)
         except socket.error as error:
             if error.errno == 98:
                 # See custom exception message to understand this
@@ -498,12 +992,15 @@ class DataPullSocket(CommonDataPullSocket):
         check_activity=True,
         activity_timeout=900,
         poke_on_set=True,
+        server_type='udp',
+        history=None,
     ):
         """Initializes internal variables and UPD server
 
         For parameter description of ``name``, ``codenames``, ``port``,
-        ``default_x``, ``default_y``, ``timeouts``, ``check_activity`` and
-        ``activity_timeout`` see :meth:`.CommonDataPullSocket.__init__`.
+        ``default_x``, ``default_y``, ``timeouts``, ``check_activity``,
+        ``activity_timeout``, ``server_type`` and ``history`` see
+        :meth:`.CommonDataPullSocket.__init__`.
 
         Args:
             poke_on_set (bool): Whether to poke the socket server when a point
@@ -520,12 +1017,15 @@ class DataPullSocket(CommonDataPullSocket):
             timeouts=timeouts,
             check_activity=check_activity,
             activity_timeout=activity_timeout,
+            server_type=server_type,
+            history=history,
         )
         DATA[port]['type'] = 'data'
         # Init timestamps
         DATA[port]['timestamps'] = {}
         for name in codenames:
             DATA[port]['timestamps'][name] = 0.0
+        DATA[port]['cache'] = {}
         DPULLSLOG.debug('Initialized')
         # Init poke_on_set
         self.poke_on_set = poke_on_set
@@ -543,10 +1043,15 @@ class DataPullSocket(CommonDataPullSocket):
                 value is used to evaluate if the point is new enough if
                 timeouts are set.
         """
-        DATA[self.port]['data'][codename] = tuple(point)
+        point = tuple(point)
         if timestamp is None:
             timestamp = time.time()
-        DATA[self.port]['timestamps'][codename] = timestamp
+        with PULL_LOCK:
+            DATA[self.port]['data'][codename] = point
+            DATA[self.port]['timestamps'][codename] = timestamp
+            DATA[self.port]['cache'] = {}
+            if codename in DATA[self.port].get('history', {}):
+                DATA[self.port]['history'][codename].append(point)
         DPULLSLOG.debug('Point %s for \'%s\' set', tuple(point), codename)
         # Poke if required
         if DATA[self.port]['activity']['check_activity'] and self.poke_on_set:
@@ -576,12 +1081,15 @@ class DateDataPullSocket(CommonDataPullSocket):
         check_activity=True,
         activity_timeout=900,
         poke_on_set=True,
+        server_type='udp',
+        history=None,
     ):
         """Init internal variavles and UPD server
 
         For parameter description of ``name``, ``codenames``, ``port``,
-        ``default_x``, ``default_y``, ``timeouts``, ``check_activity`` and
-        ``activity_timeout`` see :meth:`.CommonDataPullSocket.__init__`.
+        ``default_x``, ``default_y``, ``timeouts``, ``check_activity``,
+        ``activity_timeout``, ``server_type`` and ``history`` see
+        :meth:`.CommonDataPullSocket.__init__`.
 
         Args:
             poke_on_set (bool): Whether to poke the socket server when a point
@@ -598,9 +1106,12 @@ class DateDataPullSocket(CommonDataPullSocket):
             timeouts=timeouts,
             check_activity=check_activity,
             activity_timeout=activity_timeout,
+            server_type=server_type,
+            history=history,
         )
         # Set the type
         DATA[port]['type'] = 'date'
+        DATA[port]['cache'] = {}
         DDPULLSLOG.debug('Initialized')
         # Init poke_on_set
         self.poke_on_set = poke_on_set
@@ -625,7 +1136,12 @@ class DateDataPullSocket(CommonDataPullSocket):
             point (iterable): Current point as a list (or tuple) of 2 floats:
                 [x, y]
         """
-        DATA[self.port]['data'][codename] = tuple(point)
+        point = tuple(point)
+        with PULL_LOCK:
+            DATA[self.port]['data'][codename] = point
+            DATA[self.port]['cache'] = {}
+            if codename in DATA[self.port].get('history', {}):
+                DATA[self.port]['history'][codename].append(point)
         DDPULLSLOG.debug('Point %s for \'%s\' set', tuple(point), codename)
         # Poke if required
         if DATA[self.port]['activity']['check_activity'] and self.poke_on_set:
@@ -679,12 +1195,7 @@ class PushUDPHandler(SocketServer.BaseRequestHandler):
             commands = ['json_wn#', 'raw_wn#', 'name', 'status', 'commands']
             return_value = '{}#{}'.format(PUSH_RET, json.dumps(commands))
         elif request == 'status':
-            return_value = json.dumps(
-                {
-                    'system_status': SYSTEM_STATUS.complete_status(),
-                    'socket_server_status': socket_server_status(),
-                }
-            )
+            return_value = status_reply()
         elif request.count('#') != 1:
             return_value = '{}#{}'.format(PUSH_ERROR, UNKNOWN_COMMAND)
         else:
@@ -1032,6 +1543,7 @@ class DataPushSocket(threading.Thread):
         return_format='json',
         check_activity=False,
         activity_timeout=900,
+        server_type='udp',
     ):
         """Initializes the DataPushSocket
 
@@ -1089,6 +1601,11 @@ class DataPushSocket(threading.Thread):
                    call back returns will be sent back. NOTE: These string
                    representations may differ between Python 2 and 3, so do not parse
                    them
+            server_type (str): The concurrency model of the socket server. See
+                :func:`.make_server` for the possible values. Notice that with
+                the ``'threading'`` and ``'asyncio'`` server types, the
+                callback of the ``'callback_direct'`` action may be called
+                from several threads at once
 
         """
         DPUSHSLOG.info('Initialize with: %s', call_spec_string())
@@ -1163,7 +1680,7 @@ class DataPushSocket(threading.Thread):
 
         # Setup server
         try:
-            self.server = SocketServer.UDPServer(('', port), PushUDPHandler)
+            self.server = make_server(port, PushUDPHandler, server_type)
         except socket.error as error:
             if error.errno == 98:
                 # See custom exception message to understand this
@@ -1507,6 +2024,25 @@ PUSH_ACK = 'ACK'
 PUSH_EXCEP = 'EXCEP'
 #: The answer prefix for a callback return value
 PUSH_RET = 'RET'
+#: The magic bytes that start a reply to the ``bin`` commands
+BIN_MAGIC = b'PBIN'
+#: The magic bytes that start a reply to the ``bin_wn`` command
+BIN_WN_MAGIC = b'PBWN'
+#: The header of a reply to the ``bin`` commands; magic bytes and the number of points
+BIN_HEADER = struct.Struct('<4sH')
+#: The flag or'ed onto the codename index in ``bin`` replies when the data is too old
+BIN_OLD_FLAG = 0x8000
+#: The possible server types for the socket servers, see :func:`.make_server`
+SERVER_TYPES = ('udp', 'threading', 'asyncio')
+#: The maximum number of points in a reply to the ``codename#history`` command,
+#: so that the reply fits in one UDP datagram
+HISTORY_MAX_POINTS = 1000
+#: The commands whose responses are never cached by the pull sockets
+UNCACHED_COMMANDS = ('status',)
+#: The lock that guards the points, timestamps and response caches of the pull
+#: sockets while they are written or formatted. Cached responses are read
+#: without it.
+PULL_LOCK = threading.Lock()
 #:The variable used to contain all the data.
 #:
 #:The format of the DATA variable is the following. The DATA variable is a
@@ -1522,6 +2058,7 @@ PUSH_RET = 'RET'
 #:  {'activity': {'activity_timeout': 900,
 #:                'check_activity': True,
 #:                'last_activity': 1413983209.82526},
+#:   'cache': {'raw': (b'0.0,0.0', inf)},
 #:   'codenames': ['var1'],
 #:   'data': {'var1': (0.0, 0.0)},
 #:   'name': 'my_socket',
@@ -1535,6 +2072,7 @@ PUSH_RET = 'RET'
 #:  {'activity': {'activity_timeout': 900,
 #:                'check_activity': True,
 #:                'last_activity': 1413983209.825451},
+#:   'cache': {},
 #:   'codenames': ['var1'],
 #:   'data': {'var1': (0.0, 0.0)},
 #:   'name': 'my_data_socket',
@@ -1542,6 +2080,10 @@ PUSH_RET = 'RET'
 #:   'timestamps': {'var1': 0.0},
 #:   'type': 'data'}
 #:
+#:If the pull sockets are given a ``history``, the dict also has a
+#:``'history'`` key with a dict of codenames to :class:`HistoryBuffer`, e.g.
+#:``{'var1': <HistoryBuffer>}``.
+#:
 #:For a :class:`DataPushSocket` the dict will resemble this example:
 #:
 #: .. code-block:: python
@@ -5,6 +5,9 @@ This module is Python 2 and 3 compatible.
 
 from __future__ import unicode_literals
 import os
+import json
+import time
+import logging
 import pathlib
 import re
 import sys
@@ -64,28 +67,57 @@ RPI_REVISIONS = {
 }
 # Temperature regular expression
 RPI_TEMP_RE = re.compile(r"temp=([0-9\.]*)'C")
+#: The time to live for items that do not change while the program runs
+STATIC = float('inf')
+#: The default interval in seconds between refreshes in the background thread
+REFRESH_INTERVAL = 5.0
 
+LOG = logging.getLogger(__name__)
+LOG.addHandler(logging.NullHandler())
 
-def works_on(platform):
-    """Return a decorator that attaches a _works_on (platform) attribute to methods"""
+
+def works_on(platform, ttl=0.0):
+    """Return a decorator that attaches a _works_on (platform) and a _ttl (time to
+    live) attribute to methods
+
+    Args:
+        platform (str): The platform the method works on
+        ttl (float): The number of seconds a value returned by the method is used
+            before it is measured again. The default of 0.0 means that it is
+            measured every time and :data:`STATIC` means that it is only
+            measured once.
+    """
 
     def decorator(function):
-        """Decorate a method with a _works_on attribute"""
+        """Decorate a method with a _works_on and _ttl attribute"""
         function._works_on = platform  # pylint: disable=protected-access
+        function._ttl = ttl  # pylint: disable=protected-access
         return function
 
     return decorator
 
 
 class SystemStatus(object):
-    """Class that fetches set of system status information"""
+    """Class that fetches set of system status information
+
+    Each item is kept for its time to live (see :func:`works_on`) before it is
+    measured again, so that static facts like the MAC address are only found
+    once. With :meth:`start_refresh` the expired items are measured in a
+    background thread and :meth:`complete_status` returns the last measured
+    values, so that its callers never have to wait for a measurement.
+    """
 
-    def __init__(self, machinename=None):
+    def __init__(self, machinename=None, ttls=None, refresh_interval=None):
         """Initialize the system status object
 
         Args:
             machinename (str): Machinename if different from what is returned by
                 socket.gethostname()
+            ttls (dict): Item name to time to live mapping, for items whose time
+                to live should differ from the default
+            refresh_interval (float): If given, start a background thread that
+                refreshes the expired items with this interval in seconds. See
+                :meth:`start_refresh`
         """
         # Form the list of which items to measure on different platforms
         if 'linux' in sys.platform:
@@ -111,13 +143,113 @@ class SystemStatus(object):
             if hasattr(method, '_works_on') and method._works_on in platforms:
                 self.methods_on_this_platform.append(method)
 
+        # Item name -> time to live
+        self.ttls = {
+            method.__name__: method._ttl  # pylint: disable=W0212
+            for method in self.methods_on_this_platform
+        }
+        if ttls is not None:
+            self.ttls.update(ttls)
+
+        # Item name -> (value, expiry time) and the pre-serialized snapshot as
+        # (generation, json string), where the generation is incremented every
+        # time an item changes value
+        self._values = {}
+        self._generation = 0
+        self._snapshot = (None, None)
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._stop_refresh = threading.Event()
+        if refresh_interval is not None:
+            self.start_refresh(refresh_interval)
+
+    def _item(self, method, now, serve_expired=False):
+        """Returns the value of item method, measured again if it has expired
+
+        If serve_expired is True, an item that has been measured before is returned
+        as is, even if it has expired.
+        """
+        name = method.__name__
+        cached = self._values.get(name)
+        if cached is not None and (serve_expired or now < cached[1]):
+            return cached[0]
+
+        value = method()
+        with self._lock:
+            if cached is None or value != cached[0]:
+                self._generation += 1
+            self._values[name] = (value, now + self.ttls[name])
+        return value
+
+    def _status(self, serve_expired):
+        """Returns all items as a dictionary, see :meth:`_item`"""
+        now = time.time()
+        return {
+            method.__name__: self._item(method, now, serve_expired)
+            for method in self.methods_on_this_platform
+        }
+
     def complete_status(self):
-        """Returns all system status information items as a dictionary"""
-        return {method.__name__: method() for method in self.methods_on_this_platform}
+        """Returns all system status information items as a dictionary
+
+        While the background refresh runs, the expired items are not measured here,
+        but returned as they were last measured by the refresh thread.
+        """
+        return self._status(serve_expired=self._refresh_thread is not None)
+
+    def complete_status_json(self):
+        """Returns all system status information items as a json encoded dictionary
+
+        The json string is only formed again if an item has changed value since
+        the last call.
+        """
+        status = self.complete_status()
+        generation, snapshot = self._snapshot
+        if generation != self._generation:
+            generation = self._generation
+            snapshot = json.dumps(status)
+            self._snapshot = (generation, snapshot)
+        return snapshot
+
+    def start_refresh(self, interval=REFRESH_INTERVAL):
+        """Start refreshing the expired items in a background thread
+
+        The expired items are measured right away and then every interval. Calling
+        this method when the refresh is already running does nothing.
+
+        Args:
+            interval (float): The interval in seconds between refreshes
+        """
+        if self._refresh_thread is not None:
+            return
+        self._stop_refresh.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh, args=(interval,), name='SystemStatusRefresh'
+        )
+        self._refresh_thread.daemon = True
+        self._refresh_thread.start()
+
+    def stop_refresh(self):
+        """Stop the background refresh"""
+        if self._refresh_thread is None:
+            return
+        self._stop_refresh.set()
+        self._refresh_thread.join()
+        self._refresh_thread = None
+
+    def _refresh(self, interval):
+        """Refresh the expired items now and every interval until stopped"""
+        while True:
+            try:
+                self._status(serve_expired=False)
+            except Exception:  # pylint: disable=broad-except
+                LOG.exception('Refreshing the system status failed')
+            if self._stop_refresh.wait(interval):
+                break
 
     # All platforms
     @staticmethod
-    @works_on('all')
+    @works_on('all', ttl=60.0)
     def last_git_fetch_unixtime():
         """Returns the unix timestamp and author time zone offset in seconds of
         the last git commit
@@ -141,20 +273,20 @@ class SystemStatus(object):
         return git
 
     @staticmethod
-    @works_on('all')
+    @works_on('all', ttl=REFRESH_INTERVAL)
     def number_of_python_threads():
         """Returns the number of threads in Python"""
         return threading.activeCount()
 
     @staticmethod
-    @works_on('all')
+    @works_on('all', ttl=STATIC)
     def python_version():
         """Returns the Python version"""
         return '{}.{}.{}'.format(*sys.version_info)
 
     # Linux only
     @staticmethod
-    @works_on('linux2')
+    @works_on('linux2', ttl=REFRESH_INTERVAL)
     def uptime():
         """Returns the system uptime"""
         sysfile = '/proc/uptime'
@@ -169,7 +301,7 @@ class SystemStatus(object):
             return None
 
     @staticmethod
-    @works_on('linux2')
+    @works_on('linux2', ttl=300.0)
     def last_apt_cache_change_unixtime():
         """Returns the unix timestamp of the last apt-get upgrade"""
         apt_cache_dir = '/var/cache/apt'
@@ -179,7 +311,7 @@ class SystemStatus(object):
             return None
 
     @staticmethod
-    @works_on('linux2')
+    @works_on('linux2', ttl=REFRESH_INTERVAL)
     def load_average():
         """Returns the system load average"""
         sysfile = '/proc/loadavg'
@@ -194,7 +326,7 @@ class SystemStatus(object):
             return None
 
     @staticmethod
-    @works_on('linux2')
+    @works_on('linux2', ttl=60.0)
     def filesystem_usage():
         """Return the total and free number of bytes in the current filesystem"""
         statvfs = os.statvfs(__file__)
@@ -205,7 +337,7 @@ class SystemStatus(object):
         return status
 
     @staticmethod
-    @works_on('linux2')
+    @works_on('linux2', ttl=REFRESH_INTERVAL)
     def max_python_mem_usage_bytes():
         """Returns the python memory usage"""
         pagesize = resource.getpagesize()
@@ -214,7 +346,7 @@ class SystemStatus(object):
         return (this_process + children) * pagesize
 
     @staticmethod
-    @works_on('linux2')
+    @works_on('linux2', ttl=STATIC)
     def mac_address():
         """Return the mac address of the currently connected interface"""
         # This procedure has given us problems in the past, so sorround with try-except
@@ -242,7 +374,7 @@ class SystemStatus(object):
             return 'MAC ADDRESS UNKNOWN'
 
     @staticmethod
-    @works_on('linux2')
+    @works_on('linux2', ttl=STATIC)
     def rpi_model():
         """Return the Raspberry Pi"""
         with open('/proc/cpuinfo') as file_:
@@ -258,7 +390,7 @@ class SystemStatus(object):
         return RPI_REVISIONS.get(revision, 'Undefined revision')
 
     @staticmethod
-    @works_on('linux2')
+    @works_on('linux2', ttl=STATIC)
     def os_version():
         """Return the Linux OS version"""
         with open('/etc/os-release') as file_:
@@ -272,7 +404,7 @@ class SystemStatus(object):
                 return None
 
     @staticmethod
-    @works_on('linux2')
+    @works_on('linux2', ttl=REFRESH_INTERVAL)
     def rpi_temperature():
         """Return the temperature of a Raspberry Pi"""
         # Firmware bug in Broadcom chip craches raspberry pi when reading temperature
@@ -295,7 +427,7 @@ class SystemStatus(object):
         return temp
 
     @staticmethod
-    @works_on('linux2')
+    @works_on('linux2', ttl=STATIC)
     def sd_card_serial():
         """Return the SD card serial number"""
         try:
@@ -305,7 +437,7 @@ class SystemStatus(object):
         except IOError:
             return None
 
-    @works_on('linux2')
+    @works_on('linux2', ttl=STATIC)
     def purpose(self):
         """Returns the information from the purpose file"""
         if 'purpose' in self._cache:
@@ -346,7 +478,7 @@ class SystemStatus(object):
 
         return purpose
 
-    @works_on('linux2')
+    @works_on('linux2', ttl=STATIC)
     def machine_name(self):
         """Return the machine name"""
         return self._machinename
@@ -6,6 +6,12 @@ writing the resulting plot directly into a curses window,
 :class:`.CursesAsciiPlot`, automatically adjusting the size of the
 plot to the window.
 
+:class:`.AsciiPlot` keeps one gnuplot process open for all plots, sends
+the data to it in gnuplot's binary inline format and reads each plot back
+in one call. For frequent redraws of small plots, it can instead draw the
+plot in Python with :func:`.render_plot`, without gnuplot, by passing
+``renderer='python'``.
+
 :class:`.AsciiPlot` example:
 ----------------------------
 
@@ -95,6 +101,8 @@ Produces the following output:
 """
 
 from subprocess import Popen, PIPE
+import numpy
+from PyExpLabSys.common.decimation import decimate_indices
 
 
 class CursesAsciiPlot(object):
@@ -142,6 +150,7 @@ class AsciiPlot(object):
         logscale=False,
         size=(80, 24),
         debug=False,
+        renderer='gnuplot',
     ):
         """Initialize local varibles
 
@@ -153,15 +162,27 @@ class AsciiPlot(object):
             size (tuple): A list or tuple with two integers indication the x and y size
                 (i.e. number of columns and lines) of the plot
             debug (bool): Whether to show the command sent to gnuplot
+            renderer (str): 'gnuplot' to draw the plot with a gnuplot process or
+                'python' to draw it with :func:`.render_plot`, without gnuplot
         """
+        if renderer not in ('gnuplot', 'python'):
+            raise ValueError('renderer must be \'gnuplot\' or \'python\'')
         self.size = size
         self.debug = debug
-
-        # Open a process for gnuplot
-        self.process = Popen(
-            ['gnuplot'], stdin=PIPE, stdout=PIPE, stderr=PIPE, bufsize=0
-        )
-        self.read = self.process.stdout.read
+        self.renderer = renderer
+        self.settings = {
+            'title': title,
+            'xlabel': xlabel,
+            'ylabel': ylabel,
+            'logscale': logscale,
+        }
+        self.process = None
+        if renderer == 'python':
+            return
+
+        # Open a process for gnuplot, that is kept open for all plots
+        self.process = Popen(['gnuplot'], stdin=PIPE, stdout=PIPE, stderr=PIPE)
+        self.readline = self.process.stdout.readline
 
         # Setup ascii output and size
         self.write("set term dumb {} {}\n".format(*size))
@@ -185,9 +206,12 @@ class AsciiPlot(object):
         """
         if self.debug:
             print(repr(string))
-        self.process.stdin.write(string.encode())
+        if not isinstance(string, bytes):
+            string = string.encode()
+        self.process.stdin.write(string)
+        self.process.stdin.flush()
 
-    def plot(self, x, y, style='lines', legend=""):
+    def plot(self, x, y, style='lines', legend="", decimation='minmax'):
         """Plot data
 
         Args:
@@ -195,21 +219,184 @@ class AsciiPlot(object):
             y (iterable): An iterable of floats or ints to plot
             style (str): 'lines' or 'points'
             legend (str): The legend of the data (leave to empty string to skip)
+            decimation (str): The method used to reduce the data to about two
+                points per column before plotting it, see
+                :mod:`PyExpLabSys.common.decimation`. None plots all points.
+
+        Returns:
+            str: The plot
         """
-        # Header for sending data to gnuplot inline
-        self.write("plot \"-\" with lines title \"{}\"\n".format(legend))
-
-        # Create data string and send
-        data = '\n'.join(["%s %s" % pair for pair in zip(x, y)])
-        self.write(data + '\n')
-        self.write("e\n")  # Terminate column
-
-        # The first char is a form feed
-        self.read(1)
-        out = self.read(self.size[0] * self.size[1]).decode('ascii')
-        while out[-1] != '\n':
-            out += self.read(1).decode('ascii')
-        return out
+        points = numpy.column_stack(
+            (numpy.asarray(x, dtype=float), numpy.asarray(y, dtype=float))
+        )
+        if decimation is not None:
+            points = points[
+                decimate_indices(points[:, 1], 2 * self.size[0], decimation)
+            ]
+
+        if self.renderer == 'python':
+            return render_plot(
+                points[:, 0],
+                points[:, 1],
+                self.size,
+                style=style,
+                legend=legend,
+                **self.settings
+            )
+
+        # Send the command and the data in gnuplot's binary inline format in one write
+        command = (
+            "plot \"-\" binary record=({}) format=\"%float64%float64\" endian=little "
+            "using 1:2 with {} title \"{}\"\n".format(
+                len(points), style, legend.replace('"', "'")
+            )
+        )
+        if self.debug:
+            print(repr(command))
+        self.write(command.encode() + points.astype('<f8').tobytes())
+
+        # The dumb terminal writes a form feed and then a line per row of the plot.
+        # Read it line by line, since the number of bytes per line is not fixed, e.g.
+        # with non-ascii characters in the labels
+        lines = [self.readline() for _ in range(self.size[1])]
+        if not lines[-1].endswith(b'\n'):
+            raise RuntimeError('gnuplot exited: {}'.format(self.process.stderr.read()))
+        out = b''.join(lines)
+        if out.startswith(b'\f'):
+            out = out[1:]
+        return out.decode('utf-8', 'replace')
+
+    def close(self):
+        """Close the gnuplot process"""
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait()
+            self.process = None
+
+
+def _ticks(low, high, logscale):
+    """Return the tick labels for low, middle and high"""
+    middle = (low + high) / 2
+    if abs(middle) < 1e-6 * (high - low):
+        # Avoid labels like 1e-17 for what is zero within the float precision
+        middle = 0.0
+    values = numpy.array([high, middle, low])
+    if logscale:
+        values = 10 ** values
+    return ['{:.4g}'.format(value) for value in values]
+
+
+def render_plot(
+    x,
+    y,
+    size=(80, 24),
+    title=None,
+    xlabel=None,
+    ylabel=None,
+    logscale=False,
+    style='lines',
+    legend='',
+):
+    """Render a text plot in Python, without gnuplot
+
+    The plot has the same size and a similar layout as the plots from gnuplot's
+    dumb terminal, but with fewer tics. It is fast for small plots, which makes it
+    suitable for frequent redraws.
+
+    Args:
+        x (numpy.ndarray): The x values
+        y (numpy.ndarray): The y values
+        size (tuple): The number of columns and lines of the plot
+        title (str): The title of the plot if required
+        xlabel (str): The xlabel of the plot if required
+        ylabel (str): The ylabel of the plot if required
+        logscale (bool): If the yaxis should use log scale
+        style (str): 'lines' or 'points'
+        legend (str): The legend of the data (leave to empty string to skip)
+
+    Returns:
+        str: The plot as size[1] newline terminated lines of size[0] characters
+
+    Raises:
+        ValueError: If the size is too small for the plot area
+    """
+    width, height = size
+    x = numpy.asarray(x, dtype=float)
+    y = numpy.asarray(y, dtype=float)
+    if logscale:
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            y = numpy.where(y > 0, numpy.log10(y), numpy.nan)
+    valid = numpy.isfinite(x) & numpy.isfinite(y)
+    x, y = x[valid], y[valid]
+
+    # The ranges, widened if they are empty
+    ranges = []
+    for values in (x, y):
+        low, high = (values.min(), values.max()) if len(values) else (0.0, 1.0)
+        if low == high:
+            low, high = low - 1.0, high + 1.0
+        ranges.append((low, high))
+    (xmin, xmax), (ymin, ymax) = ranges
+
+    # The layout: title, plot area with tick labels left and below, xlabel
+    yticks = _ticks(ymin, ymax, logscale)
+    tick_width = max(len(tick) for tick in yticks)
+    top = 1 if title else 0
+    bottom = height - (3 if xlabel else 2)
+    right = width - 2
+    # Cut the ylabel, so that the plot area keeps at least half the width
+    ylabel = (ylabel or '')[: max(right // 2 - tick_width - 2, 0)]
+    margin = len(ylabel) + tick_width + 2
+    if right - margin < 2 or bottom - top < 2:
+        raise ValueError('The size {} is too small for the plot'.format(size))
+    lines = numpy.full((height, width), ' ', dtype='U1')
+
+    def put(row, column, text):
+        """Write text on the lines from row, column and cut it at the edge"""
+        column = max(column, 0)
+        text = text[: max(width - column, 0)]
+        lines[row, column : column + len(text)] = list(text)
+
+    if title:
+        put(0, max((width - len(title)) // 2, 0), title)
+    lines[top, margin : right + 1] = lines[bottom, margin : right + 1] = '-'
+    lines[top : bottom + 1, margin] = lines[top : bottom + 1, right] = '|'
+    for row in (top, bottom):
+        lines[row, margin] = lines[row, right] = '+'
+    for row, tick in zip((top, (top + bottom) // 2, bottom), yticks):
+        put(row, margin - 1 - len(tick), tick)
+    put((top + bottom) // 2 + 1, 0, ylabel)
+    xticks = ['{:.4g}'.format(value) for value in (xmin, xmax)]
+    put(bottom + 1, margin - len(xticks[0]) // 2, xticks[0])
+    put(bottom + 1, right - len(xticks[1]) + 1, xticks[1])
+    if xlabel:
+        put(height - 1, margin + max((right - margin - len(xlabel)) // 2, 0), xlabel)
+    # Cut the legend to the width of the plot area
+    legend = legend[: max(right - margin - 6, 0)]
+    if legend:
+        put(top + 1, right - len(legend) - 5, legend + ' ***')
+
+    # The data, scaled to the columns and rows inside the border
+    columns = (x - xmin) / (xmax - xmin) * (right - margin - 2) + margin + 1
+    rows = (ymax - y) / (ymax - ymin) * (bottom - top - 2) + top + 1
+    if style == 'lines' and len(columns) > 1:
+        # Sample each line segment once per character cell
+        deltas = numpy.diff(columns), numpy.diff(rows)
+        steps = (
+            numpy.maximum(numpy.abs(deltas[0]), numpy.abs(deltas[1])).astype(int) + 1
+        )
+        segment = numpy.repeat(numpy.arange(len(steps)), steps)
+        offsets = numpy.arange(steps.sum()) - numpy.repeat(
+            numpy.cumsum(steps) - steps, steps
+        )
+        fractions = offsets / steps[segment]
+        columns = numpy.append(
+            columns[segment] + fractions * deltas[0][segment], columns[-1]
+        )
+        rows = numpy.append(rows[segment] + fractions * deltas[1][segment], rows[-1])
+    lines[rows.round().astype(int), columns.round().astype(int)] = '*'
+
+    return ''.join(''.join(line) + '\n' for line in lines)
 
 
 if __name__ == "__main__":
@@ -129,6 +129,16 @@ for t, y in datapoints_to_save:
     # See e.g. PyExpLabSys.common.database_saver for use with SQL databases
 --------------------
 
+The loop over the existing dataset in Example 3 can be replaced with a single call to
+check_batch, which saves the same points, but searches for the triggering points with
+NumPy (about 3 times faster on 1M points, see
+tests/benchmarks/benchmark_value_logger.py):
+--------------------
+times, values = load_existing_pressures() # two sequences of equal length
+logger.check_batch('pressure', times, values)
+datapoints_to_save = logger.get_data('pressure')
+--------------------
+
  *ValueLogger* is a threaded class where each instance continuously monitors a single
 value stream (codename) which is served by a Reader class. Other than that, it logs
 similarly to the other checker. A "model" parameter ("sparse" or "event") chooses
@@ -137,6 +147,9 @@ LoggingCriteriumChecker ("event"). Since the ValueLogger is responsible for time
 the data at ±1 second, the deviation checks from the new LoggingCriteriumChecker are not
 included. If fine control over the timestamps is needed, it is probably better to use
 the LoggingCriteriumChecker instead to keep the ValueLogger more lightweight.
+Instead of polling a reader every second, ValueLoggers can also be run in push mode,
+where the readers publish their values to a ValueLoggerGroup, that evaluates all of its
+loggers in one thread and delivers the triggered points to a callback (Example 6).
 
 Example 4: Use the ValueLogger to monitor pressure and speed
 --------------------
@@ -265,6 +278,28 @@ for t, y in filtered_datapoints:
     my_save_data_function('pressure', (t, y))
     # See e.g. PyExpLabSys.common.database_saver for use with SQL databases
 --------------------
+Example 6: Push mode, evaluate several ValueLoggers in one thread
+--------------------
+from PyExpLabSys.common.value_logger import ValueLogger, ValueLoggerGroup
+
+# The callback gets the name of the logger and the points to save, whenever a value
+# triggers
+def save(codename, points):
+    for t, y in points:
+        my_save_data_function(codename, (t, y))
+
+group = ValueLoggerGroup(callback=save)
+group.add_logger('pressure', ValueLogger(None, comp_type='log', comp_val=0.25))
+group.add_logger('speed', ValueLogger(None, comp_val=5, model='sparse'))
+group.start() # The value loggers themselves are not started
+
+# The readers publish values at their own rate, e.g. from their own threads
+publish_pressure = group.publisher('pressure')
+while True:
+    publish_pressure(driver.get_pressure())
+    group.push('speed', driver.get_speed()) # same as a publisher
+    time.sleep(0.1)
+--------------------
 Stats from a test dataset:
 --------------------
 Dataset is pressure and speed collected from a scroll pump at 1 second intervals.
@@ -287,8 +322,13 @@ Number of points saved by new event ValueLogger: 2695 / 0.2%
 
 import threading
 import time
+import logging
+from queue import Queue
 import numpy as np
 
+LOG = logging.getLogger(__name__)
+LOG.addHandler(logging.NullHandler())
+
 
 class ValueLogger(threading.Thread):
     """Reads continuously updated values and decides
@@ -309,7 +349,8 @@ class ValueLogger(threading.Thread):
         """Initialize the value logger
 
         Args:
-            value_reader (instance): Instance of a Reader class (see doc string)
+            value_reader (instance): Instance of a Reader class (see doc string). None
+                for a value logger in push mode, see :class:`ValueLoggerGroup`
             maximumtime (float): Timeout in seconds
             low_comp (float): Optional low limit beneath which readings should be
                 disregarded
@@ -350,6 +391,7 @@ class ValueLogger(threading.Thread):
         self.status['trigged'] = False
         self.last['time'] = 0
         self.last['val'] = 0
+        self.error_count = 0
         # Event algorithm
         self.saved_points = []
         self.buffer = []
@@ -386,15 +428,18 @@ class ValueLogger(threading.Thread):
         return data
 
     def run(self):
-        error_count = 0
-
+        if self.valuereader is None:
+            raise ValueError(
+                'A ValueLogger without a value_reader is in push mode and should not '
+                'be started, see ValueLoggerGroup'
+            )
         while not self.status['quit']:
             if not self.run_on_old_data:
                 time.sleep(1)
             if self.channel is None:
-                self.value = self.valuereader.value()
+                value = self.valuereader.value()
             else:
-                self.value = self.valuereader.value(self.channel)
+                value = self.valuereader.value(self.channel)
             if self.run_on_old_data:
                 if self.channel is None:
                     this_time = self.valuereader.time_value
@@ -402,65 +447,83 @@ class ValueLogger(threading.Thread):
                     this_time = self.valuereader.time_value[self.channel]
             else:
                 this_time = time.time()
-            time_trigged = (this_time - self.last['time']) > self.maximumtime
+            self.evaluate(this_time, value)
 
-            try:
-                if self.compare['type'] == 'lin':
-                    val_trigged = not (
-                        self.last['val'] - self.compare['val']
-                        < self.value
-                        < self.last['val'] + self.compare['val']
-                    )
-                if self.compare['type'] == 'log':
-                    val_trigged = not (
-                        self.last['val'] * (1 - self.compare['val'])
-                        < self.value
-                        < self.last['val'] * (1 + self.compare['val'])
-                    )
-                    # Special case to prevent error codes of 0 to be continuously saved
-                    if self.last['val'] == 0:
-                        if abs(self.last['val'] - self.value) == 0:
-                            val_trigged = False
-                error_count = 0
-                # Get sign of slope for use in secondary check
-                diff = self.value - self.last['val']
-                if diff < 0:
-                    sign = -1
-                elif diff > 0:
-                    sign = 1
-                else:
-                    sign = 0
-            except (UnboundLocalError, TypeError):
-                # Happens when value is not yet ready from reader
-                val_trigged = False
-                time_trigged = False
-                error_count = error_count + 1
-            if error_count > 15:
-                raise Exception('Error in ValueLogger')
-
-            # Will only trig on value if value is larger than low_comp
-            if self.compare['low_comp'] is not None:
-                if self.value < self.compare['low_comp']:
-                    val_trigged = False
-
-            if val_trigged and (self.value is not None):
-                if self.event_model:
-                    # Loop back through previous data points to find onset
-                    self.event_handler((this_time, self.value), sign)
-                self.last['time'] = this_time
-                self.last['val'] = self.value
-                self.saved_points.append((this_time, self.value))
-                self.status['trigged'] = True
-            elif time_trigged and (self.value is not None):
-                self.last['time'] = this_time
-                self.last['val'] = self.value
-                if self.event_model:
-                    self.buffer = []
-                self.saved_points.append((this_time, self.value))
-                self.status['trigged'] = True
+    def evaluate(self, this_time, value):
+        """Evaluate a new timestamped value against the logging criteria
+
+        This is what the run method does for every value it reads. In push mode (see
+        :class:`ValueLoggerGroup`) it is called with the values as they are published.
+
+        Args:
+            this_time (float): The timestamp of the value
+            value (float): The value
+
+        Returns:
+            bool: Whether the value triggered a save
+        """
+        self.value = value
+        time_trigged = (this_time - self.last['time']) > self.maximumtime
+
+        try:
+            if self.compare['type'] == 'lin':
+                val_trigged = not (
+                    self.last['val'] - self.compare['val']
+                    < self.value
+                    < self.last['val'] + self.compare['val']
+                )
+            if self.compare['type'] == 'log':
+                val_trigged = not (
+                    self.last['val'] * (1 - self.compare['val'])
+                    < self.value
+                    < self.last['val'] * (1 + self.compare['val'])
+                )
+                # Special case to prevent error codes of 0 to be continuously saved
+                if self.last['val'] == 0:
+                    if abs(self.last['val'] - self.value) == 0:
+                        val_trigged = False
+            self.error_count = 0
+            # Get sign of slope for use in secondary check
+            diff = self.value - self.last['val']
+            if diff < 0:
+                sign = -1
+            elif diff > 0:
+                sign = 1
             else:
-                if error_count == 0 and self.event_model:
-                    self.buffer.append((this_time, self.value))
+                sign = 0
+        except (UnboundLocalError, TypeError):
+            # Happens when value is not yet ready from reader
+            val_trigged = False
+            time_trigged = False
+            self.error_count = self.error_count + 1
+        if self.error_count > 15:
+            raise Exception('Error in ValueLogger')
+
+        # Will only trig on value if value is larger than low_comp
+        if self.compare['low_comp'] is not None:
+            if self.value < self.compare['low_comp']:
+                val_trigged = False
+
+        if val_trigged and (self.value is not None):
+            if self.event_model:
+                # Loop back through previous data points to find onset
+                self.event_handler((this_time, self.value), sign)
+            self.last['time'] = this_time
+            self.last['val'] = self.value
+            self.saved_points.append((this_time, self.value))
+            self.status['trigged'] = True
+            return True
+        elif time_trigged and (self.value is not None):
+            self.last['time'] = this_time
+            self.last['val'] = self.value
+            if self.event_model:
+                self.buffer = []
+            self.saved_points.append((this_time, self.value))
+            self.status['trigged'] = True
+            return True
+        if self.error_count == 0 and self.event_model:
+            self.buffer.append((this_time, self.value))
+        return False
 
     def event_handler(self, data_point, sign):
         """This method does the actual assesment of which extra values to save in an
@@ -508,6 +571,191 @@ class ValueLogger(threading.Thread):
         self.buffer = []
 
 
+class ValueLoggerGroup(threading.Thread):
+    """Evaluates a group of push mode value loggers in one thread
+
+    Instead of a thread per value logger that polls its reader every second, the
+    readers publish their values, at whatever rate they have them, through the
+    callables returned by :meth:`publisher` (or with :meth:`push`). The values are
+    queued and evaluated in order by this single thread and the points saved on a
+    trigger are delivered to a callback, so there is nothing to poll.
+
+    The value loggers in the group are :class:`ValueLogger` instances without a value
+    reader, which are never started themselves. See Example 6 in the module
+    documentation.
+    """
+
+    def __init__(self, callback=None, queue_size=0):
+        """Initialize the value logger group
+
+        Args:
+            callback (callable): The default callback for triggered points. It is called
+                with the name of the value logger and the list of (time, value) points
+                to save
+            queue_size (int): The maximum number of queued values. 0 (default) means no
+                limit. When full, :meth:`push` blocks.
+        """
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.callback = callback
+        self.loggers = {}
+        self.callbacks = {}
+        self.queue = Queue(queue_size)
+
+    def add_logger(self, name, value_logger, callback=None):
+        """Add a value logger to the group
+
+        Args:
+            name (str): The name (e.g. the codename) of the value logger
+            value_logger (ValueLogger): A value logger in push mode
+            callback (callable): Optional callback for this logger, instead of the
+                default one
+        """
+        self.loggers[name] = value_logger
+        self.callbacks[name] = callback or self.callback
+
+    def push(self, name, value, now=None):
+        """Publish a value for the value logger called name
+
+        Args:
+            name (str): The name of the value logger
+            value (float): The value
+            now (float): The timestamp of the value. Defaults to now.
+        """
+        if now is None:
+            now = time.time()
+        self.queue.put((name, now, value))
+
+    def publisher(self, name):
+        """Return a callable, value -> None, that publishes values for name"""
+
+        def publish(value, now=None):
+            """Publish value"""
+            self.push(name, value, now)
+
+        return publish
+
+    def process(self, name, now, value):
+        """Evaluate a value and deliver the saved points if it triggered"""
+        value_logger = self.loggers[name]
+        if not value_logger.evaluate(now, value):
+            return False
+        points = value_logger.get_data()
+        callback = self.callbacks[name]
+        if callback is not None:
+            try:
+                callback(name, points)
+            except Exception:  # pylint: disable=broad-except
+                LOG.exception('Exception in trigger callback for %s', name)
+        return True
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            # One failing value logger, e.g. one that has only received None for a
+            # while, must not stop the evaluation of the others
+            try:
+                self.process(*item)
+            except Exception:  # pylint: disable=broad-except
+                LOG.exception('Exception while evaluating value for %s', item[0])
+
+    def stop(self):
+        """Stop the thread after the values already queued are evaluated"""
+        self.queue.put(None)
+        self.join()
+
+
+class EventBuffer(object):
+    """The (time, value) points buffered between events, in preallocated NumPy storage
+
+    The points are written into a preallocated (n, 2) array, which is doubled in size
+    when it is full, so they are always available as one array, see :attr:`points`,
+    and a batch of points is added with a single copy, see :meth:`extend`. Unlike a
+    :class:`.CircularSeries`, the oldest points are never overwritten, since the event
+    handling may need all the points since the last event.
+
+    The buffer supports the parts of the list interface that
+    :class:`LoggingCriteriumChecker` and its subclasses use on it: len, indexing with
+    an int (a ``(time, value)`` tuple) or a slice (a new buffer), iteration, append,
+    extend, clear and comparison with other buffers or lists of points.
+    """
+
+    def __init__(self, points=(), capacity=64):
+        """Initialize the storage
+
+        Args:
+            points (sequence): Initial (time, value) points
+            capacity (int): The initial number of points to allocate storage for
+        """
+        self._storage = np.empty((max(capacity, len(points), 1), 2))
+        self._length = 0
+        self.extend(points)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return EventBuffer(self.points[key])
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError('EventBuffer index out of range')
+        now, value = self._storage[key].tolist()
+        return now, value
+
+    def __iter__(self):
+        return iter([tuple(point) for point in self.points.tolist()])
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '<EventBuffer({})>'.format(list(self))
+
+    def _reserve(self, length):
+        """Grow the storage, if necessary, to hold length points"""
+        if length > len(self._storage):
+            storage = np.empty((max(length, 2 * len(self._storage)), 2))
+            storage[: self._length] = self.points
+            self._storage = storage
+
+    def append(self, point):
+        """Append a (time, value) point"""
+        self._reserve(self._length + 1)
+        self._storage[self._length, 0] = point[0]
+        self._storage[self._length, 1] = point[1]
+        self._length += 1
+
+    def extend(self, points):
+        """Append (time, value) points, e.g. as an (n, 2) array"""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        length = self._length + len(points)
+        self._reserve(length)
+        self._storage[self._length : length] = points
+        self._length = length
+
+    def clear(self):
+        """Remove all points, but keep the storage"""
+        self._length = 0
+
+    @property
+    def points(self):
+        """The points as an (n, 2) array view
+
+        The view is overwritten by later changes to the buffer, copy it to keep it.
+        """
+        return self._storage[: self._length]
+
+
 class LoggingCriteriumChecker(object):
     """Class that performs a logging criterium check to detect events and store relevant
     data leading up to that event for a series of meaurements"""
@@ -561,8 +809,10 @@ class LoggingCriteriumChecker(object):
         if grades is not None and error_message is None:
             for grade in grades:
                 if grade <= 0 or grade >= 1:
-                    error_message = 'If grades is given, each grade must be larger ' \
+                    error_message = (
+                        'If grades is given, each grade must be larger '
                         'than 0 and less than 1'
+                    )
         if error_message is not None:
             raise ValueError(error_message)
 
@@ -579,6 +829,8 @@ class LoggingCriteriumChecker(object):
         self.deviation_factor = 50
         self.in_timeout = False
         self.deprecation_warning = True
+        # The initial window size used to search for the next trigger in check_batch
+        self.batch_window = 64
         self.last_values = {}
         self.last_time = {}
         self.measurements = {}
@@ -609,7 +861,7 @@ class LoggingCriteriumChecker(object):
             'time_out': time_out,
             'grade': grade,
         }
-        self.buffer[codename] = []
+        self.buffer[codename] = EventBuffer()
         self.saved_points[codename] = []
         # Unix timestamp
         self.last_time[codename] = 0
@@ -621,8 +873,8 @@ class LoggingCriteriumChecker(object):
         self.saved_points[codename] = []
         return data
 
-    def check(self, codename, value, now=None):
-        """Check a new value"""
+    def _measurement(self, codename):
+        """Return the measurement for codename and print the deprecation warning"""
         try:
             measurement = self.measurements[codename]
         except KeyError:
@@ -639,11 +891,112 @@ class LoggingCriteriumChecker(object):
                 " as long as the code runs - it is emptied when `get_data` is called."
                 "".format(codename)
             )
+        return measurement
+
+    def check(self, codename, value, now=None):
+        """Check a new value"""
+        measurement = self._measurement(codename)
 
         # Check for time
         if now is None:
             now = time.time()
 
+        return self._check(codename, measurement, value, now)
+
+    def check_batch(self, codename, times, values):
+        """Check a batch of timestamped values
+
+        The batch is checked as if every point had been given to :meth:`check` in
+        order, so the points saved (and the state afterwards) are the same, but the
+        search for the next triggering point is done with NumPy on the arrays. Only
+        the points that trigger are run through the scalar check and the points in
+        between are moved to the event buffer in one go. This makes it fast to
+        filter existing datasets and to check the values from a reader in batches.
+
+        The values are converted to floats and NaN values are treated like None in
+        :meth:`check`, i.e. they never trigger and are not buffered.
+
+        Args:
+            codename (str): The codename of the measurement
+            times (sequence): The timestamps of the values
+            values (sequence): The values. May contain None.
+
+        Returns:
+            numpy.ndarray: The indices of the values that triggered a save
+
+        Raises:
+            KeyError: On unknown codename
+            ValueError: If times and values do not have the same length
+        """
+        measurement = self._measurement(codename)
+        times = np.asarray(times, dtype=float)
+        values = np.asarray(values, dtype=float)
+        if times.shape != values.shape or times.ndim != 1:
+            raise ValueError('times and values must be 1D and of the same length')
+
+        trigger_indices = []
+        start = 0
+        while start < len(values):
+            index = self._next_trigger(codename, measurement, times, values, start)
+            stop = len(values) if index is None else index
+            self._extend_buffer(codename, measurement, times, values, start, stop)
+            if index is None:
+                break
+            if self._check(
+                codename, measurement, values[index].item(), times[index].item()
+            ):
+                trigger_indices.append(index)
+            start = index + 1
+        return np.array(trigger_indices, dtype=int)
+
+    def _next_trigger(self, codename, measurement, times, values, start):
+        """Return the index of the first value from start that triggers or None
+
+        The values are searched in windows that grow, so that the arrays are only
+        searched up to the next trigger.
+        """
+        last = self.last_values.get(codename)
+        window = self.batch_window
+        while start < len(values):
+            stop = min(start + window, len(values))
+            value = values[start:stop]
+            if last is None:
+                trigger = ~np.isnan(value)
+            else:
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    abs_diff = np.abs(value - last)
+                    if measurement['type'] == 'lin':
+                        trigger = abs_diff > measurement['criterium']
+                    elif last == 0:
+                        trigger = abs_diff > 0
+                    else:
+                        trigger = abs_diff / abs(last) > measurement['criterium']
+                    if measurement['low_compare'] is not None:
+                        trigger &= value >= measurement['low_compare']
+                    trigger |= (
+                        times[start:stop] - self.last_time[codename]
+                        > measurement['time_out']
+                    ) & ~np.isnan(value)
+            hits = np.flatnonzero(trigger)
+            if hits.size > 0:
+                return start + hits[0]
+            start = stop
+            window *= 2
+        return None
+
+    def _extend_buffer(self, codename, measurement, times, values, start, stop):
+        """Add the values in the slice start:stop, that do not trigger, to the buffer"""
+        value = values[start:stop]
+        keep = ~np.isnan(value)
+        if measurement['low_compare'] is not None:
+            with np.errstate(invalid='ignore'):
+                keep &= value >= measurement['low_compare']
+        self.buffer[codename].extend(
+            np.column_stack((times[start:stop][keep], value[keep]))
+        )
+
+    def _check(self, codename, measurement, value, now):
+        """Check a new timestamped value, see :meth:`check`"""
         # Pull out last value
         last = self.last_values.get(codename)
 
@@ -671,7 +1024,7 @@ class LoggingCriteriumChecker(object):
             self.last_values[codename] = value
 
             # reset data buffer and save point(s)
-            self.buffer[codename] = []
+            self.buffer[codename].clear()
             self.saved_points[codename].append((now, value))
             return True
 
@@ -699,7 +1052,7 @@ class LoggingCriteriumChecker(object):
                 # Update references before returning true
                 self.last_time[codename] = now
                 self.last_values[codename] = value
-                self.buffer[codename] = []
+                self.buffer[codename].clear()
                 self.saved_points[codename].append((now, value))
                 return True
         elif measurement['type'] == 'log':
@@ -709,7 +1062,7 @@ class LoggingCriteriumChecker(object):
                     # Update references before returning true
                     self.last_time[codename] = now
                     self.last_values[codename] = value
-                    self.buffer[codename] = []
+                    self.buffer[codename].clear()
                     self.saved_points[codename].append((now, value))
                     return True
                 self.buffer[codename].append((now, value))
@@ -722,7 +1075,7 @@ class LoggingCriteriumChecker(object):
                 # Update references before returning true
                 self.last_time[codename] = now
                 self.last_values[codename] = value
-                self.buffer[codename] = []
+                self.buffer[codename].clear()
                 self.saved_points[codename].append((now, value))
                 return True
         # Append point to buffer before returning false
@@ -740,7 +1093,7 @@ class LoggingCriteriumChecker(object):
             return
 
         # Get the variation of the data in the buffer
-        buff = np.array(self.buffer[codename])
+        buff = self.buffer[codename].points
         newest = (now, value)
         oldest = (self.last_time[codename], self.last_values[codename])
         slope = (newest[1] - oldest[1]) / (newest[0] - oldest[0])
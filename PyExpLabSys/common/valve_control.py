@@ -5,15 +5,18 @@ a valve box using standard gpio commands
 from __future__ import print_function
 import time
 import threading
+import logging
 import wiringpi as wp
 from PyExpLabSys.common.value_logger import LoggingCriteriumChecker
 from PyExpLabSys.common.supported_versions import python2_and_3
 
+LOG = logging.getLogger(__name__)
+LOG.addHandler(logging.NullHandler())
 python2_and_3(__file__)
 
 
 class ValveControl(threading.Thread):
-    """ Keeps status of all valves """
+    """Keeps status of all valves"""
 
     def __init__(self, valves, pullsocket, pushsocket, db_saver=None, codenames=None):
         """Initialize local properties
@@ -52,40 +55,49 @@ class ValveControl(threading.Thread):
                 time_outs=[600] * len(codenames),
             )
 
-    def run(self):
-        while self.running:
-            time.sleep(0.1)
+    def update(self):
+        """Switch the valves requested on the push socket and read all valve states"""
+        qsize = self.pushsocket.queue.qsize()
+        LOG.debug('Qsize: %s', qsize)
+        while qsize > 0:
+            element = self.pushsocket.queue.get()
+            valve = list(element.keys())[0]
+            zero_numbered_valve_number = int(valve) - 1
+
+            # If activated send valve state to database
+            if self.db_saver and self.codenames:
+                try:
+                    value_codename = self.codenames[zero_numbered_valve_number]
+                except IndexError:
+                    pass
+                else:
+                    # Check syntax for below
+                    value = float(element[valve])
+                    if self.logging_criterium_checker.check(value_codename, value):
+                        self.db_saver.save_point_now(value_codename, value)
+
+            wp.digitalWrite(zero_numbered_valve_number, element[valve])
             qsize = self.pushsocket.queue.qsize()
-            print(qsize)
-            while qsize > 0:
-                element = self.pushsocket.queue.get()
-                valve = list(element.keys())[0]
-                zero_numbered_valve_number = int(valve) - 1
 
-                # If activated send valve state to database
-                if self.db_saver and self.codenames:
-                    try:
-                        value_codename = self.codenames[zero_numbered_valve_number]
-                    except IndexError:
-                        pass
-                    else:
-                        # Check syntax for below
-                        value = float(element[valve])
-                        if self.logging_criterium_checker.check(value_codename, value):
-                            self.db_saver.save_point_now(value_codename, value)
+        for j in range(0, 20):
+            current_value = wp.digitalRead(j)
+            self.pullsocket.set_point_now(self.valves[j], current_value)
+            if self.db_saver and self.codenames:
+                try:
+                    codename = self.codenames[j]
+                except IndexError:
+                    pass
+                else:
+                    value = float(current_value)
+                    if self.logging_criterium_checker.check(codename, value):
+                        self.db_saver.save_point_now(codename, value)
 
-                wp.digitalWrite(zero_numbered_valve_number, element[valve])
-                qsize = self.pushsocket.queue.qsize()
+    def register(self, scheduler, period=0.1, name=None):
+        """Register update as a task with a :class:`.Scheduler`, instead of starting
+        the thread. The task name defaults to the (unique) thread name."""
+        return scheduler.add_task(name or self.name, self.update, period)
 
-            for j in range(0, 20):
-                current_value = wp.digitalRead(j)
-                self.pullsocket.set_point_now(self.valves[j], current_value)
-                if self.db_saver and self.codenames:
-                    try:
-                        codename = self.codenames[j]
-                    except IndexError:
-                        pass
-                    else:
-                        value = float(current_value)
-                        if self.logging_criterium_checker.check(codename, value):
-                            self.db_saver.save_point_now(codename, value)
+    def run(self):
+        while self.running:
+            time.sleep(0.1)
+            self.update()
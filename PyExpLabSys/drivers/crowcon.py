@@ -32,7 +32,16 @@ from __future__ import print_function, unicode_literals
 
 import logging
 from collections import namedtuple
-from minimalmodbus import Instrument, _numToTwoByteString, _twoByteStringToNum
+from minimalmodbus import Instrument
+from PyExpLabSys.common.modbus import (
+    Register,
+    RegisterMap,
+    instrument_read_block,
+    scaled,
+    int16,
+    uint16,
+    boolean,
+)
 from PyExpLabSys.common.supported_versions import python2_and_3
 
 # Configure logger as library logger and set supported python versions
@@ -121,6 +130,8 @@ class Vortex(Instrument):
         # Cache
         self.system_conf = {}
         self.channel_conf = {}
+        # Register map for get_multiple_detector_levels, formed on first use
+        self._levels_map = None
         LOGGER.info('__init__ complete')
 
     def close(self):
@@ -433,45 +444,71 @@ class Vortex(Instrument):
         LOGGER.debug('get_detector_levels return: %s', detector_levels)
         return detector_levels
 
+    def _detector_levels_map(self):
+        """Return the register map for the detector levels of all installed detectors
+
+        The map contains the level, status and inhibit registers and the range
+        configuration register for each detector, named e.g. ``('level', 1)``. The range
+        registers are static (read only once) if caching is enabled.
+        """
+        if self._levels_map is None:
+            registers = {}
+            for number in range(1, self.get_number_installed_detectors() + 1):
+                # Each detector has 10 level registers and 20 configuration registers
+                level_shift = 10 * (number - 1)
+                conf_shift = 20 * (number - 1)
+                registers[('level', number)] = Register(
+                    2999 + level_shift, decoder=scaled(int16, 3)
+                )
+                registers[('status', number)] = Register(
+                    3000 + level_shift, decoder=uint16
+                )
+                registers[('inhibit', number)] = Register(
+                    3003 + level_shift, decoder=boolean
+                )
+                registers[('range', number)] = Register(
+                    122 + conf_shift, decoder=uint16, static=self.cache
+                )
+            self._levels_map = RegisterMap(registers, instrument_read_block(self))
+        return self._levels_map
+
     def get_multiple_detector_levels(self, detector_numbers):
-        """Get the levels for multiple detectors in one communication call
+        """Get the levels for multiple detectors in as few communication calls as
+        possible
+
+        The registers are read in blocks of at most 125 registers (the Modbus maximum),
+        planned by :class:`PyExpLabSys.common.modbus.RegisterMap`. The ranges of the
+        detectors, which are needed to scale the levels, are read along with the levels
+        the first time and then cached, if caching is enabled.
 
         Args:
             detector_numbers (sequence): Sequence of integer detector numbers (remembe
                 they are 1 based)
 
-        .. warning::
-           This method uses "hidden" functions in the minimal modbus module for value
-           conversion. As they are hidden, they are not guarantied to preserve their
-           interface, which means that this method may break at any time
-
+        Returns:
+            dict: Detector number to DetLev named tuple mapping
         """
         # Check for valid detector numbers
         for detector_number in detector_numbers:
             self._check_detector_number(detector_number)
 
-        # We read 10 registers per detector
-        # FIXME. This may exceed the maximum number of registers that can be read
-        data = self.read_registers(2999, len(detector_numbers) * 10)
+        names = []
+        for detector_number in detector_numbers:
+            for value_name in ('level', 'status', 'inhibit', 'range'):
+                names.append((value_name, detector_number))
+        values = self._detector_levels_map().read(names)
 
         detector_levels = {}
         for detector_number in detector_numbers:
-            # Calculate the register shift for this detector. There are 10 registers
-            # per detector, in order.
-            reg_shift = 10 * (detector_number - 1)
-
-            # Get the range and read the level
-            detector_range = self.detector_configuration(detector_number).range
-            # The level is the 0th register
-            level_register = data[reg_shift]
-            bytestring = _numToTwoByteString(level_register)
-            level = (
-                _twoByteStringToNum(bytestring, numberOfDecimals=3, signed=True)
-                * detector_range
-            )
+            range_register = values[('range', detector_number)]
+            try:
+                detector_range = RANGE[range_register]
+            except KeyError:
+                message = 'Unknown range code {}. Valid values are 9-25'
+                raise ValueError(message.format(range_register))
+            level = values[('level', detector_number)] * detector_range
 
-            # Status is the 1st register (0-based)
-            status = data[1 + reg_shift]
+            status = values[('status', detector_number)]
             status_out = []
             if status == 0:
                 status_out.append('OK')
@@ -482,12 +519,10 @@ class Vortex(Instrument):
                     if bit_string[bit_position] == '1':
                         status_out.append(status_message)
 
-            # inhibit is the 4th register (0-based)
-            inhibited_register = data[4 + reg_shift]
-            inhibited = register_to_bool(inhibited_register)
-
             # Form the detector levels named tuple and put in output dict
-            detector_level = DetLev(detector_number, level, status_out, inhibited)
+            detector_level = DetLev(
+                detector_number, level, status_out, values[('inhibit', detector_number)]
+            )
             detector_levels[detector_number] = detector_level
 
         return detector_levels
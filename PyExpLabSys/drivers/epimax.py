@@ -31,6 +31,8 @@ be fetched by emailing `Epimax support <http://www.epimax.com/contact/contact.ht
 
 from __future__ import print_function, division
 import sys
+import time
+import logging
 from struct import unpack
 from functools import partial
 
@@ -49,10 +51,19 @@ import minimalmodbus
 #
 # in the program running using it, since minimal modbus is missing a few corners in the
 # conversion to Python 2 and 3 support
+from PyExpLabSys.common.modbus import plan_block_reads, float32
 from PyExpLabSys.common.supported_versions import python2_and_3
 
 python2_and_3(__file__)
 
+LOG = logging.getLogger(__name__)
+LOG.addHandler(logging.NullHandler())
+
+#: The maximum number of registers in one read
+MAX_REGISTERS_PER_READ = 32
+#: The number of registers per field, all values are 4 bytes
+REGISTERS_PER_FIELD = 2
+
 
 ### Classes ###
 ###############
@@ -94,6 +105,9 @@ class PVCCommon(minimalmodbus.Instrument):
             port=port,
             slaveaddress=slave_address,
         )
+        # The timings of the block reads in the last call to get_fields, as a list of
+        # (start register, number of registers, duration in seconds) tuples
+        self.read_timings = []
         # fields is a the list of all the parameters that are common for all three types of
         # devices. It is a dict where keys are adapted parameter names and the values are
         # typles of (addres, type_or_type_convertion_function, unit)
@@ -193,6 +207,24 @@ class PVCCommon(minimalmodbus.Instrument):
             value = raw_value
         return value
 
+    def _decode_field(self, field_name, bytes_):
+        """Decode the 4 bytes of the value for field_name
+
+        Args:
+            field_name (str): The name of the field
+            bytes_ (bytes): The 4 bytes of the value, as read from the registers
+
+        Returns:
+            object: An object with type corresponding to the value (int, float or str)
+        """
+        _, type_or_convertion_function, _ = self.fields[field_name]
+        if type_or_convertion_function == 'string':
+            return bytes_.decode('latin1')
+        elif type_or_convertion_function == 'float':
+            # Same (big endian) byte order as read_float, which get_field uses
+            return float32(bytes_)
+        return type_or_convertion_function(bytes_)
+
     def get_field(self, field_name):
         """Return the value for the field named field_name
 
@@ -220,18 +252,23 @@ class PVCCommon(minimalmodbus.Instrument):
             value = type_or_convertion_function(raw)
         return value
 
-    def get_fields(self, fields='common'):
+    def get_fields(self, fields='common', max_gap=None):
         """Return a dict with fields and values for a list of fields
 
         This method is specifically for getting multiple values in the shortest
-        amount of time. It works by always reading the maximum amount of registers (32)
-        at a time and then using the remaining payload for subsequent values if they
-        happen to be contained in the registers that have already been read.
+        amount of time. The addresses of the fields are grouped into as few block reads
+        of at most :data:`MAX_REGISTERS_PER_READ` registers as possible (see
+        :func:`PyExpLabSys.common.modbus.plan_block_reads`) and all the fields are
+        decoded from the bytes of those reads. The timings of the reads are stored in
+        :attr:`read_timings`.
 
         Args:
             fields (sequence or unicode): A sequence (list, tuple) of fields names or
                 'common' which indicates fields with an address between 0x80 and 0x9E
                 (this is the default) or 'all'.
+            max_gap (int): The maximum number of unused registers between two fields in
+                the same block read. The default (None) allows any gap that fits
+                within a block. Set it to 0 if unused registers cannot be read.
 
         Returns:
             dict: Field name to value mapping
@@ -250,7 +287,35 @@ class PVCCommon(minimalmodbus.Instrument):
                     message = 'Field name {} is not valid'.format(field)
                     raise KeyError(message)
 
-        data = {field: self.get_field(field) for field in fields}
+        addresses = {field: self.fields[field][0] for field in fields}
+        blocks = plan_block_reads(
+            [(address, REGISTERS_PER_FIELD) for address in addresses.values()],
+            max_registers=MAX_REGISTERS_PER_READ,
+            max_gap=max_gap,
+        )
+
+        # Read the blocks and keep the bytes for each field address
+        self.read_timings = []
+        buffers = {}
+        for start, count in blocks:
+            start_time = time.time()
+            bytes_ = self._read_bytes(start, count * 2)
+            self.read_timings.append((start, count, time.time() - start_time))
+            for address in set(addresses.values()):
+                if start <= address < start + count:
+                    offset = (address - start) * 2
+                    buffers[address] = bytes_[offset : offset + 2 * REGISTERS_PER_FIELD]
+        LOG.debug(
+            'Read %s fields in %s block reads in %.3f s',
+            len(addresses),
+            len(blocks),
+            sum(timing[2] for timing in self.read_timings),
+        )
+
+        data = {
+            field: self._decode_field(field, buffers[address])
+            for field, address in addresses.items()
+        }
         return data
 
     def __getattr__(self, attrname):
@@ -20,6 +20,16 @@ import serial
 import minimalmodbus
 
 
+from PyExpLabSys.common.modbus import (
+    Register,
+    RegisterMap,
+    registers_to_bytes,
+    converted,
+    uint16,
+    uint32,
+    float32,
+    string,
+)
 from PyExpLabSys.common.supported_versions import python2_and_3
 
 python2_and_3(__file__)
@@ -69,6 +79,28 @@ class RedFlowMeter(object):
         'unit': (('read_string', process_string), 0x6046, 4),
         'control_function': (('read_register', None), 0x000E),
     }
+    # The register table used by read_all, with the same values as the command map. The
+    # values that cannot change are static and only read once. See
+    # PyExpLabSys.common.modbus for details
+    registers = {
+        'flow': Register(0x00, 2, float32),
+        'temperature': Register(0x02, 2, float32),
+        'address': Register(0x0013, 1, uint16),
+        'serial': Register(0x001E, 2, uint32, static=True),
+        'hardware_version': Register(
+            0x0020, 1, converted(uint16, convert_version), True
+        ),
+        'software_version': Register(
+            0x0021, 1, converted(uint16, convert_version), True
+        ),
+        'type_code_1': Register(0x0023, 4, converted(string, process_string), True),
+        'type_code_2h': Register(0x1004, 4, converted(string, process_string), True),
+        'lut_select': Register(0x4139, 1, uint16),
+        'range': Register(0x6020, 2, float32),
+        'fluid_name': Register(0x6042, 4, converted(string, process_string)),
+        'unit': Register(0x6046, 4, converted(string, process_string)),
+        'control_function': Register(0x000E, 1, uint16),
+    }
     # The command map for set operations consists of
     # name: (minimalmodbus_method, conversion_function, address)
     command_map_set = {
@@ -96,6 +128,8 @@ class RedFlowMeter(object):
         self._last_call = time()
         # Specify number of retrys when reading data
         self.number_of_retries = 10
+        # Only read registers that are defined in the manual, so no gaps
+        self.register_map = RegisterMap(self.registers, self._read_block, max_gap=0)
 
     def _ensure_waittime(self):
         """Ensure waittime"""
@@ -197,9 +231,35 @@ class RedFlowMeter(object):
 
         return value
 
+    def _read_block(self, start, count):
+        """Read a block of count registers from start and return them as bytes"""
+        self._ensure_waittime()
+        for retry_number in range(1, self.number_of_retries):
+            try:
+                registers = self.instrument.read_registers(start, count)
+                break
+            except (IOError, ValueError) as e:
+                print(
+                    "{}({}): {}. Trying to retrieve data again..".format(
+                        e.__class__.__name__, retry_number, e
+                    )
+                )
+                sleep(0.5)
+                continue
+        else:
+            raise RuntimeError(
+                'Could not retrieve data in {} retries'.format(self.number_of_retries)
+            )
+        self._last_call = time()
+        return registers_to_bytes(registers)
+
     def read_all(self):
-        """Return all values"""
-        return {name: self.read_value(name) for name in self.command_map.keys()}
+        """Return all values
+
+        The values are read in as few block reads as possible and the values that
+        cannot change, like the serial number, are only read the first time.
+        """
+        return self.register_map.read()
 
     def read_flow(self):
         """Return the current flow (alias for read_value('flow')"""
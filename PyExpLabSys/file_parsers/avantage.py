@@ -1,6 +1,23 @@
 # -*- coding: utf-8 -*-
 
-"""Test module for Avantage files"""
+"""Test module for Avantage files
+
+Indexing archives
+-----------------
+
+To search an archive of VGD files without parsing them again, the metadata of all the
+files in a directory tree can be collected into a SQLite catalog, using worker
+processes::
+
+    index_vgd_files('/data/xps', 'xps_catalog.sqlite', processes=8)
+    for record in query_vgd_catalog('xps_catalog.sqlite', technique='XPS'):
+        print(record['path'], record['name'])
+
+This is the catalog from :mod:`PyExpLabSys.file_parsers.catalog`, restricted to VGD
+files. Only the files that are new or have changed since the last run are read
+again. Each file is opened with ``VGDFile(filepath, metadata_only=True)``, which
+only reads the OLE directory and the property and axes streams, and not the data.
+"""
 
 from __future__ import division, unicode_literals, print_function
 
@@ -98,12 +115,19 @@ class NotXPSException(Exception):
 
 
 class VGDFile(object):
-    """Class that represents a Avatage data file (.VDG)"""
+    """Class that represents a Avatage data file (.VDG)
 
-    def __init__(self, filepath, debug=False):
+    With ``metadata_only=True``, only the OLE directory and the metadata streams
+    (summary properties, properties and space axes) are read, after which the file is
+    closed again. The data is then not available. This is the mode to use, when
+    scanning many files for their metadata.
+    """
+
+    def __init__(self, filepath, debug=False, metadata_only=False):
         self.filepath = filepath
+        self.metadata_only = metadata_only
         self.olefile = olefile.OleFileIO(
-            filepath, raise_defects='DEFECT_INCORRECT', debug=debug
+            filepath, raise_defects=olefile.DEFECT_INCORRECT, debug=debug
         )
         self._paths = {
             'summary_properties': '\x05SummaryInformation',
@@ -111,6 +135,40 @@ class VGDFile(object):
         }
         # Raw data seems to be stored as little endian 8 byte floats
         self.data_type = np.dtype('<f8')
+        if metadata_only:
+            try:
+                self.summary_properties  # pylint: disable=pointless-statement
+                if self.olefile.exists(self._paths['properties']):
+                    self.properties  # pylint: disable=pointless-statement
+                else:
+                    self.properties = {}
+                self.space_axes  # pylint: disable=pointless-statement
+            finally:
+                self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the file"""
+        self.olefile.close()
+
+    def _openstream(self, name):
+        """Open the stream called name
+
+        Raises:
+            ValueError: If the file was opened with metadata_only
+        """
+        if self.metadata_only:
+            message = (
+                'The stream {} is not available, the file {} was opened with '
+                'metadata_only=True'
+            )
+            raise ValueError(message.format(name, self.filepath))
+        return self.olefile.openstream(name)
 
     def __str__(self):
         """Returns the str representation for the file"""
@@ -145,9 +203,9 @@ class VGDFile(object):
     @cached_property
     def data(self):
         """Returns the data"""
-        raw = self.olefile.openstream('VGData').read()
-        # pylint: disable=no-member
-        return np.fromstring(raw, dtype=numpy.float64)
+        stream = self._openstream('VGData')
+        # The stream is already in memory, so use its buffer instead of copying it
+        return np.frombuffer(stream.getbuffer(), dtype=self.data_type)
 
     @property
     def supported_data(self):
@@ -271,7 +329,7 @@ class VGDFile(object):
     @cached_property
     def data_axes(self):
         """Returns a list of data axes"""
-        raw = self.olefile.openstream('VGDataAxes').read()
+        raw = self._openstream('VGDataAxes').read()
         raw_bio = BytesIO(raw)
         type_, naxes = struct.unpack('<II', raw_bio.read(8))
 
@@ -289,7 +347,7 @@ class VGDFile(object):
     @cached_property
     def data_back_markers(self):
         """Data back marker"""
-        raw = self.olefile.openstream('VGDataBackMarker').read()
+        raw = self._openstream('VGDataBackMarker').read()
 
         if len(raw) != 32:
             raise UnableToParse('Back Marker. Bad length')
@@ -310,7 +368,7 @@ class VGDFile(object):
     def overlay_markers(self):
         """Returns the overlay markers"""
         if ['VGOverlayMarkers'] in self.list_components():
-            raw = self.olefile.openstream('VGOverlayMarkers').read()
+            raw = self._openstream('VGOverlayMarkers').read()
             if raw != b'\x00\x00\x01\x00\x00\x00\x00\x00':
                 raise UnableToParse("Overlay Markers")
             return raw
@@ -323,8 +381,7 @@ class VGDFile(object):
     @property
     def version(self):
         """Returns the version info bytes"""
-        raw = self.olefile.openstream('VersionInfo').read()
-        print('version', struct.unpack('<I', raw))
+        raw = self._openstream('VersionInfo').read()
         return raw
 
     @cached_property
@@ -337,7 +394,6 @@ class VGDFile(object):
         if axis[3:] != ('ENERGY', 'LINEAR', 'E', 'eV', 'Energy'):
             raise UnableToParse("X axis data")
 
-        print(axis)
         stop = axis.start + (axis.num_points - 1) * axis.step
         x, retstep = np.linspace(
             start=axis.start, stop=stop, num=axis.num_points, retstep=True
@@ -364,13 +420,81 @@ class VGDFile(object):
             raise UnableToParse("Y axis data")
         axis = self.space_axes[0]
 
-        # Get the data stream
-        data = self.olefile.openstream('VGData')
-        points_size = self.data_type.itemsize * axis.num_points
-        if data.size != points_size:
+        if len(self.data) != axis['points']:
             raise UnableToParse("Y axis data, data stream size")
 
-        return np.fromstring(data.read(points_size))
+        return self.data
+
+
+def vgd_metadata(filepath):
+    """Return the metadata of a VGD file as a dict
+
+    The file is opened with ``metadata_only=True``. Apart from the summary
+    properties, properties and space axes, the dict contains these items, which are
+    None if they are not in the file: 'title', 'author', 'create_time' (datetime),
+    'axis_type', 'points', 'start' and 'width' of the first space axis, 'technique'
+    ('XPS' if the file has a source type), 'pass_energy' and 'excitation_energy'.
+    """
+    vgd_file = VGDFile(filepath, metadata_only=True)
+    summary = {
+        name: vgd_file.summary_properties.get(index + 1)
+        for index, name in enumerate(olefile.OleMetadata.SUMMARY_ATTRIBS)
+    }
+    properties = vgd_file.properties
+    axis = vgd_file.space_axes[0] if vgd_file.space_axes else {}
+    return {
+        'title': summary['title'],
+        'author': summary['author'],
+        'create_time': summary['create_time'],
+        'axis_type': axis.get('type'),
+        'points': axis.get('points'),
+        'start': axis.get('start'),
+        'width': axis.get('width'),
+        'technique': None if properties.get('SourceType') is None else 'XPS',
+        'pass_energy': properties.get('PassEnergy'),
+        'excitation_energy': properties.get('SourceEnergy'),
+        'summary_properties': summary,
+        'properties': {str(key): value for key, value in properties.items()},
+        'space_axes': vgd_file.space_axes,
+    }
+
+
+def index_vgd_files(directory, catalog_path, processes=None):
+    """Index the metadata of all the VGD files in a directory tree into a catalog
+
+    This is :meth:`.Catalog.index` restricted to VGD files, see
+    :mod:`PyExpLabSys.file_parsers.catalog` for the details.
+
+    Args:
+        directory (str): The directory to search for VGD files
+        catalog_path (str): The path of the SQLite catalog
+        processes (int): The number of worker processes. None means one per CPU.
+
+    Returns:
+        int: The number of files (re-)indexed
+    """
+    # Imported here, because the catalog module imports this one
+    from PyExpLabSys.file_parsers.catalog import Catalog
+
+    with Catalog(catalog_path) as catalog:
+        counts = catalog.index(directory, processes, formats=['avantage_vgd'])
+    return counts['parsed'] + counts['error']
+
+
+def query_vgd_catalog(catalog_path, where=None, parameters=(), **equals):
+    """Return the records of the VGD files in the catalog that match the criteria
+
+    This is :meth:`.Catalog.query` restricted to VGD files. Files that could not be
+    parsed have no records, see :meth:`.Catalog.errors`.
+
+    Returns:
+        list: The matching records as dicts
+    """
+    # Imported here, because the catalog module imports this one
+    from PyExpLabSys.file_parsers.catalog import Catalog
+
+    with Catalog(catalog_path) as catalog:
+        return catalog.query(where, parameters, format='avantage_vgd', **equals)
 
 
 def avg_date(string):
@@ -384,17 +508,17 @@ def avg_date(string):
 
 
 def avg_str(string):
-    """ Parse a AVG string """
+    """Parse a AVG string"""
     return string.strip("'")
 
 
 def avg_bool(string):
-    """ Return True if string is 'True' else False """
+    """Return True if string is 'True' else False"""
     return True if string == 'True' else False
 
 
 class AVGFile(object):
-    """ Class that read and represent a AVGFile """
+    """Class that read and represent a AVGFile"""
 
     # Property line regular expression
     property_re = re.compile(r'^([A-Z_\[\]0-9]*) *: ([A-Z_0-9]*) *= (.*)$')
@@ -410,7 +534,7 @@ class AVGFile(object):
     }
 
     def __init__(self, filepath):
-        """ Read a AVG file """
+        """Read a AVG file"""
         self.filepath = filepath
         self._file = codecs.open(filepath, encoding='latin-1')
         self._lines = (line.strip('\r\n') for line in self._file)
@@ -418,6 +542,16 @@ class AVGFile(object):
         self.axis = None
         self.data = None
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the file"""
+        self._file.close()
+
     def _find_line(self, startswith):
         """Finds the line that startswith"""
         for line in self._lines:
@@ -430,7 +564,7 @@ class AVGFile(object):
         # The format line looks like this:
         # $FORMAT=4
         format_line = self._find_line("$FORMAT=")
-        return int(line.split("=")[1])
+        return int(format_line.split("=")[1])
 
     @cached_property
     def summary_properties(self):
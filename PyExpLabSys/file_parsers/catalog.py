@@ -0,0 +1,618 @@
+"""A searchable catalog of the metadata in a tree of data files
+
+The catalog makes it possible to answer questions like "all the XPS regions with
+pass energy 20 from May" without parsing the data files again. It is a SQLite
+database with two tables:
+
+ * **files**: One row per indexed data source (a file, or for chemstation an
+   injection directory) with its format, mtime, size and a SHA1 hash of its content
+ * **records**: The normalized metadata of the data sets in the data sources, one
+   row per e.g. XPS region or GC injection, with the columns in
+   :data:`RECORD_COLUMNS`. All the metadata the parser provides is in the JSON
+   encoded 'metadata' column.
+
+Indexing walks a directory tree, recognizes the formats in :data:`FORMATS` and
+extracts the metadata with the parsers in worker processes::
+
+    with Catalog('catalog.sqlite') as catalog:
+        catalog.index('/data', processes=8)
+        regions = catalog.query(
+            kind='region', technique='XPS', pass_energy=20.0,
+            since=datetime(2016, 5, 1), until=datetime(2016, 6, 1),
+        )
+
+Indexing again only parses the sources that have changed. Sources with the same
+mtime and size are skipped without being read, sources whose content hash is
+unchanged only get their mtime updated (unless they failed to parse before) and
+sources that no longer exist are removed.
+
+Formats whose parser cannot be imported, because of missing dependencies, are
+skipped.
+"""
+
+from __future__ import division
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import calendar
+import datetime
+import multiprocessing
+
+import numpy
+
+from PyExpLabSys.common.supported_versions import python2_and_3
+
+try:
+    from PyExpLabSys.file_parsers import specs
+except ImportError:
+    specs = None  # pylint: disable=invalid-name
+try:
+    from PyExpLabSys.file_parsers import avantage
+except ImportError:
+    avantage = None  # pylint: disable=invalid-name
+try:
+    from PyExpLabSys.file_parsers import avantage_xlsx_export
+except ImportError:
+    avantage_xlsx_export = None  # pylint: disable=invalid-name
+try:
+    from PyExpLabSys.file_parsers import chemstation
+except ImportError:
+    chemstation = None  # pylint: disable=invalid-name
+try:
+    from PyExpLabSys.file_parsers import total_chrom
+except ImportError:
+    total_chrom = None  # pylint: disable=invalid-name
+
+python2_and_3(__file__)
+
+LOG = logging.getLogger(__name__)
+LOG.addHandler(logging.NullHandler())
+
+#: The columns of the records table, apart from the JSON encoded metadata
+RECORD_COLUMNS = (
+    ('path', 'TEXT'),
+    ('format', 'TEXT'),
+    ('kind', 'TEXT'),
+    ('group_name', 'TEXT'),
+    ('name', 'TEXT'),
+    ('timestamp', 'REAL'),
+    ('technique', 'TEXT'),
+    ('pass_energy', 'REAL'),
+    ('excitation_energy', 'REAL'),
+    ('points', 'INTEGER'),
+)
+
+#: The columns of the files table
+FILE_COLUMNS = (
+    ('path', 'TEXT PRIMARY KEY'),
+    ('format', 'TEXT'),
+    ('mtime', 'REAL'),
+    ('size', 'INTEGER'),
+    ('hash', 'TEXT'),
+    ('indexed', 'REAL'),
+    ('error', 'TEXT'),
+)
+
+
+### Format detection
+def _has_extension(path, extension):
+    """Return whether path is a file with extension (case insensitive)"""
+    return path.lower().endswith(extension) and os.path.isfile(path)
+
+
+def _is_specs(path):
+    """Return whether path is a SpecsLab XML file"""
+    if not _has_extension(path, '.xml'):
+        return False
+    with open(path, 'rb') as file_:
+        return b'XMLSerializer' in file_.read(512)
+
+
+def _is_vgd(path):
+    """Return whether path is an Avantage VGD file"""
+    return _has_extension(path, '.vgd')
+
+
+def _is_avg(path):
+    """Return whether path is an Avantage AVG file"""
+    return _has_extension(path, '.avg')
+
+
+def _is_avantage_xlsx(path):
+    """Return whether path is an xlsx file, possibly an Avantage export"""
+    return _has_extension(path, '.xlsx')
+
+
+def _is_chemstation_injection(path):
+    """Return whether path is a chemstation injection directory
+
+    The test is the same as the one :class:`~.chemstation.Sequence` uses.
+    """
+    name = os.path.basename(path)
+    return (
+        os.path.isdir(path)
+        and (name.startswith('NV-') or name.endswith('.D'))
+        and os.path.isfile(os.path.join(path, 'Report.TXT'))
+    )
+
+
+def _is_total_chrom(path):
+    """Return whether path is a TotalChrom raw file"""
+    return _has_extension(path, '.raw')
+
+
+### Metadata extraction
+def _unix_time(value):
+    """Return a datetime, assumed to be in UTC, as unix time"""
+    if value is None:
+        return None
+    return calendar.timegm(value.utctimetuple())
+
+
+def _specs_records(path):
+    """Return the records of the regions in a SpecsLab XML file"""
+    records = []
+    for group_name, region in specs.iter_regions(path, lazy=True):
+        info = region.region
+        records.append(
+            {
+                'kind': 'region',
+                'group_name': group_name,
+                'name': region.name,
+                'timestamp': region.unix_timestamp,
+                'technique': info.get('analysis_method'),
+                'pass_energy': info.get('pass_energy'),
+                'excitation_energy': info.get('excitation_energy'),
+                'points': info.get('values_per_curve'),
+                'metadata': {
+                    'region': info,
+                    'analyzer_info': region.analyzer_info,
+                    'source_info': region.source_info,
+                    'remote_info': region.remote_info,
+                    'parameters': region.parameters,
+                },
+            }
+        )
+    return records
+
+
+def _vgd_records(path):
+    """Return the record of an Avantage VGD file"""
+    metadata = avantage.vgd_metadata(path)
+    return [
+        {
+            'kind': 'spectrum',
+            'name': metadata['title'],
+            'timestamp': _unix_time(metadata['create_time']),
+            'technique': metadata['technique'],
+            'pass_energy': metadata['pass_energy'],
+            'excitation_energy': metadata['excitation_energy'],
+            'points': metadata['points'],
+            'metadata': metadata,
+        }
+    ]
+
+
+def _avg_records(path):
+    """Return the record of an Avantage AVG file"""
+    with avantage.AVGFile(path) as avg_file:
+        summary = avg_file.summary_properties
+        properties = avg_file.properties
+    return [
+        {
+            'kind': 'spectrum',
+            'metadata': {'summary_properties': summary, 'properties': properties},
+        }
+    ]
+
+
+def _avantage_xlsx_records(path):
+    """Return the records of the spectra and peak tables in an Avantage xlsx export"""
+    records = []
+    for name, sheet in avantage_xlsx_export.AvantageXLSXExport(path).items():
+        if isinstance(sheet, avantage_xlsx_export.Spectrum):
+            records.append(
+                {
+                    'kind': 'spectrum',
+                    'name': name,
+                    'points': max([len(array) for array in sheet.values()] or [0]),
+                    'metadata': {'columns': list(sheet.keys())},
+                }
+            )
+        else:
+            records.append(
+                {
+                    'kind': 'peak_table',
+                    'name': name,
+                    'metadata': {'tables': list(sheet.keys())},
+                }
+            )
+    return records
+
+
+def _chemstation_records(path):
+    """Return the record of a chemstation injection"""
+    injection = chemstation.Injection(
+        path, load_raw_spectra=False, read_report_txt=False
+    )
+    metadata = injection.metadata
+    return [
+        {
+            'kind': 'injection',
+            'group_name': os.path.basename(os.path.dirname(path)),
+            'name': metadata.get('sample_name'),
+            'timestamp': metadata.get('injection_date_unixtime'),
+            'technique': 'GC',
+            'metadata': metadata,
+        }
+    ]
+
+
+def _total_chrom_records(path):
+    """Return the record of a TotalChrom raw file"""
+    raw = total_chrom.Raw(path, lazy=True)
+    return [
+        {
+            'kind': 'chromatogram',
+            'name': raw.seq_description.get('sample_name'),
+            'timestamp': raw.ad_header.get('Time and Date Started'),
+            'points': len(raw.raw_data_points),
+            'metadata': {
+                'ad_header': raw.ad_header,
+                'seq_description': raw.seq_description,
+            },
+        }
+    ]
+
+
+#: The formats, as (name, parser module, test function, extract function). The test
+#: function returns whether a path is in the format, and the extract function
+#: returns a list of records as dicts with the keys in :data:`RECORD_COLUMNS` and
+#: 'metadata'. Keys that are left out are NULL.
+FORMATS = (
+    ('specs', specs, _is_specs, _specs_records),
+    ('avantage_vgd', avantage, _is_vgd, _vgd_records),
+    ('avantage_avg', avantage, _is_avg, _avg_records),
+    ('avantage_xlsx', avantage_xlsx_export, _is_avantage_xlsx, _avantage_xlsx_records),
+    ('chemstation', chemstation, _is_chemstation_injection, _chemstation_records),
+    ('total_chrom', total_chrom, _is_total_chrom, _total_chrom_records),
+)
+_EXTRACTORS = {format_[0]: format_[3] for format_ in FORMATS}
+
+
+def detect_format(path, formats=None):
+    """Return the name of the format of path or None, see :data:`FORMATS`
+
+    Args:
+        path (str): The path of the file or directory
+        formats (sequence): The names of the formats to consider. Default is all.
+    """
+    for name, module, test, _ in FORMATS:
+        if formats is not None and name not in formats:
+            continue
+        if module is not None and test(path):
+            return name
+    return None
+
+
+### Indexing helpers
+def _stat(path):
+    """Return the mtime and size of a file, or the latest mtime and total size of
+    the files in a directory
+    """
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size
+    mtime, size = os.stat(path).st_mtime, 0
+    for filepath in _directory_files(path):
+        stat = os.stat(filepath)
+        mtime, size = max(mtime, stat.st_mtime), size + stat.st_size
+    return mtime, size
+
+
+def _directory_files(path):
+    """Return the sorted paths of the files in a directory tree"""
+    filepaths = []
+    for dirpath, _, filenames in os.walk(path):
+        filepaths.extend(os.path.join(dirpath, filename) for filename in filenames)
+    return sorted(filepaths)
+
+
+def _hash(path):
+    """Return the SHA1 hash of the content of a file, or of the names and content of
+    the files in a directory
+    """
+    sha1 = hashlib.sha1()
+    if os.path.isdir(path):
+        filepaths = _directory_files(path)
+    else:
+        filepaths = [path]
+    for filepath in filepaths:
+        if filepath != path:
+            sha1.update(os.path.relpath(filepath, path).encode('utf-8'))
+        with open(filepath, 'rb') as file_:
+            for chunk in iter(lambda: file_.read(1048576), b''):
+                sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def _json_default(value):
+    """Return a JSON serializable version of value"""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode('latin-1')
+    if isinstance(value, numpy.ndarray):
+        return value.tolist()
+    if isinstance(value, numpy.generic):
+        return value.item()
+    return str(value)
+
+
+def _index_source(arguments):
+    """Hash and, if the content has changed, extract the records of a source
+
+    Errors are returned in the result instead of being raised, so that a single bad
+    file does not stop the indexing.
+
+    Args:
+        arguments (tuple): path, format name, mtime, size and the hash and error in
+            the catalog
+
+    Returns:
+        dict: The file columns and 'records', which is None if the content has not
+            changed and was parsed without error before
+    """
+    path, format_name, mtime, size, old_hash, old_error = arguments
+    result = {
+        'path': path,
+        'format': format_name,
+        'mtime': mtime,
+        'size': size,
+        'indexed': time.time(),
+        'error': None,
+        'records': None,
+    }
+    try:
+        result['hash'] = _hash(path)
+        # Sources that failed before are parsed again, so the error is not lost
+        if result['hash'] == old_hash and old_error is None:
+            return result
+        records = _EXTRACTORS[format_name](path)
+        for record in records:
+            record['metadata'] = json.dumps(
+                record.get('metadata', {}), default=_json_default
+            )
+        result['records'] = records
+    except Exception as exception:  # pylint: disable=broad-except
+        LOG.warning('Unable to index %s: %s', path, exception)
+        result['error'] = '{}: {}'.format(exception.__class__.__name__, exception)
+        result['records'] = []
+    return result
+
+
+class Catalog(object):
+    """A SQLite catalog of the metadata in data files
+
+    Attributes:
+        catalog_path (str): The path of the SQLite database
+        connection (sqlite3.Connection): The database connection
+    """
+
+    def __init__(self, catalog_path):
+        """Open the catalog and create the tables, if they do not exist
+
+        Args:
+            catalog_path (str): The path of the SQLite database
+        """
+        self.catalog_path = catalog_path
+        self.connection = sqlite3.connect(catalog_path)
+        self.connection.row_factory = sqlite3.Row
+        columns = ', '.join('{} {}'.format(*column) for column in FILE_COLUMNS)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS files ({})'.format(columns))
+        columns = ', '.join('{} {}'.format(*column) for column in RECORD_COLUMNS)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS records ({}, metadata TEXT)'.format(columns)
+        )
+        for columns in ('path', 'kind, technique', 'timestamp', 'pass_energy'):
+            name = 'records_' + columns.replace(', ', '_')
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS {} ON records ({})'.format(name, columns)
+            )
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the catalog"""
+        self.connection.close()
+
+    def find_sources(self, directory, formats=None):
+        """Return the data sources in a directory tree
+
+        Args:
+            directory (str): The directory to search
+            formats (sequence): The names of the formats to find. Default is all.
+
+        Returns:
+            list: Tuples of absolute path and format name
+        """
+        sources = []
+        for dirpath, dirnames, filenames in os.walk(os.path.abspath(directory)):
+            dirnames.sort()
+            for dirname in list(dirnames):
+                path = os.path.join(dirpath, dirname)
+                format_name = detect_format(path, formats)
+                if format_name is not None:
+                    # The directory is a source of its own, so do not descend
+                    dirnames.remove(dirname)
+                    sources.append((path, format_name))
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                format_name = detect_format(path, formats)
+                if format_name is not None:
+                    sources.append((path, format_name))
+        return sources
+
+    def index(self, directory, processes=None, formats=None):
+        """Index the data sources in a directory tree
+
+        Args:
+            directory (str): The directory to index
+            processes (int): The number of worker processes. None means one per
+                CPU.
+            formats (sequence): The names of the formats to index, see
+                :data:`FORMATS`. Sources of other formats in the catalog are left
+                as they are. Default is all.
+
+        Returns:
+            dict: The number of sources that were 'parsed', 'unchanged' (by mtime
+                and size or by hash), 'removed' and that gave an 'error'
+        """
+        directory = os.path.abspath(directory)
+        prefix = os.path.join(directory, '')
+        indexed = {
+            row['path']: row
+            for row in self.connection.execute(
+                'SELECT path, format, mtime, size, hash, error FROM files'
+            )
+            if (row['path'] == directory or row['path'].startswith(prefix))
+            and (formats is None or row['format'] in formats)
+        }
+        counts = {'parsed': 0, 'unchanged': 0, 'removed': 0, 'error': 0}
+
+        arguments = []
+        for path, format_name in self.find_sources(directory, formats):
+            mtime, size = _stat(path)
+            row = indexed.pop(path, None)
+            if row is not None and row['format'] == format_name:
+                if (row['mtime'], row['size']) == (mtime, size):
+                    counts['unchanged'] += 1
+                    continue
+                old_hash, old_error = row['hash'], row['error']
+            else:
+                old_hash = old_error = None
+            arguments.append((path, format_name, mtime, size, old_hash, old_error))
+
+        # The sources left in indexed no longer exist
+        for path in indexed:
+            self._remove(path)
+        counts['removed'] = len(indexed)
+
+        if processes == 1 or len(arguments) < 2:
+            results = (_index_source(argument) for argument in arguments)
+            pool = None
+        else:
+            pool = multiprocessing.Pool(processes)
+            results = pool.imap_unordered(_index_source, arguments, chunksize=4)
+        try:
+            for number, result in enumerate(results, 1):
+                self._store(result, counts)
+                # Commit in batches, so an interrupted run keeps most of its work
+                if number % 100 == 0:
+                    self.connection.commit()
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        self.connection.commit()
+        return counts
+
+    def _remove(self, path):
+        """Remove a source from the catalog"""
+        self.connection.execute('DELETE FROM files WHERE path = ?', (path,))
+        self.connection.execute('DELETE FROM records WHERE path = ?', (path,))
+
+    def _store(self, result, counts):
+        """Store the result of :func:`_index_source` in the catalog"""
+        names = [name for name, _ in FILE_COLUMNS]
+        self.connection.execute(
+            'INSERT OR REPLACE INTO files ({}) VALUES ({})'.format(
+                ', '.join(names), ', '.join('?' * len(names))
+            ),
+            [result.get(name) for name in names],
+        )
+        if result['error'] is not None:
+            counts['error'] += 1
+        elif result['records'] is None:
+            counts['unchanged'] += 1
+            return
+        else:
+            counts['parsed'] += 1
+
+        self.connection.execute('DELETE FROM records WHERE path = ?', (result['path'],))
+        names = [name for name, _ in RECORD_COLUMNS] + ['metadata']
+        insert = 'INSERT INTO records ({}) VALUES ({})'.format(
+            ', '.join(names), ', '.join('?' * len(names))
+        )
+        for record in result['records']:
+            record.update({'path': result['path'], 'format': result['format']})
+            self.connection.execute(insert, [record.get(name) for name in names])
+
+    def query(self, where=None, parameters=(), since=None, until=None, **equals):
+        """Return the records that match the criteria
+
+        Args:
+            where (str): An SQL condition on the record columns, e.g.
+                ``'pass_energy >= ?'``
+            parameters (sequence): The parameters for the ? in where
+            since (datetime.datetime or float): Only records with a timestamp at or
+                after this datetime (in local time) or unix time
+            until (datetime.datetime or float): Only records with a timestamp
+                before this datetime or unix time
+            equals: Record column names and the values they must be equal to, e.g.
+                ``kind='region', pass_energy=20.0``
+
+        Returns:
+            list: The records as dicts, with the metadata decoded
+
+        Raises:
+            ValueError: On unknown column names in equals
+        """
+        column_names = [name for name, _ in RECORD_COLUMNS]
+        conditions = []
+        parameters = list(parameters)
+        if where:
+            conditions.append('({})'.format(where))
+        for operator, value in (('>=', since), ('<', until)):
+            if value is None:
+                continue
+            if isinstance(value, datetime.datetime):
+                value = time.mktime(value.timetuple())
+            conditions.append('timestamp {} ?'.format(operator))
+            parameters.append(value)
+        for name, value in sorted(equals.items()):
+            if name not in column_names:
+                message = 'Unknown column \'{}\', must be one of {}'
+                raise ValueError(message.format(name, column_names))
+            conditions.append('{} = ?'.format(name))
+            parameters.append(value)
+
+        query = 'SELECT * FROM records'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        records = []
+        for row in self.connection.execute(query + ' ORDER BY path, rowid', parameters):
+            record = dict(row)
+            record['metadata'] = json.loads(record['metadata'])
+            records.append(record)
+        return records
+
+    def errors(self):
+        """Return a dict of the paths of the sources that could not be indexed and
+        their errors
+        """
+        return {
+            row['path']: row['error']
+            for row in self.connection.execute(
+                'SELECT path, error FROM files WHERE error IS NOT NULL'
+            )
+        }
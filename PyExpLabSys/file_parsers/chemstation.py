@@ -26,6 +26,24 @@ along with The CINF Data Presentation Website.  If not, see
    version, like relying on the Report.TXT file for injections
    summaries. These are now fetched from the more ordered CSV files.
 
+Loading large sequences
+^^^^^^^^^^^^^^^^^^^^^^^
+
+Parsing a sequence with many injections can take a long time. To speed it up,
+the injections can be parsed in parallel in a number of processes and the
+parsed injections can be cached on disk. A cached injection is used as long as
+none of the files in its directory have changed (by modification time and
+size). If the raw spectra are not needed, e.g. for
+:meth:`Sequence.full_sequence_dataset`, loading them can be skipped:
+
+.. code-block:: python
+
+ sequence = Sequence(
+     'path_to_sequence', load_raw_spectra=False, processes=4,
+     cache_dir='path_to_cache_dir',
+ )
+ dataset = sequence.full_sequence_dataset()
+
 """
 
 from __future__ import print_function, unicode_literals, division
@@ -33,6 +51,9 @@ from __future__ import print_function, unicode_literals, division
 from collections import defaultdict
 import codecs
 import os
+import hashlib
+import pickle
+import multiprocessing
 from itertools import islice
 from io import BytesIO
 import time
@@ -45,15 +66,27 @@ import unicodecsv as csv
 import numpy
 
 from PyExpLabSys.thirdparty.cached_property import cached_property
+from PyExpLabSys.file_parsers.memmap import ScaledView, time_slice
 from PyExpLabSys.common.supported_versions import python2_and_3
 
 python2_and_3(__file__)
 
 
+# The version of the format of the cached injections. Increment it when the data
+# structures of the Injection changes, to invalidate old caches.
+CACHE_VERSION = 1
+
+
 class NoInjections(Exception):
     """Exception raised when there are no injections in the sequence"""
 
 
+def _load_injection(arguments):
+    """Load an injection with :meth:`Injection.load`, for the process pool"""
+    injection_dirpath, cache_dir, kwargs = arguments
+    return Injection.load(injection_dirpath, cache_dir=cache_dir, **kwargs)
+
+
 class Sequence(object):
     """The Sequence class for the Chemstation data format
 
@@ -63,16 +96,24 @@ class Sequence(object):
         metadata (dict): Dict of metadata
     """
 
-    def __init__(self, sequence_dir_path):
+    def __init__(
+        self, sequence_dir_path, load_raw_spectra=True, processes=1, cache_dir=None
+    ):
         """Instantiate object properties
 
         Args:
             sequence_dir_path (str): The path of the sequence
+            load_raw_spectra (bool): Whether to load the raw spectra of the
+                injections
+            processes (int): The number of processes to parse the injections in.
+                None means the number of CPUs.
+            cache_dir (str): A directory to cache the parsed injections in, see
+                :meth:`Injection.load`. The default is no cache.
         """
         self.injections = []
         self.sequence_dir_path = sequence_dir_path
         self.metadata = {}
-        self._parse()
+        self._parse(load_raw_spectra, processes, cache_dir)
         if not self.injections:
             msg = 'No injections in sequence: {}'.format(self.sequence_dir_path)
             raise NoInjections(msg)
@@ -89,18 +130,31 @@ class Sequence(object):
         ]
         self.metadata['acq_method'] = first_injection.metadata['acq_method']
 
-    def _parse(self):
+    def _parse(self, load_raw_spectra=True, processes=1, cache_dir=None):
         """Parse the sequence"""
         sequence_dircontent = os.listdir(self.sequence_dir_path)
         # Put the injection folders in order
         sequence_dircontent.sort()
+        arguments = []
         for filename in sequence_dircontent:
             injection_fullpath = os.path.join(self.sequence_dir_path, filename)
             if not (filename.startswith("NV-") or filename.endswith(".D")):
                 continue
             if not "Report.TXT" in os.listdir(injection_fullpath):
                 continue
-            self.injections.append(Injection(injection_fullpath))
+            arguments.append(
+                (injection_fullpath, cache_dir, {'load_raw_spectra': load_raw_spectra})
+            )
+
+        if processes == 1 or len(arguments) < 2:
+            self.injections = [_load_injection(argument) for argument in arguments]
+        else:
+            pool = multiprocessing.Pool(processes)
+            try:
+                self.injections = pool.map(_load_injection, arguments)
+            finally:
+                pool.close()
+                pool.join()
 
     def __repr__(self):
         """Return Sequence object representation"""
@@ -121,6 +175,8 @@ class Sequence(object):
         Returns:
             dict: Mapping of signal_and_peak names and the values
 
+        Only the reports of the injections are used, so the sequence can be loaded
+        with ``load_raw_spectra=False``.
         """
         # Set the column names default values
         if column_names is None:
@@ -247,6 +303,60 @@ class Injection(object):
                 with codecs.open(report_path, encoding='UTF16') as file_:
                     self.report_txt = file_.read()
 
+    @classmethod
+    def load(cls, injection_dirpath, cache_dir=None, **kwargs):
+        """Return an injection, from the cache if the injection has not changed
+
+        The parsed injection is cached in a file in cache_dir, named by a hash of the
+        absolute path of the injection directory. The cache is used as long as the
+        names, modification times and sizes of the files in the injection directory,
+        and the kwargs, are the same as when it was written.
+
+        Args:
+            injection_dirpath (str): The path of the injection directory
+            cache_dir (str): The cache directory. If None, the injection is parsed.
+            kwargs: Keyword arguments for :meth:`__init__`
+
+        Returns:
+            Injection: The injection
+        """
+        if cache_dir is None:
+            return cls(injection_dirpath, **kwargs)
+
+        abspath = os.path.abspath(injection_dirpath)
+        cache_path = os.path.join(
+            cache_dir, hashlib.sha1(abspath.encode('utf-8')).hexdigest() + '.pickle'
+        )
+        key = [CACHE_VERSION, abspath, sorted(kwargs.items())]
+        for filename in sorted(os.listdir(injection_dirpath)):
+            stat = os.stat(os.path.join(injection_dirpath, filename))
+            key.append((filename, stat.st_mtime, stat.st_size))
+
+        try:
+            with open(cache_path, 'rb') as file_:
+                cached_key, state = pickle.load(file_)
+        except (IOError, OSError, EOFError, ValueError, pickle.UnpicklingError):
+            cached_key = state = None
+        if cached_key == key:
+            injection = cls.__new__(cls)
+            injection.__dict__.update(state)
+            return injection
+
+        injection = cls(injection_dirpath, **kwargs)
+        try:
+            os.makedirs(cache_dir)
+        except OSError:
+            # It exists, possibly created by another process in the pool
+            if not os.path.isdir(cache_dir):
+                raise
+        # Write to a temporary file and move it in place, so that concurrent readers
+        # never see a partial cache file
+        temporary_path = '{}.{}.tmp'.format(cache_path, os.getpid())
+        with open(temporary_path, 'wb') as file_:
+            pickle.dump((key, injection.__dict__), file_, protocol=2)
+        getattr(os, 'replace', os.rename)(temporary_path, cache_path)
+        return injection
+
     def _parse_date(self, date_part):
         """timestruct: Parse a date string in one of the formats in self.datetime_formats"""
         for datetime_format in self.datetime_formats:
@@ -434,10 +544,19 @@ class CHFile(object):
 
     Attributes:
         values (numpy.array): The internsity values (y-value) or the spectrum. The unit
-            for the values is given in `metadata['units']`
+            for the values is given in `metadata['units']`. In lazy mode, a
+            :class:`~PyExpLabSys.file_parsers.memmap.ScaledView` of the memory mapped
+            data, that only reads and scales the parts that are used.
         metadata (dict): The extracted metadata
         filepath (str): The filepath this object was loaded from
 
+    To get the values in a time window, e.g. from 5 to 6 minutes, without reading the
+    rest of the data, use::
+
+        ch_file = CHFile(filepath, lazy=True)
+        window = ch_file.time_slice(5.0, 6.0)
+        times, values = ch_file.times[window], ch_file.values[window]
+
     """
 
     # Fields is a table of name, offset and type. Types 'x-time' and 'utf16' are specially
@@ -467,17 +586,21 @@ class CHFile(object):
     # The versions of the file format supported by this implementation
     supported_versions = {179}
 
-    def __init__(self, filepath):
+    def __init__(self, filepath, lazy=False):
         """Instantiate object
 
         Args:
             filepath (str): The path of the data file
+            lazy (bool): Whether to only parse the header and memory map the data
         """
         self.filepath = filepath
         self.metadata = {}
         with open(self.filepath, 'rb') as file_:
             self._parse_header(file_)
-            self.values = self._parse_data(file_)
+            if lazy:
+                self.values = self._map_data(file_)
+            else:
+                self.values = self._parse_data(file_)
 
     def _parse_header(self, file_):
         """Parse the header"""
@@ -584,12 +707,27 @@ class CHFile(object):
         file_.seek(0, 2)
         n_points = (file_.tell() - self.data_start) // 8
 
-        # Read the data into a numpy array
+        # Read the data into a numpy array and scale it in place
         file_.seek(self.data_start)
-        return (
-            numpy.fromfile(file_, dtype='<d', count=n_points)
-            * self.metadata['yscaling']
-        )
+        values = numpy.fromfile(file_, dtype='<d', count=n_points)
+        values *= self.metadata['yscaling']
+        return values
+
+    def _map_data(self, file_):
+        """Memory map the data and return a scaled view of it"""
+        file_.seek(0, 2)
+        n_points = (file_.tell() - self.data_start) // 8
+        if n_points == 0:
+            raw = numpy.empty(0, dtype='<d')
+        else:
+            raw = numpy.memmap(
+                self.filepath,
+                dtype='<d',
+                mode='r',
+                offset=self.data_start,
+                shape=(n_points,),
+            )
+        return ScaledView(raw, self.metadata['yscaling'])
 
     @cached_property
     def times(self):
@@ -597,3 +735,16 @@ class CHFile(object):
         return numpy.linspace(
             self.metadata['start_time'], self.metadata['end_time'], len(self.values)
         )
+
+    def time_slice(self, start=None, end=None):
+        """Return the slice of the data between start and end (inclusive) in minutes
+
+        The slice is calculated without creating the time values.
+        """
+        return time_slice(
+            self.metadata['start_time'],
+            self.metadata['end_time'],
+            len(self.values),
+            start,
+            end,
+        )
@@ -0,0 +1,93 @@
+"""Helpers for lazy, memory mapped access to the data in binary data files
+
+The data block of a binary data file can be memory mapped with
+:py:class:`numpy.memmap`, so that only the parts of the file that are actually
+used are read from disk. Many formats store the data unscaled; :class:`ScaledView`
+applies the scaling to only the slices that are used, and :func:`time_slice` finds
+the slice of evenly spaced data that is inside a time window, without creating the
+time values.
+"""
+
+from __future__ import division
+
+import math
+import numpy
+
+from PyExpLabSys.common.supported_versions import python2_and_3
+
+python2_and_3(__file__)
+
+
+class ScaledView(object):
+    """A view of an array, that is scaled as ``array * scale + offset`` when it is
+    used
+
+    Indexing the view returns the scaled values of only that part of the array, as a
+    numpy array. Numpy functions, like ``numpy.sum(view)``, work on the whole
+    scaled array.
+
+    Attributes:
+        raw (numpy.ndarray): The unscaled array, usually a :py:class:`numpy.memmap`
+        scale (float): The scale factor
+        offset (float): The offset
+    """
+
+    def __init__(self, raw, scale=1.0, offset=0.0):
+        self.raw = raw
+        self.scale = scale
+        self.offset = offset
+
+    def __len__(self):
+        return len(self.raw)
+
+    @property
+    def shape(self):
+        """The shape of the array"""
+        return self.raw.shape
+
+    def __getitem__(self, key):
+        values = numpy.asarray(self.raw[key], dtype=float) * self.scale
+        if self.offset:
+            values += self.offset
+        return values
+
+    def __array__(self, dtype=None, copy=None):
+        values = self[:]
+        if dtype is not None:
+            values = values.astype(dtype)
+        return values
+
+    def __repr__(self):
+        return '<{}(length={}, scale={}, offset={})>'.format(
+            self.__class__.__name__, len(self), self.scale, self.offset
+        )
+
+
+def time_slice(first, last, number_of_points, start=None, end=None):
+    """Return the slice of evenly spaced data, that is inside a time window
+
+    Args:
+        first (float): The time of the first point
+        last (float): The time of the last point
+        number_of_points (int): The number of points
+        start (float): The start of the window, inclusive. None means from the first
+            point.
+        end (float): The end of the window, inclusive. None means to the last point.
+
+    Returns:
+        slice: The slice of the points inside the window
+    """
+    if number_of_points < 2 or last == first:
+        return slice(0, number_of_points)
+    step = (last - first) / (number_of_points - 1)
+    # Allow for rounding errors in the time calculation
+    tolerance = 1e-9 * abs(step)
+    start_index = 0
+    if start is not None:
+        start_index = int(math.ceil((start - first - tolerance) / step))
+    end_index = number_of_points
+    if end is not None:
+        end_index = int(math.floor((end - first + tolerance) / step)) + 1
+    start_index = min(max(start_index, 0), number_of_points)
+    end_index = min(max(end_index, start_index), number_of_points)
+    return slice(start_index, end_index)
@@ -65,6 +65,29 @@ to a data file and start to use it:
  # Files also have a useful str representation that shows the hierachi
  print file_
 
+Large files
+^^^^^^^^^^^
+
+Long measurements, like XPS depth profiles, can give XML files of several
+GB. The parser reads the XML incrementally and frees the XML elements as
+soon as they have been parsed, but a :class:`SpecsFile` still keeps all
+regions. To keep only one region group or one region in memory at a time,
+iterate over the file with :func:`iter_region_groups` or
+:func:`iter_regions` instead:
+
+.. code-block:: python
+
+ from PyExpLabSys.file_parsers.specs import iter_regions
+
+ for region_group_name, region in iter_regions('path_to_my_xps_file.xml'):
+     print(region_group_name, region.name, region.y_avg_cps.max())
+
+In these iterators, and in a :class:`SpecsFile` created with
+``lazy=True``, the counts of the scans in the cycles are kept as
+:class:`LazyArray` and are only decoded when they are used, one scan at a
+time, and :attr:`Region.y_avg_counts` is calculated as a running sum over
+the scans.
+
 NOTES
 ^^^^^
 
@@ -119,11 +142,46 @@ ARRAY_TYPES = {'ulong': 'uint64', 'double': 'double'}
 EXCEPTION_ON_UNHANDLED = True
 
 
-def simple_convert(element):
+class LazyArray(object):
+    """An array from the XML, that is decoded when it is used
+
+    It can be used in place of a numpy array by numpy functions, which decode it
+    with :meth:`decode`.
+    """
+
+    __slots__ = ('text', 'dtype')
+
+    def __init__(self, text, dtype):
+        """Initialize the lazy array
+
+        Args:
+            text (str): The newline separated values
+            dtype (str): The numpy dtype
+        """
+        self.text = text
+        self.dtype = dtype
+
+    def decode(self):
+        """Return the values as a numpy array"""
+        return np.fromstring(self.text, dtype=self.dtype, sep='\n')
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.decode()
+        if dtype is not None:
+            array = array.astype(dtype)
+        return array
+
+    def __repr__(self):
+        return '<{}(dtype=\'{}\')>'.format(self.__class__.__name__, self.dtype)
+
+
+def simple_convert(element, lazy=False):
     """Converts a XML data structure to pure python types.
 
     Args:
         element (xml.etree.ElementTree.Element): The XML element to convert
+        lazy (bool): Whether to convert arrays to :class:`LazyArray` instead of
+            numpy arrays
 
     Returns:
         object: A hierachi of python data structure
@@ -171,22 +229,24 @@ def simple_convert(element):
         out = None
     # parse array
     elif '\n' in element.text and element.tag in ARRAY_TYPES.keys():
-        out = np.fromstring(element.text, dtype=ARRAY_TYPES[element.tag], sep='\n')
+        out = LazyArray(element.text, ARRAY_TYPES[element.tag])
+        if not lazy:
+            out = out.decode()
     # parse simple type
     elif element.tag in XML_TYPES.keys():
         out = XML_TYPES[element.tag](element.text)
     # parse struct
     elif element.tag == 'struct':
-        out = {e.attrib['name']: simple_convert(e) for e in element}
+        out = {e.attrib['name']: simple_convert(e, lazy) for e in element}
     # parse sequence
     elif element.tag == 'sequence':
-        out = [simple_convert(e) for e in element]
+        out = [simple_convert(e, lazy) for e in element]
     # parse any
     elif element.tag == 'any':
         if len(element) == 0:
             out = None
         elif len(element) == 1:
-            out = simple_convert(element[0])
+            out = simple_convert(element[0], lazy)
         else:
             raise ValueError(
                 'Unexpected number of \'any\' children {}'.format(len(element))
@@ -214,48 +274,20 @@ class SpecsFile(list):
 
     """
 
-    def __init__(self, filepath, encoding=None):
-        """Parse the XML and initialize the internal variables"""
+    def __init__(self, filepath, encoding=None, lazy=False):
+        """Parse the XML and initialize the internal variables
+
+        Args:
+            filepath (str): The path of the file
+            encoding (str): The encoding of the file, if it is not given in the XML
+            lazy (bool): Whether to decode the counts of the scans only when they
+                are used, see :class:`LazyArray`
+        """
         super(SpecsFile, self).__init__()
         self.filepath = filepath
-        if encoding:
-            file_ = codecs.open(filepath, mode='r', encoding=encoding)
-            content = file_.read()
-            root = ET.fromstring(content.encode('utf-8'))
-        else:
-            try:
-                root = ET.parse(filepath).getroot()
-            except ET.ParseError as exception:
-                print(
-                    '#####\nParsing of the XML file failed. Possibly the '
-                    'XML is mal-formed or you need to supply the encoding '
-                    'of the XML file.\n\n###Traceback:'
-                )
-                raise
-
-        _reg_group_seq = root.find('sequence[@type_name=\'RegionGroupSeq\']')
-        for element in _reg_group_seq.findall('struct[@type_name=\'RegionGroup\']'):
-            _LOG.debug('Found region group: {}'.format(element))
-            self.append(RegionGroup(element))
-            _reg_group_seq.remove(element)
-
-        # Check that there are no unhandled XML elements left in the region
-        # group sequence
-        if len(_reg_group_seq) > 0:
-            message = UNHANDLED_XML_COMPONENTS.format(
-                _reg_group_seq[0], 'region group sequence'
-            )
-            if EXCEPTION_ON_UNHANDLED:
-                raise ValueError(message)
-            _LOG.warning(message)
-        root.remove(_reg_group_seq)
-
-        # Check that there are no unhandled XML elements in the root
-        if len(root) > 0:
-            message = UNHANDLED_XML_COMPONENTS.format(root[0], 'file')
-            if EXCEPTION_ON_UNHANDLED:
-                raise ValueError(message)
-            _LOG.warning(message)
+        for event in _iterparse(filepath, encoding, lazy, keep_regions=True):
+            if event[0] == 'region_group':
+                self.append(event[1])
 
     @property
     def regions_iter(self):
@@ -335,7 +367,7 @@ class RegionGroup(list):
 
     """
 
-    def __init__(self, xml):
+    def __init__(self, xml, regions=None):
         """Initializes the region group
 
         Expects to find 3 subelement; the name, regions and
@@ -344,8 +376,15 @@ class RegionGroup(list):
         Parsing parameters is not supported and therefore logs a
         warning if there are any.
 
+        Args:
+            xml (xml.etree.ElementTree.Element): The region group XML element
+            regions (list): Regions of this group that have already been parsed
+                and removed from the XML
+
         """
         super(RegionGroup, self).__init__()
+        if regions:
+            self.extend(regions)
 
         # Get name, find a string tag with attribute 'name' with value 'name'
         self.name = xml.findtext('string[@name=\'name\']')
@@ -423,18 +462,20 @@ class Region(object):
         'parameters',
     ]
 
-    def __init__(self, xml):
+    def __init__(self, xml, lazy=False):
         """Parse the XML and initialize internal variables
 
         Args:
             xml (xml.etree.ElementTree.Element): The region XML element
+            lazy (bool): Whether to decode the counts of the scans in the cycles
+                only when they are used, see :class:`LazyArray`
 
         """
         # Parse information items
         self.info = {}
         for name in self.information_names:
             element = xml.find('*[@name=\'{}\']'.format(name))
-            self.info[name] = simple_convert(element)
+            self.info[name] = simple_convert(element, lazy and name == 'cycles')
             # Dynamically create attributes for all the items
             setattr(self, name, self.info[name])
             xml.remove(element)
@@ -508,20 +549,35 @@ class Region(object):
         """Returns an generator of single scans, which in themselves are Numpy
         arrays
 
+        Scans kept as :class:`LazyArray` are decoded one at a time.
         """
         for cycle in self.iter_cycles:
             for scans in cycle:
                 for scan in scans:
+                    if isinstance(scan, LazyArray):
+                        scan = scan.decode()
                     yield scan
 
     @cached_property
     def y_avg_counts(self):
-        """Returns the average counts as a Numpy array"""
-        vstack = np.vstack(self.iter_scans)
-        data = vstack.mean(axis=0)
+        """Returns the average counts as a Numpy array
+
+        The average is calculated as a running sum, so only one scan at a time is
+        decoded.
+        """
+        total = None
+        number_of_scans = 0
+        for scan in self.iter_scans:
+            if total is None:
+                total = np.zeros(np.shape(scan))
+            total += scan
+            number_of_scans += 1
+        if total is None:
+            raise ValueError('The region {} has no scans'.format(self.name))
+        data = total / number_of_scans
         _LOG.debug(
             'Creating {} y_avg_counts values from {} scans'.format(
-                data.size, vstack.shape[0]
+                data.size, number_of_scans
             )
         )
         return data
@@ -544,6 +600,145 @@ class Region(object):
         return None
 
 
+class _Utf8Reader(object):
+    """File like object, that reads a file in some encoding and returns it encoded as
+    UTF-8, for the XML parser
+    """
+
+    def __init__(self, filepath, encoding):
+        self.file_ = codecs.open(filepath, mode='r', encoding=encoding)
+
+    def read(self, size=-1):
+        """Read and return (about) size bytes"""
+        return self.file_.read(size).encode('utf-8')
+
+    def close(self):
+        """Close the file"""
+        self.file_.close()
+
+
+def _type_name(element):
+    """Return the type_name attribute of element"""
+    return element.get('type_name') if element is not None else None
+
+
+def _iterparse(filepath, encoding=None, lazy=False, keep_regions=True):
+    """Parse the file incrementally
+
+    The XML elements of the regions and region groups are removed from the tree as
+    soon as they have been parsed, so that the memory can be freed.
+
+    Args:
+        filepath (str): The path of the file
+        encoding (str): The encoding of the file, if it is not given in the XML
+        lazy (bool): Whether to decode the counts of the scans lazily
+        keep_regions (bool): Whether to add the regions to the region groups
+
+    Yields:
+        tuple: ``('region', region group name, Region)`` for every region and
+        ``('region_group', RegionGroup)`` after the regions of every region group
+    """
+    if encoding:
+        source = _Utf8Reader(filepath, encoding)
+    else:
+        source = open(filepath, 'rb')
+
+    stack = []
+    regions = []
+    try:
+        for event, element in ET.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                stack.append(element)
+                continue
+            stack.pop()
+            parent = stack[-1] if stack else None
+            if (
+                _type_name(element) == 'RegionData'
+                and _type_name(parent) == 'RegionDataSeq'
+            ):
+                _LOG.debug('Found region: {}'.format(element))
+                region = Region(element, lazy=lazy)
+                parent.remove(element)
+                if keep_regions:
+                    regions.append(region)
+                yield 'region', stack[-2].findtext('string[@name=\'name\']'), region
+            elif (
+                _type_name(element) == 'RegionGroup'
+                and _type_name(parent) == 'RegionGroupSeq'
+            ):
+                _LOG.debug('Found region group: {}'.format(element))
+                region_group = RegionGroup(element, regions=regions)
+                regions = []
+                parent.remove(element)
+                yield 'region_group', region_group
+    except ET.ParseError:
+        print(
+            '#####\nParsing of the XML file failed. Possibly the '
+            'XML is mal-formed or you need to supply the encoding '
+            'of the XML file.\n\n###Traceback:'
+        )
+        raise
+    finally:
+        source.close()
+
+    # The last element is the root
+    root = element
+    _reg_group_seq = root.find('sequence[@type_name=\'RegionGroupSeq\']')
+    # Check that there are no unhandled XML elements left in the region
+    # group sequence
+    if len(_reg_group_seq) > 0:
+        message = UNHANDLED_XML_COMPONENTS.format(
+            _reg_group_seq[0], 'region group sequence'
+        )
+        if EXCEPTION_ON_UNHANDLED:
+            raise ValueError(message)
+        _LOG.warning(message)
+    root.remove(_reg_group_seq)
+
+    # Check that there are no unhandled XML elements in the root
+    if len(root) > 0:
+        message = UNHANDLED_XML_COMPONENTS.format(root[0], 'file')
+        if EXCEPTION_ON_UNHANDLED:
+            raise ValueError(message)
+        _LOG.warning(message)
+
+
+def iter_region_groups(filepath, encoding=None, lazy=True):
+    """Return a generator of the region groups of a file, parsed one at a time
+
+    Args:
+        filepath (str): The path of the file
+        encoding (str): The encoding of the file, if it is not given in the XML
+        lazy (bool): Whether to decode the counts of the scans only when they are
+            used, see :class:`LazyArray`
+
+    Yields:
+        RegionGroup: The region groups
+    """
+    for event in _iterparse(filepath, encoding, lazy, keep_regions=True):
+        if event[0] == 'region_group':
+            yield event[1]
+
+
+def iter_regions(filepath, encoding=None, lazy=True):
+    """Return a generator of the regions of a file, parsed one at a time
+
+    The regions are not kept, so only the region being used is in memory.
+
+    Args:
+        filepath (str): The path of the file
+        encoding (str): The encoding of the file, if it is not given in the XML
+        lazy (bool): Whether to decode the counts of the scans only when they are
+            used, see :class:`LazyArray`
+
+    Yields:
+        tuple: The name of the region group and the :class:`Region`
+    """
+    for event in _iterparse(filepath, encoding, lazy, keep_regions=False):
+        if event[0] == 'region':
+            yield event[1], event[2]
+
+
 class NotXPSException(Exception):
     """Exception for trying to interpret non-XPS data as XPS data"""
 
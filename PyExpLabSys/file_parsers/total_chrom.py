@@ -4,9 +4,12 @@
 from pprint import pprint
 from struct import unpack, calcsize
 
+import numpy
 from numpy import fromfile
 
 from PyExpLabSys.common.supported_versions import python3_only
+from PyExpLabSys.thirdparty.cached_property import cached_property
+from PyExpLabSys.file_parsers.memmap import ScaledView, time_slice
 
 python3_only(__file__)
 
@@ -220,11 +223,38 @@ def parse_array(type_, file_):
     return array
 
 
+def map_array(type_, file_):
+    """Memory map an array, instead of reading it like :func:`parse_array`
+
+    Args:
+        type_ (str or numpy.dtype): The numpy data type of the array data
+        file_ (file): The file object, positioned at the array
+
+    Returns:
+        numpy.memmap: The memory mapped array
+    """
+    number_of_points = unpack('>i', file_.read(4))[0]
+    offset = file_.tell()
+    file_.seek(offset + number_of_points * numpy.dtype(type_).itemsize)
+    if number_of_points == 0:
+        return numpy.empty(0, dtype=type_)
+    return numpy.memmap(
+        file_.name, dtype=type_, mode='r', offset=offset, shape=(number_of_points,)
+    )
+
+
 class Raw:
-    """Raw file FIXME"""
+    """Raw file FIXME
 
-    def __init__(self, filepath):
+    The raw data points are in :attr:`raw_data_points` and the values, converted with
+    the AIA raw data conversion scale factor and offset, in :attr:`values`. With
+    ``lazy=True`` only the headers are parsed and the data is memory mapped, so only
+    the parts of it that are used are read.
+    """
+
+    def __init__(self, filepath, lazy=False):
         self.filepath = filepath
+        self.lazy = lazy
         with open(filepath, 'rb') as file_:
             # File starts with a file header
             self.file_header = parse_simple_types(FILE_HEADER, file_)
@@ -240,13 +270,53 @@ class Raw:
             self.seq_description = parse_simple_types(SEQ_DESCRIPTION, file_)
 
             # print(file_.tell())
-            self.raw_data_points = parse_array('>i4', file_)
+            if lazy:
+                self.raw_data_points = map_array('>i4', file_)
+            else:
+                self.raw_data_points = parse_array('>i4', file_)
 
             # print("\n\n\n##############################")
             # self.instrument_method_structure = parse_simple_types(
             #    INSTRUMENT_METHOD_STRUCTURE, file_,
             # )
 
+    @cached_property
+    def values(self):
+        """The raw data points converted with the AIA scale factor and offset
+
+        In lazy mode, this is a :class:`~PyExpLabSys.file_parsers.memmap.ScaledView`.
+        """
+        view = ScaledView(
+            self.raw_data_points,
+            self.ad_header['AIA raw data conversion scale factor'],
+            self.ad_header['AIA raw data conversion offset'],
+        )
+        return view if self.lazy else view[:]
+
+    @cached_property
+    def times(self):
+        """The times of the data points, assuming that they are evenly spread from 0
+        to the 'Actual Run Time' in :attr:`ad_header`
+
+        The unit is that of the 'Actual Run Time'. It is assumed, but not verified, to
+        be minutes.
+        """
+        return numpy.linspace(
+            0.0, self.ad_header['Actual Run Time'], len(self.raw_data_points)
+        )
+
+    def time_slice(self, start=None, end=None):
+        """Return the slice of the data between start and end (inclusive), in the
+        unit of :attr:`times`
+        """
+        return time_slice(
+            0.0,
+            self.ad_header['Actual Run Time'],
+            len(self.raw_data_points),
+            start,
+            end,
+        )
+
 
 def module_demo():
     """Module demon"""
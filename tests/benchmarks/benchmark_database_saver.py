@@ -0,0 +1,99 @@
+"""Benchmark of DataSetSaver.save_points_batch against the old per point loop
+
+The benchmark does not need a database. The DataSetSaver is created without running
+__init__ and its SqlSaver is replaced by an object that only collects the enqueued
+queries. Run with::
+
+    python benchmark_database_saver.py
+"""
+
+from __future__ import print_function
+
+import time
+import numpy
+
+from PyExpLabSys.common.database_saver import DataSetSaver
+
+NUMBER_OF_POINTS = (10 ** 4, 10 ** 5, 10 ** 6)
+REPEATS = 3
+
+
+class CollectingSqlSaver(object):
+    """Stand-in for the SqlSaver, that only collects the enqueued queries"""
+
+    def __init__(self):
+        self.queries = []
+
+    def enqueue_query(self, query, query_args=None):
+        """Collect query"""
+        self.queries.append((query, query_args))
+
+
+def make_data_set_saver():
+    """Return a DataSetSaver without a database connection"""
+    data_set_saver = DataSetSaver.__new__(DataSetSaver)
+    data_set_saver.sql_saver = CollectingSqlSaver()
+    data_set_saver.measurement_ids = {'benchmark': 42}
+    data_set_saver.insert_batch_query = (
+        'INSERT INTO xy_values_dummy (measurement, x, y) values {}'
+    )
+    data_set_saver._batch_queries = {}  # pylint: disable=protected-access
+    return data_set_saver
+
+
+def old_save_points_batch(data_set_saver, codename, x_values, y_values, batchsize=1000):
+    """The per point loop that was used in DataSetSaver.save_points_batch"""
+    measurement_id = data_set_saver.measurement_ids[codename]
+    values = []
+    number_of_values = 0
+    for x_value, y_value in zip(x_values, y_values):
+        values.extend([measurement_id, x_value, y_value])
+        number_of_values += 1
+        if number_of_values >= batchsize:
+            value_marker_string = ', '.join(['(%s, %s, %s)'] * number_of_values)
+            query = data_set_saver.insert_batch_query.format(value_marker_string)
+            data_set_saver.sql_saver.enqueue_query(query, values)
+            values = []
+            number_of_values = 0
+    if number_of_values > 0:
+        value_marker_string = ', '.join(['(%s, %s, %s)'] * number_of_values)
+        query = data_set_saver.insert_batch_query.format(value_marker_string)
+        data_set_saver.sql_saver.enqueue_query(query, values)
+
+
+def best_time(function, *args):
+    """Return the best time of REPEATS calls of function"""
+    times = []
+    for _ in range(REPEATS):
+        start = time.time()
+        function(*args)
+        times.append(time.time() - start)
+    return min(times)
+
+
+def main():
+    """Run the benchmark"""
+    print('{: >10} {: >10} {: >10} {: >8}'.format('Points', 'Old [s]', 'New [s]', 'Speedup'))
+    for number_of_points in NUMBER_OF_POINTS:
+        x_values = numpy.linspace(0, 100, number_of_points)
+        y_values = numpy.sin(x_values)
+
+        old_saver = make_data_set_saver()
+        old = best_time(old_save_points_batch, old_saver, 'benchmark', x_values, y_values)
+        new_saver = make_data_set_saver()
+        new = best_time(new_saver.save_points_batch, 'benchmark', x_values, y_values)
+
+        # Check that the two produce the same queries and values
+        for (old_query, old_args), (new_query, new_args) in zip(
+            old_saver.sql_saver.queries, new_saver.sql_saver.queries
+        ):
+            assert old_query == new_query
+            assert old_args == new_args
+
+        print('{: >10} {: >10.4f} {: >10.4f} {: >8.1f}'.format(
+            number_of_points, old, new, old / new
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Load benchmark of the DateDataPullSocket with the different server types
+
+A number of poller threads request ``raw`` from a DateDataPullSocket as fast as
+they can, while one slow client sends ``status`` requests. The status is made
+slow (SLOW_STATUS seconds) by replacing the system status object, to mimic the
+shelling out for git, mac and SD card information on a Raspberry Pi. The
+latency percentiles of the ``raw`` requests are printed for each server type.
+Run with::
+
+    python benchmark_sockets.py
+"""
+
+from __future__ import print_function
+
+import time
+import socket
+import threading
+import numpy
+from PyExpLabSys import settings
+
+SETTINGS = settings.Settings()
+SETTINGS.util_log_warning_email = 'fake@non.com'
+SETTINGS.util_log_error_email = 'fake@non.com'
+SETTINGS.util_log_mail_host = 'non.com'
+
+# pylint: disable=wrong-import-position
+from PyExpLabSys.common import sockets
+from PyExpLabSys.common.sockets import DateDataPullSocket
+
+POLLERS = 8
+DURATION = 3.0
+SLOW_STATUS = 0.05
+STATUS_INTERVAL = 0.1
+FIRST_PORT = 9300
+
+
+class SlowSystemStatus(object):
+    """Stand-in for the system status, that takes SLOW_STATUS to answer"""
+
+    def start_refresh(self):
+        """Do not refresh in the background"""
+
+    @staticmethod
+    def complete_status_json():
+        """Return an empty status after a while"""
+        time.sleep(SLOW_STATUS)
+        return '{}'
+
+
+def client(port, request, interval, stop, latencies):
+    """Send request to port every interval until stop is set and record latencies"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(1.0)
+    while not stop.is_set():
+        start = time.time()
+        sock.sendto(request, ('127.0.0.1', port))
+        try:
+            sock.recvfrom(65536)
+        except socket.timeout:
+            continue
+        latencies.append(time.time() - start)
+        if interval:
+            time.sleep(interval)
+    sock.close()
+
+
+def run_load(server_type, port):
+    """Run the load against a pull socket of server_type and return the latencies of the
+    raw requests
+    """
+    pull_socket = DateDataPullSocket(
+        'benchmark', ['value{}'.format(number) for number in range(10)], port=port,
+        server_type=server_type,
+    )
+    pull_socket.start()
+    time.sleep(0.1)
+    stop = threading.Event()
+    latencies = []
+    threads = [
+        threading.Thread(target=client, args=(port, b'raw', 0, stop, latencies))
+        for _ in range(POLLERS)
+    ]
+    threads.append(
+        threading.Thread(target=client, args=(port, b'status', STATUS_INTERVAL, stop, []))
+    )
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    pull_socket.stop()
+    return numpy.array(latencies)
+
+
+def main():
+    """Run the benchmark"""
+    sockets.SYSTEM_STATUS = SlowSystemStatus()
+    print('{} pollers and a {} s status request every {} s\n'.format(
+        POLLERS, SLOW_STATUS, STATUS_INTERVAL
+    ))
+    print('{: >10} {: >10} {: >10} {: >10} {: >10} {: >10}'.format(
+        'Server', 'Requests', 'p50 [ms]', 'p90 [ms]', 'p99 [ms]', 'max [ms]'
+    ))
+    for number, server_type in enumerate(sockets.SERVER_TYPES):
+        latencies = run_load(server_type, FIRST_PORT + number) * 1000
+        p50, p90, p99 = numpy.percentile(latencies, [50, 90, 99])
+        print('{: >10} {: >10} {: >10.3f} {: >10.3f} {: >10.3f} {: >10.3f}'.format(
+            server_type, len(latencies), p50, p90, p99, latencies.max()
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Frames per second benchmark of AsciiPlot
+
+A sine with a number of points is plotted repeatedly with:
+
+ * **text**: The old path, where the points are formatted as text, written to
+   gnuplot and the plot is read back byte by byte after the first screen full
+ * **binary**: The binary inline data and the single framed read, without
+   decimation
+ * **decimated**: As binary, but with the default min/max decimation
+ * **python**: The native Python renderer, with decimation
+
+The gnuplot paths are skipped if gnuplot is not installed. Run with::
+
+    PYTHONPATH=. python tests/benchmarks/benchmark_text_plot.py
+"""
+
+from __future__ import print_function
+
+import time
+import shutil
+from subprocess import Popen, PIPE
+import numpy
+from PyExpLabSys.common.text_plot import AsciiPlot
+
+SIZE = (120, 40)
+NUMBERS_OF_POINTS = (100, 1000, 10000, 100000)
+DURATION = 2.0
+
+
+class TextAsciiPlot(object):
+    """The old AsciiPlot plot path, for reference"""
+
+    def __init__(self, size):
+        self.size = size
+        self.process = Popen(['gnuplot'], stdin=PIPE, stdout=PIPE, stderr=PIPE, bufsize=0)
+        self.read = self.process.stdout.read
+        self.write('set term dumb {} {}\nset out\n'.format(*size))
+
+    def write(self, string):
+        """Write string to gnuplot"""
+        self.process.stdin.write(string.encode())
+
+    def plot(self, x, y, legend=''):
+        """Plot with text data"""
+        self.write("plot \"-\" with lines title \"{}\"\n".format(legend))
+        data = '\n'.join(["%s %s" % pair for pair in zip(x, y)])
+        self.write(data + '\n')
+        self.write("e\n")
+        self.read(1)
+        out = self.read(self.size[0] * self.size[1]).decode('ascii')
+        while out[-1] != '\n':
+            out += self.read(1).decode('ascii')
+        return out
+
+    def close(self):
+        """Close the gnuplot process"""
+        self.process.stdin.close()
+        self.process.wait()
+
+
+def frames_per_second(plot, x, y):
+    """Return the number of calls to plot(x, y) per second"""
+    frames = 0
+    start = time.time()
+    while time.time() - start < DURATION:
+        plot(x, y)
+        frames += 1
+    return frames / (time.time() - start)
+
+
+def main():
+    """Run the benchmark"""
+    have_gnuplot = shutil.which('gnuplot') is not None
+    if not have_gnuplot:
+        print('gnuplot is not installed, only the python renderer is benchmarked\n')
+    print('Frames per second for a {}x{} plot\n'.format(*SIZE))
+    print('{: >10} {: >10} {: >10} {: >10} {: >10}'.format(
+        'Points', 'text', 'binary', 'decimated', 'python'
+    ))
+    for number_of_points in NUMBERS_OF_POINTS:
+        x = numpy.linspace(0, 6.28, number_of_points)
+        y = numpy.sin(x)
+        results = []
+        if have_gnuplot:
+            text_plot = TextAsciiPlot(SIZE)
+            binary_plot = AsciiPlot(size=SIZE)
+            results.append(frames_per_second(text_plot.plot, x, y))
+            results.append(frames_per_second(
+                lambda x, y: binary_plot.plot(x, y, decimation=None), x, y
+            ))
+            results.append(frames_per_second(binary_plot.plot, x, y))
+            text_plot.close()
+            binary_plot.close()
+        else:
+            results += [float('nan')] * 3
+        python_plot = AsciiPlot(size=SIZE, renderer='python')
+        results.append(frames_per_second(python_plot.plot, x, y))
+        print('{: >10} {: >10.1f} {: >10.1f} {: >10.1f} {: >10.1f}'.format(
+            number_of_points, *results
+        ))
+
+
+if __name__ == '__main__':
+    main()
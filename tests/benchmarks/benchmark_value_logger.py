@@ -0,0 +1,73 @@
+"""Equivalence and speed benchmark of LoggingCriteriumChecker.check_batch
+
+A pressure like dataset (log criterium) and a speed like dataset (lin criterium),
+with noise, steps and spikes, is filtered with the scalar check and with
+check_batch. The script checks that the saved points are the same and prints the
+time used by both. Run with::
+
+    python benchmark_value_logger.py
+"""
+
+from __future__ import print_function
+
+import time
+import numpy as np
+from PyExpLabSys.common.value_logger import LoggingCriteriumChecker
+
+NUMBER_OF_POINTS = 1000000
+
+
+def make_data(type_):
+    """Return times and values for a dataset of type_ 'log' or 'lin'"""
+    random = np.random.RandomState(42)
+    times = np.arange(NUMBER_OF_POINTS, dtype=float)
+    number_of_levels = NUMBER_OF_POINTS // 5000
+    if type_ == 'log':
+        levels = 10 ** random.uniform(-4, 1.5, number_of_levels)
+        values = np.repeat(levels, 5000) * (1 + random.normal(0, 0.02, NUMBER_OF_POINTS))
+    else:
+        levels = random.choice([1797.0, 1797.0, 1797.0, 2159.0], number_of_levels)
+        values = np.repeat(levels, 5000) + random.normal(0, 0.5, NUMBER_OF_POINTS)
+    return times, values
+
+
+def make_checker(type_):
+    """Return a checker with the settings from the module documentation"""
+    checker = LoggingCriteriumChecker(
+        codenames=['dataset'], types=[type_], criteria=[0.25 if type_ == 'log' else 5],
+    )
+    checker.deprecation_warning = False
+    return checker
+
+
+def main():
+    """Run the benchmark"""
+    print('{: >6} {: >10} {: >10} {: >12} {: >12} {: >8}'.format(
+        'Type', 'Points', 'Saved', 'check [s]', 'batch [s]', 'Speedup'
+    ))
+    for type_ in ('log', 'lin'):
+        times, values = make_data(type_)
+
+        checker = make_checker(type_)
+        start = time.time()
+        for now, value in zip(times.tolist(), values.tolist()):
+            checker.check('dataset', value, now=now)
+        scalar_time = time.time() - start
+        scalar_points = checker.get_data('dataset')
+
+        checker = make_checker(type_)
+        start = time.time()
+        checker.check_batch('dataset', times, values)
+        batch_time = time.time() - start
+        batch_points = checker.get_data('dataset')
+
+        if batch_points != scalar_points:
+            raise RuntimeError('check_batch and check saved different points')
+        print('{: >6} {: >10} {: >10} {: >12.3f} {: >12.3f} {: >8.1f}'.format(
+            type_, NUMBER_OF_POINTS, len(batch_points), scalar_time, batch_time,
+            scalar_time / batch_time
+        ))
+
+
+if __name__ == '__main__':
+    main()
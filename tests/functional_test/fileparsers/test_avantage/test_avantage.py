@@ -0,0 +1,73 @@
+"""Functional tests for the Avantage VGD metadata scanning and catalog"""
+
+from __future__ import print_function
+from os import path
+import os
+import pytest
+
+from PyExpLabSys.file_parsers.avantage import (
+    VGDFile, index_vgd_files, query_vgd_catalog
+)
+from PyExpLabSys.file_parsers.catalog import Catalog
+from PyExpLabSys.common.supported_versions import python2_and_3
+python2_and_3(__file__)
+
+
+### Fixtures
+@pytest.fixture
+def data_dir(tmpdir):
+    """A directory tree with dummy (non OLE) VGD files and a file of another type"""
+    data_dir = tmpdir.join('data')
+    data_dir.join('a.vgd').write_binary(b'not an OLE file', ensure=True)
+    data_dir.join('sub', 'b.VGD').write_binary(b'neither is this', ensure=True)
+    data_dir.join('notes.txt').write_binary(b'not a VGD file')
+    return str(data_dir)
+
+
+### Tests
+def test_metadata_only_streams():
+    """Test that the data streams are not available in metadata only mode"""
+    vgd_file = VGDFile.__new__(VGDFile)
+    vgd_file.filepath = 'dummy.vgd'
+    vgd_file.metadata_only = True
+    for name in ('data', 'data_axes', 'data_back_markers', 'version'):
+        with pytest.raises(ValueError, match='metadata_only'):
+            getattr(vgd_file, name)
+
+
+def test_index_vgd_files(data_dir, tmpdir):
+    """Test the per file errors, skip by mtime and size and removal"""
+    catalog_path = str(tmpdir.join('catalog.sqlite'))
+    assert index_vgd_files(data_dir, catalog_path, processes=2) == 2
+    with Catalog(catalog_path) as catalog:
+        errors = catalog.errors()
+    assert sorted(path.basename(filepath) for filepath in errors) == \
+        ['a.vgd', 'b.VGD']
+    assert all('not an OLE2' in error for error in errors.values())
+    assert query_vgd_catalog(catalog_path) == []
+
+    # Unchanged files are skipped
+    assert index_vgd_files(data_dir, catalog_path, processes=1) == 0
+
+    # Changed files are indexed again
+    a_path = path.join(data_dir, 'a.vgd')
+    with open(a_path, 'ab') as file_:
+        file_.write(b'!')
+    assert index_vgd_files(data_dir, catalog_path, processes=1) == 1
+
+    # Removed files are removed from the catalog, and other formats are left alone
+    os.remove(path.join(data_dir, 'sub', 'b.VGD'))
+    with Catalog(catalog_path) as catalog:
+        catalog.connection.execute(
+            "INSERT INTO files (path, format) VALUES (?, 'specs')",
+            (path.join(data_dir, 'gone.xml'),)
+        )
+        catalog.connection.commit()
+    assert index_vgd_files(data_dir, catalog_path, processes=1) == 0
+    with Catalog(catalog_path) as catalog:
+        assert list(catalog.errors()) == [a_path]
+        assert catalog.connection.execute('SELECT COUNT(*) FROM files').fetchone()[0] \
+            == 2
+    assert query_vgd_catalog(catalog_path, where='points > ?', parameters=(0,)) == []
+    with pytest.raises(ValueError):
+        query_vgd_catalog(catalog_path, colour='blue')
@@ -0,0 +1,115 @@
+"""Functional tests for the file parsers catalog"""
+
+from __future__ import print_function
+from os import path
+import os
+import shutil
+from datetime import datetime
+import pytest
+
+from PyExpLabSys.file_parsers.catalog import Catalog, detect_format
+from PyExpLabSys.common.supported_versions import python2_and_3
+python2_and_3(__file__)
+
+THIS_DIR = path.dirname(path.realpath(__file__))
+SPECS_DIR = path.join(THIS_DIR, '..', 'test_specs')
+CHEMSTATION_DIR = path.join(THIS_DIR, '..', 'test_chemstation')
+
+
+### Fixtures
+@pytest.fixture
+def data_dir(tmpdir):
+    """A directory tree with specs files and chemstation sequences"""
+    data_dir = tmpdir.join('data')
+    specs_dir = data_dir.join('xps')
+    specs_dir.ensure(dir=True)
+    for filename in ('specs_xps_sample.xml', 'specs_iss_sample.xml',
+                     'specs_xps_sample.xy'):
+        shutil.copy(path.join(SPECS_DIR, filename), str(specs_dir))
+    for sequence in ('def_GC 2015-01-13 11-16-24', '05102016_CAL_CH4_5CM3'):
+        shutil.copytree(path.join(CHEMSTATION_DIR, sequence),
+                        str(data_dir.join('gc', sequence)))
+    return str(data_dir)
+
+
+### Tests
+def test_detect_format(data_dir):
+    """Test the format detection"""
+    assert detect_format(path.join(data_dir, 'xps', 'specs_xps_sample.xml')) == 'specs'
+    assert detect_format(path.join(data_dir, 'xps', 'specs_xps_sample.xy')) is None
+    injection = path.join(data_dir, 'gc', 'def_GC 2015-01-13 11-16-24', 'NV-F0101.D')
+    assert detect_format(injection) == 'chemstation'
+    assert detect_format(path.join(data_dir, 'gc')) is None
+
+
+def test_index_and_query(data_dir, tmpdir):
+    """Test indexing in parallel and the filtered queries"""
+    with Catalog(str(tmpdir.join('catalog.sqlite'))) as catalog:
+        counts = catalog.index(data_dir, processes=2)
+        assert counts == {'parsed': 4, 'unchanged': 0, 'removed': 0, 'error': 0}
+
+        xps = catalog.query(kind='region', technique='XPS')
+        assert len(xps) > 0
+        assert all(record['format'] == 'specs' for record in xps)
+        assert all(record['metadata']['region']['analysis_method'] == 'XPS'
+                   for record in xps)
+        pass_energies = {record['pass_energy'] for record in xps}
+        for pass_energy in pass_energies:
+            records = catalog.query(kind='region', pass_energy=pass_energy)
+            assert {record['pass_energy'] for record in records} == {pass_energy}
+        assert catalog.query(where='pass_energy > ?', parameters=(1E6,)) == []
+
+        injections = catalog.query(kind='injection', technique='GC')
+        assert len(injections) == 2
+        injection = catalog.query(group_name='def_GC 2015-01-13 11-16-24')[0]
+        assert injection['name'] == 'NI cat'
+        january = catalog.query(kind='injection', since=datetime(2015, 1, 1),
+                                until=datetime(2015, 2, 1))
+        assert [record['path'] for record in january] == [injection['path']]
+
+        with pytest.raises(ValueError):
+            catalog.query(colour='blue')
+
+
+def test_incremental_index(data_dir, tmpdir):
+    """Test that only changed sources are parsed again"""
+    catalog_path = str(tmpdir.join('catalog.sqlite'))
+    with Catalog(catalog_path) as catalog:
+        catalog.index(data_dir, processes=1)
+        number_of_records = len(catalog.query())
+
+    with Catalog(catalog_path) as catalog:
+        counts = catalog.index(data_dir, processes=1)
+        assert counts == {'parsed': 0, 'unchanged': 4, 'removed': 0, 'error': 0}
+
+        # Touched, but same content
+        iss_path = path.join(data_dir, 'xps', 'specs_iss_sample.xml')
+        os.utime(iss_path, (1E9, 1E9))
+        counts = catalog.index(data_dir, processes=1)
+        assert counts == {'parsed': 0, 'unchanged': 4, 'removed': 0, 'error': 0}
+        assert len(catalog.query()) == number_of_records
+
+        # Changed content
+        with open(iss_path, 'ab') as file_:
+            file_.write(b'\n')
+        counts = catalog.index(data_dir, processes=1)
+        assert counts == {'parsed': 1, 'unchanged': 3, 'removed': 0, 'error': 0}
+        assert len(catalog.query()) == number_of_records
+
+        # Broken and removed files
+        xps_path = path.join(data_dir, 'xps', 'specs_xps_sample.xml')
+        with open(xps_path, 'r+b') as file_:
+            file_.truncate(2000)
+        shutil.rmtree(path.join(data_dir, 'gc', '05102016_CAL_CH4_5CM3'))
+        counts = catalog.index(data_dir, processes=1)
+        assert counts == {'parsed': 0, 'unchanged': 2, 'removed': 1, 'error': 1}
+        assert list(catalog.errors()) == [xps_path]
+        assert {record['format'] for record in catalog.query()} == \
+            {'specs', 'chemstation'}
+        assert catalog.query(path=xps_path) == []
+
+        # Touched broken file, the error is kept
+        os.utime(xps_path, (1E9, 1E9))
+        counts = catalog.index(data_dir, processes=1)
+        assert counts == {'parsed': 0, 'unchanged': 2, 'removed': 0, 'error': 1}
+        assert list(catalog.errors()) == [xps_path]
@@ -3,13 +3,19 @@
 
 from __future__ import unicode_literals, print_function
 from os import path
+import os
 import json
+import shutil
 import time
+try:
+    from unittest import mock
+except ImportError:
+    import mock
 import pytest
 
 import numpy
 
-from PyExpLabSys.file_parsers.chemstation import Sequence, CHFile
+from PyExpLabSys.file_parsers.chemstation import Sequence, Injection, CHFile
 from PyExpLabSys.common.supported_versions import python2_and_3
 python2_and_3(__file__)
 
@@ -120,3 +126,60 @@ def test_ch_file():
     with open(CHDATA, 'r') as file_:
         saved_metadata = json.load(file_)
     assert saved_metadata == ch_file.metadata
+
+
+def test_ch_file_lazy():
+    """Test the memory mapped ChFile and the time window slicing"""
+    ch_file = CHFile(CHFILE)
+    lazy_ch_file = CHFile(CHFILE, lazy=True)
+    assert isinstance(lazy_ch_file.values.raw, numpy.memmap)
+    assert len(lazy_ch_file.values) == len(ch_file.values)
+    assert numpy.array_equal(numpy.asarray(lazy_ch_file.values), ch_file.values)
+    assert numpy.isclose(numpy.sum(lazy_ch_file.values), ch_file.values.sum())
+    assert numpy.array_equal(lazy_ch_file.values[10:20], ch_file.values[10:20])
+
+    times = ch_file.times
+    start, end = times[100], times[200] + 1e-6
+    window = lazy_ch_file.time_slice(start, end)
+    assert (window.start, window.stop) == (100, 201)
+    expected = (times >= start) & (times <= end)
+    assert numpy.array_equal(lazy_ch_file.values[window], ch_file.values[expected])
+    assert lazy_ch_file.time_slice() == slice(0, len(times))
+    assert lazy_ch_file.time_slice(times[-1] + 1.0).start == len(times)
+
+
+def test_parallel_and_cached(tmpdir):
+    """Test that parallel and cached loading give the same sequence"""
+    sequence_path = path.join(THIS_DIR, 'def_GC 2015-01-13 11-16-24')
+    cache_dir = str(tmpdir.join('cache'))
+    expected = SEQUENCES[0].full_sequence_dataset()
+    for _ in range(2):
+        sequence = Sequence(sequence_path, load_raw_spectra=False, processes=2,
+                            cache_dir=cache_dir)
+        assert sequence.metadata == SEQUENCES[0].metadata
+        assert sequence.full_sequence_dataset() == expected
+        assert [injection.raw_files for injection in sequence.injections] == \
+            [{}] * len(sequence.injections)
+    assert len(os.listdir(cache_dir)) == len(sequence.injections)
+
+
+def test_injection_cache_invalidation(tmpdir):
+    """Test that the cache is only used for unchanged injections"""
+    injection_path = str(tmpdir.join('injection.D'))
+    shutil.copytree(SEQUENCES[1].injections[0].injection_dirpath, injection_path)
+    cache_dir = str(tmpdir.join('cache'))
+    injection = Injection.load(injection_path, cache_dir=cache_dir)
+    with mock.patch.object(Injection, '__init__') as init:
+        cached = Injection.load(injection_path, cache_dir=cache_dir)
+        assert not init.called
+    assert cached.reports == injection.reports
+    assert cached.metadata == injection.metadata
+
+    # Changed kwargs, or a changed file, invalidates the cache
+    with mock.patch.object(Injection, '__init__', return_value=None) as init:
+        Injection.load(injection_path, cache_dir=cache_dir, read_report_txt=False)
+        assert init.called
+    os.utime(path.join(injection_path, 'REPORT01.CSV'), (0, 0))
+    with mock.patch.object(Injection, '__init__', return_value=None) as init:
+        Injection.load(injection_path, cache_dir=cache_dir)
+        assert init.called
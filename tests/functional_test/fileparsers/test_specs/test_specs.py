@@ -7,7 +7,9 @@ import re
 import os
 import codecs
 import numpy as np
-from PyExpLabSys.file_parsers.specs import SpecsFile
+from PyExpLabSys.file_parsers.specs import (
+    SpecsFile, LazyArray, iter_regions, iter_region_groups
+)
 from PyExpLabSys.common.supported_versions import python2_and_3
 python2_and_3(__file__)
 
@@ -124,5 +126,43 @@ def test_iss_metadata():
         print(region.region[key])
 
 
+def test_streaming():
+    """Test that the streaming iterators give the same regions as SpecsFile"""
+    filepath = os.path.join(THIS_FILE_DIR, 'specs_xps_sample.xml')
+    specs_file = SpecsFile(filepath)
+    streamed = list(iter_regions(filepath))
+    assert [name for name, _ in streamed] == \
+        [group.name for group in specs_file for _ in group]
+    for (_, streamed_region), region in zip(streamed, specs_file.regions_iter):
+        assert streamed_region.name == region.name
+        assert streamed_region.region == region.region
+        if region.name != 'Cu/Zn Ni 2p Al anode':  # Has no counts
+            assert np.array_equal(streamed_region.y_avg_counts, region.y_avg_counts)
+
+    region_groups = list(iter_region_groups(filepath))
+    assert [group.name for group in region_groups] == [group.name for group in specs_file]
+    assert [len(group) for group in region_groups] == [len(group) for group in specs_file]
+    assert region_groups[0].parameters == specs_file[0].parameters
+
+
+def test_lazy_counts():
+    """Test that the counts are kept as lazy arrays and decoded on use"""
+    filepath = os.path.join(THIS_FILE_DIR, 'specs_iss_sample.xml')
+    region = SpecsFile(filepath, lazy=True).search_regions('1:3 Cu:Ru')[0]
+    counts = region.cycles[0]['scans'][0]['counts'][0]
+    assert isinstance(counts, LazyArray)
+    assert np.array_equal(np.asarray(counts), next(region.iter_scans))
+    assert np.allclose(region.y_avg_cps, get_specs_region('specs_iss_sample.xml',
+                                                          '1:3 Cu:Ru').y_avg_cps)
+
+
+def test_encoding():
+    """Test parsing with a given encoding"""
+    filepath = os.path.join(THIS_FILE_DIR, 'specs_iss_sample.xml')
+    region = SpecsFile(filepath, encoding='latin1').search_regions('1:3 Cu:Ru')[0]
+    xy_region = get_xy_data('specs_iss_sample.xy')
+    assert np.allclose(xy_region[:, 1], region.y_avg_cps)
+
+
 if __name__ == '__main__':
     print("Execute with: py.test -v")
@@ -0,0 +1,91 @@
+# pylint: disable=redefined-outer-name,unused-argument
+
+"""This file contains unit tests for PyExpLabSys.common.async_socket_clients"""
+
+import time
+import socket
+import asyncio
+import pytest
+from PyExpLabSys import settings
+
+SETTINGS = settings.Settings()
+SETTINGS.util_log_warning_email = "fake@non.com"
+SETTINGS.util_log_error_email = "fake@non.com"
+SETTINGS.util_log_mail_host = "non.com"
+
+from PyExpLabSys.common import sockets
+from PyExpLabSys.common.sockets import DateDataPullSocket
+from PyExpLabSys.common.async_socket_clients import multi_request, get_many, get_fields
+
+
+### Test data
+CODENAMES = ['first', 'second', 'third']
+PORT = 19110
+
+
+### Fixtures
+@pytest.fixture
+def pull_socket():
+    """A running DateDataPullSocket with points for first and second"""
+    old_data = sockets.DATA
+    sockets.DATA = {}
+    socket_ = DateDataPullSocket('my_socket', CODENAMES, port=PORT,
+                                 timeouts=[None, None, 1.0])
+    socket_.start()
+    socket_.set_point('first', (1.0, 2.0))
+    socket_.set_point('second', (3.0, 4.5))
+    yield socket_
+    socket_.stop()
+    socket_.server.server_close()
+    sockets.DATA = old_data
+
+
+@pytest.fixture
+def silent_port():
+    """The port of a UDP socket, that never replies"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+### Tests
+def test_multi_request(pull_socket, silent_port):
+    """Test that requests are sent concurrently with per request timeouts"""
+    requests = {
+        'first': ('127.0.0.1', PORT, 'first#raw'),
+        'second': ('127.0.0.1', PORT, 'second#json'),
+        'name': ('127.0.0.1', PORT, 'name'),
+        'silent1': ('127.0.0.1', silent_port, 'first#raw'),
+        'silent2': ('127.0.0.1', silent_port, 'first#raw', 0.1),
+    }
+    start = time.time()
+    results = asyncio.run(multi_request(requests, timeout=0.3))
+    assert time.time() - start < 0.5
+    assert results['first'] == '1.0,2.0'
+    assert results['second'] == '[3.0, 4.5]'
+    assert results['name'] == 'my_socket'
+    assert isinstance(results['silent1'], asyncio.TimeoutError)
+    assert isinstance(results['silent2'], asyncio.TimeoutError)
+
+
+def test_get_many(pull_socket):
+    """Test getting several values with one request"""
+    assert asyncio.run(get_many('127.0.0.1', ['second', 'third'], port=PORT)) == {
+        'second': [3.0, 4.5], 'third': 'OLD_DATA'
+    }
+    with pytest.raises(ValueError):
+        asyncio.run(get_many('127.0.0.1', ['not_a_codename'], port=PORT))
+
+
+def test_get_fields(pull_socket, silent_port):
+    """Test getting values from several sockets"""
+    fields = {
+        'a': ('127.0.0.1', PORT, 'first'),
+        'b': ('127.0.0.1', PORT, 'second'),
+        'c': ('127.0.0.1', silent_port, 'first'),
+    }
+    results = asyncio.run(get_fields(fields, timeout=0.2))
+    assert results['a'] == [1.0, 2.0]
+    assert results['b'] == [3.0, 4.5]
+    assert isinstance(results['c'], asyncio.TimeoutError)
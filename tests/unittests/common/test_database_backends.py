@@ -0,0 +1,225 @@
+# pylint: disable=redefined-outer-name,unused-argument
+
+"""This file contains unit tests for PyExpLabSys.common.database_backends"""
+
+import os
+import sqlite3
+from unittest import mock
+import pytest
+
+from PyExpLabSys.common.database_backends import (
+    SQLiteBackend, ParquetBackend, HDF5Backend, ColumnarFileBackend, ConnectionPool
+)
+from PyExpLabSys.common.database_saver import (
+    ContinuousDataSaver, DataSetSaver, CustomColumn
+)
+
+
+### Test data
+SQLITE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS dateplots_descriptions
+    (id INTEGER PRIMARY KEY, codename TEXT UNIQUE);
+INSERT OR IGNORE INTO dateplots_descriptions (id, codename) VALUES (7, 'dummy_sine_one');
+CREATE TABLE IF NOT EXISTS dateplots_dummy
+    (id INTEGER PRIMARY KEY, type INTEGER, time REAL, value REAL);
+CREATE TABLE IF NOT EXISTS measurements_dummy
+    (id INTEGER PRIMARY KEY, time REAL, type INTEGER, comment TEXT);
+CREATE TABLE IF NOT EXISTS xy_values_dummy
+    (id INTEGER PRIMARY KEY, measurement INTEGER, x REAL, y REAL);
+'''
+LOOKUP_TABLES = {'dateplots_descriptions': [{'id': 7, 'codename': 'dummy_sine_one'}]}
+POINTS = [(1000.0 + number, number * 0.5) for number in range(25)]
+
+
+def save_continuous(backend):
+    """Save POINTS with a ContinuousDataSaver using backend"""
+    saver = ContinuousDataSaver(
+        'dateplots_dummy', None, None, ['dummy_sine_one'], batch_max_rows=10,
+        batch_max_latency=0.01, backend=backend,
+    )
+    saver.start()
+    for point in POINTS:
+        saver.save_point('dummy_sine_one', point)
+    saver.stop()
+
+
+def save_data_set(backend):
+    """Save POINTS as a data set with a DataSetSaver using backend"""
+    saver = DataSetSaver('measurements_dummy', 'xy_values_dummy', None, None,
+                         backend=backend)
+    saver.start()
+    metadata = {'time': CustomColumn(1000.0, 'FROM_UNIXTIME(%s)'), 'type': 5,
+                'comment': 'test'}
+    saver.add_measurement('sine', metadata)
+    x_values, y_values = zip(*POINTS)
+    saver.save_points_batch('sine', x_values, y_values, batchsize=10)
+    saver.stop()
+    return saver.measurement_ids['sine']
+
+
+### Tests
+def test_sqlite_translate():
+    """Test translation of queries to the SQLite dialect"""
+    query = 'INSERT INTO t (type, time, value) VALUES (%s, FROM_UNIXTIME(%s), %s);'
+    assert SQLiteBackend.translate(query) == 'INSERT INTO t (type, time, value) VALUES (?, ?, ?);'
+
+
+def test_sqlite_continuous(tmp_path):
+    """Test saving continuous data to SQLite"""
+    path = str(tmp_path / 'data.sqlite')
+    save_continuous(SQLiteBackend(path, schema=SQLITE_SCHEMA))
+    rows = sqlite3.connect(path).execute(
+        'SELECT type, time, value FROM dateplots_dummy ORDER BY id'
+    ).fetchall()
+    assert rows == [(7, time, value) for time, value in POINTS]
+
+
+def test_sqlite_data_set(tmp_path):
+    """Test saving a data set to SQLite"""
+    path = str(tmp_path / 'data.sqlite')
+    measurement_id = save_data_set(SQLiteBackend(path, schema=SQLITE_SCHEMA))
+    connection = sqlite3.connect(path)
+    assert connection.execute('SELECT id, time, type, comment FROM measurements_dummy').fetchall() == [
+        (measurement_id, 1000.0, 5, 'test')
+    ]
+    rows = connection.execute('SELECT measurement, x, y FROM xy_values_dummy ORDER BY id').fetchall()
+    assert rows == [(measurement_id, x, y) for x, y in POINTS]
+
+
+def test_columnar_connection_queries(tmp_path):
+    """Test the queries understood by the columnar file connections"""
+    backend = ColumnarFileBackend(str(tmp_path), lookup_tables=LOOKUP_TABLES)
+    backend._row_count = lambda table: 0  # pylint: disable=protected-access
+    cursor = backend.connect().cursor()
+    cursor.execute('SELECT id FROM dateplots_descriptions WHERE codename=%s', ('dummy_sine_one',))
+    assert cursor.fetchall() == [(7,)]
+    cursor.execute(
+        'INSERT INTO t (type, time, value) VALUES (%s, FROM_UNIXTIME(%s), %s), '
+        '(%s, FROM_UNIXTIME(%s), %s)', [7, 1.0, 2.0, 7, 3.0, 4.0]
+    )
+    assert cursor.lastrowid == 2
+    assert backend._buffers['t'] == {  # pylint: disable=protected-access
+        'type': [7, 7], 'time': [1.0, 3.0], 'value': [2.0, 4.0], 'id': [1, 2]
+    }
+    with pytest.raises(NotImplementedError):
+        cursor.execute('DELETE FROM t')
+
+
+def test_parquet_continuous(tmp_path):
+    """Test saving continuous data to Parquet files in row groups"""
+    parquet = pytest.importorskip('pyarrow.parquet')
+    directory = str(tmp_path)
+    for _ in range(2):
+        save_continuous(ParquetBackend(directory, row_group_size=10,
+                                       lookup_tables=LOOKUP_TABLES))
+    table = parquet.read_table(os.path.join(directory, 'dateplots_dummy'))
+    assert sorted(table.column('id').to_pylist()) == list(range(1, 51))
+    assert sorted(zip(table.column('time').to_pylist(), table.column('value').to_pylist())) \
+        == sorted(POINTS * 2)
+
+
+def test_hdf5_data_set(tmp_path):
+    """Test saving a data set to HDF5 files"""
+    h5py = pytest.importorskip('h5py')
+    measurement_id = save_data_set(HDF5Backend(str(tmp_path), row_group_size=10))
+    with h5py.File(str(tmp_path / 'xy_values_dummy.h5'), 'r') as file_:
+        assert list(file_['measurement'][:]) == [measurement_id] * len(POINTS)
+        assert list(zip(file_['x'][:], file_['y'][:])) == POINTS
+    with h5py.File(str(tmp_path / 'measurements_dummy.h5'), 'r') as file_:
+        assert file_['comment'][0].decode() == 'test'
+
+
+def test_connection_pool_reuse_and_health_check():
+    """Test that the pool reuses healthy connections and replaces unhealthy ones"""
+    backend = mock.MagicMock()
+    pool = ConnectionPool(backend)
+    connection = pool.connect()
+    connection.close()
+    assert pool.connect()._connection is backend.connect.return_value
+    assert (pool.opened, pool.reused) == (1, 1)
+
+    backend.connect.return_value.ping.side_effect = Exception('Gone away')
+    pool.release(backend.connect.return_value)
+    pool.connect()
+    assert (pool.opened, pool.reused) == (2, 1)
+
+
+class FakeConnection(object):
+    """A connection that records rollbacks and closes"""
+
+    def __init__(self, fail_rollback=False):
+        self.fail_rollback = fail_rollback
+        self.calls = []
+
+    def rollback(self):
+        """Record the rollback, or fail"""
+        self.calls.append('rollback')
+        if self.fail_rollback:
+            raise Exception('Lost connection')
+
+    def close(self):
+        """Record the close"""
+        self.calls.append('close')
+
+
+def test_connection_pool_rollback_on_release():
+    """Test that released connections are rolled back and dropped if that fails"""
+    backend = mock.MagicMock()
+    backend.connect.return_value = FakeConnection()
+    pool = ConnectionPool(backend)
+
+    fake = backend.connect.return_value
+    pool.connect().close()
+    assert fake.calls == ['rollback']
+    assert pool._idle == [fake]  # pylint: disable=protected-access
+
+    # Broken on release, so closed and not pooled
+    broken = FakeConnection(True)
+    pool.release(broken)
+    assert broken.calls == ['rollback', 'close']
+    assert pool._idle == [fake]  # pylint: disable=protected-access
+
+
+def test_connection_pool_backoff():
+    """Test the exponential back off after failed connects"""
+    backend = mock.MagicMock()
+    backend.connect.side_effect = Exception('Database is down')
+    pool = ConnectionPool(backend, min_backoff=1.0, max_backoff=3.0)
+    for expected_backoff in (1.0, 2.0, 3.0, 3.0):
+        with pytest.raises(Exception, match='Database is down'):
+            pool.connect()
+        assert pool._backoff == expected_backoff  # pylint: disable=protected-access
+        with pytest.raises(ConnectionError):
+            pool.connect()
+        pool._next_attempt = 0  # pylint: disable=protected-access
+    assert backend.connect.call_count == 4
+
+
+def test_codename_cache(tmp_path):
+    """Test that the codename translations are cached and used when offline"""
+    path = str(tmp_path / 'data.sqlite')
+    cache_path = str(tmp_path / 'codenames.json')
+    backend = SQLiteBackend(path, schema=SQLITE_SCHEMA)
+    saver = ContinuousDataSaver('dateplots_dummy', None, None, ['dummy_sine_one'],
+                                backend=backend, codename_cache_path=cache_path)
+    assert saver.codename_translation == {'dummy_sine_one': 7}
+    with pytest.raises(ValueError):
+        saver.add_continuous_measurement('not_a_codename')
+
+    # Offline, the translations come from the cache
+    offline_backend = mock.MagicMock()
+    offline_backend.connect.side_effect = ConnectionError('Database is down')
+    offline_backend.translate = SQLiteBackend.translate
+    saver = ContinuousDataSaver('dateplots_dummy', None, None, ['dummy_sine_one'],
+                                spool_path=str(tmp_path / 'spool.sqlite'),
+                                backend=offline_backend, codename_cache_path=cache_path)
+    assert saver.codename_translation == {'dummy_sine_one': 7}
+    assert saver.unverified_codenames == {'dummy_sine_one'}
+    assert not saver.reconcile_codenames()
+    with pytest.raises(ValueError):
+        saver.add_continuous_measurement('not_in_cache')
+
+    # Back online, reconcile
+    saver.backend = backend
+    assert saver.reconcile_codenames()
+    assert not saver.unverified_codenames
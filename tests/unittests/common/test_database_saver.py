@@ -0,0 +1,241 @@
+# pylint: disable=no-member,redefined-outer-name,unused-argument,protected-access
+
+"""This file contains unit tests for PyExpLabSys.common.database_saver"""
+
+import time
+from unittest import mock
+import pytest
+from PyExpLabSys import settings
+
+SETTINGS = settings.Settings()
+SETTINGS.sql_server_host = 'localhost'
+SETTINGS.sql_database = 'fake_database'
+
+from PyExpLabSys.common import database_backends
+from PyExpLabSys.common.database_saver import (
+    ContinuousDataSaver,
+    SqlSaver,
+    SqlSpool,
+    coalesce_inserts,
+)
+
+
+### Test data
+CONTINUOUS_QUERY = (
+    'INSERT INTO dateplots_dummy (type, time, value) VALUES (%s, FROM_UNIXTIME(%s), %s);'
+)
+POINT_QUERY = 'INSERT INTO xy_values_dummy (measurement, x, y) values (%s, %s, %s)'
+UPDATE_QUERY = 'UPDATE measurements_dummy SET comment=%s WHERE id=%s'
+
+
+### Fixtures
+@pytest.fixture
+def fake_mysqldb():
+    """Replace MySQLdb in the database_saver module with a mock"""
+    with mock.patch.object(database_backends, 'MySQLdb') as mysqldb, mock.patch.object(
+        database_backends.socket, 'gethostbyname', return_value='127.0.0.1'
+    ), mock.patch.object(database_backends, '_SHARED_POOLS', {}):
+        yield mysqldb
+
+
+### Tests
+def test_coalesce_inserts_same_query():
+    """Test that consecutive single row inserts are coalesced"""
+    elements = [(CONTINUOUS_QUERY, (1, 42.0, 1.0)), (CONTINUOUS_QUERY, (2, 43.0, 2.0))]
+    statements = coalesce_inserts(elements)
+    assert statements == [
+        (
+            'INSERT INTO dateplots_dummy (type, time, value) VALUES '
+            '(%s, FROM_UNIXTIME(%s), %s), (%s, FROM_UNIXTIME(%s), %s)',
+            [1, 42.0, 1.0, 2, 43.0, 2.0],
+        )
+    ]
+
+
+def test_coalesce_inserts_keeps_order():
+    """Test that other queries and single elements are passed through in order"""
+    elements = [
+        (POINT_QUERY, [1, 0.0, 1.0]),
+        (POINT_QUERY, [1, 1.0, 2.0]),
+        (UPDATE_QUERY, ['comment', 1]),
+        (POINT_QUERY, [1, 2.0, 3.0]),
+        (CONTINUOUS_QUERY, (1, 42.0, 1.0)),
+    ]
+    statements = coalesce_inserts(elements)
+    assert [args for _, args in statements] == [
+        [1, 0.0, 1.0, 1, 1.0, 2.0],
+        ['comment', 1],
+        [1, 2.0, 3.0],
+        (1, 42.0, 1.0),
+    ]
+    assert statements[2][0] == POINT_QUERY
+    assert statements[3][0] == CONTINUOUS_QUERY
+
+
+def test_coalesce_inserts_multi_row_query_untouched():
+    """Test that queries that are already multi row inserts are not coalesced"""
+    query = 'INSERT INTO xy_values_dummy (measurement, x, y) values (%s, %s, %s), (%s, %s, %s)'
+    elements = [(query, [1, 0.0, 1.0, 1, 1.0, 2.0])] * 2
+    assert coalesce_inserts(elements) == elements
+
+
+def test_sql_saver_batching_mode(fake_mysqldb):
+    """Test that in batching mode, waiting elements are saved in one commit"""
+    sql_saver = SqlSaver('user', 'password', batch_max_rows=100, batch_max_latency=0.01)
+    for number in range(10):
+        sql_saver.enqueue_query(CONTINUOUS_QUERY, (1, float(number), 2.0))
+    sql_saver.start()
+    sql_saver.stop()
+
+    connection = fake_mysqldb.connect.return_value
+    cursor = connection.cursor.return_value
+    assert cursor.execute.call_count == 1
+    assert len(cursor.execute.call_args[0][1]) == 30
+    assert connection.commit.call_count == 1
+    assert sql_saver.commits == 1
+    assert sql_saver.last_batch_size == 10
+
+
+def test_sql_saver_batching_mode_max_rows(fake_mysqldb):
+    """Test that batches are split at batch_max_rows"""
+    sql_saver = SqlSaver('user', 'password', batch_max_rows=4, batch_max_latency=0.01)
+    for number in range(10):
+        sql_saver.enqueue_query(CONTINUOUS_QUERY, (1, float(number), 2.0))
+    sql_saver.start()
+    sql_saver.stop()
+    assert fake_mysqldb.connect.return_value.commit.call_count == 3
+
+
+def test_sql_saver_default_commits_per_query(fake_mysqldb):
+    """Test that without batching mode, every query is committed by itself"""
+    sql_saver = SqlSaver('user', 'password')
+    for number in range(5):
+        sql_saver.enqueue_query(CONTINUOUS_QUERY, (1, float(number), 2.0))
+    sql_saver.start()
+    sql_saver.stop()
+    assert fake_mysqldb.connect.return_value.commit.call_count == 5
+
+
+def test_sql_saver_releases_connection_on_error(fake_mysqldb):
+    """Test that a connection that failed a query is released before reconnecting"""
+    sql_saver = SqlSaver('user', 'password')
+    cursor = fake_mysqldb.connect.return_value.cursor.return_value
+    cursor.execute.side_effect = [Exception('Lost connection'), None]
+    sql_saver.enqueue_query(CONTINUOUS_QUERY, (1, 42.0, 2.0))
+    with mock.patch('time.sleep'):
+        sql_saver.start()
+        sql_saver.stop()
+
+    assert cursor.execute.call_count == 2
+    # The failed connection went back to the pool and was handed out again
+    assert sql_saver.backend.opened == 1
+    assert sql_saver.backend.reused == 1
+
+
+def test_sql_spool(tmp_path):
+    """Test push, peek and remove on the spool and that it survives re-opening"""
+    path = str(tmp_path / 'spool.sqlite')
+    spool = SqlSpool(path)
+    spool.push([(CONTINUOUS_QUERY, (1, float(number), 2.0)) for number in range(5)])
+    assert spool.depth == 5
+    rows = spool.peek(3)
+    assert [args for _, _, args in rows] == [(1, float(n), 2.0) for n in range(3)]
+    spool.remove(rows[-1][0])
+    spool.close()
+
+    spool = SqlSpool(path)
+    assert spool.depth == 2
+    assert [args[1] for _, _, args in spool.peek(10)] == [3.0, 4.0]
+    spool.close()
+
+
+def test_sql_spool_dead_letter(tmp_path):
+    """Test that a dead lettered element is moved out of the spool"""
+    spool = SqlSpool(str(tmp_path / 'spool.sqlite'))
+    spool.push([(CONTINUOUS_QUERY, (1, float(number), 2.0)) for number in range(3)])
+    spool.dead_letter(spool.peek(1)[0][0], 'Syntax error')
+    assert spool.depth == 2
+    assert [args[1] for _, _, args in spool.peek(10)] == [1.0, 2.0]
+    assert spool.dead_letters() == [
+        (1, CONTINUOUS_QUERY, (1, 0.0, 2.0), 'Syntax error')
+    ]
+    spool.close()
+
+
+def test_sql_saver_spools_and_replays(fake_mysqldb, tmp_path):
+    """Test that queries are spooled while the database is down and replayed after"""
+    path = str(tmp_path / 'spool.sqlite')
+    fake_mysqldb.connect.side_effect = Exception('Database is down')
+    sql_saver = SqlSaver('user', 'password', spool_path=path)
+    for number in range(5):
+        sql_saver.enqueue_query(CONTINUOUS_QUERY, (1, float(number), 2.0))
+    sql_saver.start()
+    sql_saver.stop()
+    assert fake_mysqldb.connect.return_value.commit.call_count == 0
+    assert SqlSpool(path).depth == 5
+
+    # Restart with the database up (and a new pool, that does not back off), the
+    # spool is replayed
+    fake_mysqldb.connect.side_effect = None
+    database_backends._SHARED_POOLS.clear()
+    sql_saver = SqlSaver('user', 'password', spool_path=path)
+    sql_saver.enqueue_query(CONTINUOUS_QUERY, (1, 5.0, 2.0))
+    sql_saver.start()
+    sql_saver.stop()
+    cursor = fake_mysqldb.connect.return_value.cursor.return_value
+    saved = [call[0][1] for call in cursor.execute.call_args_list]
+    assert saved == [[1, 0.0, 2.0, 1, 1.0, 2.0, 1, 2.0, 2.0, 1, 3.0, 2.0, 1, 4.0, 2.0],
+                     (1, 5.0, 2.0)]
+    assert sql_saver.replayed == 5
+    assert sql_saver.spool_depth == 0
+
+
+def test_continuous_data_saver_no_codenames(fake_mysqldb):
+    """Test that adding an empty list of codenames does not query the database"""
+    saver = ContinuousDataSaver(
+        'dateplots_dummy', 'user', 'password', measurement_codenames=[]
+    )
+    assert saver.codename_translation == {}
+    assert not fake_mysqldb.connect.return_value.cursor.return_value.execute.called
+
+
+def test_sql_saver_dead_letters_poison_query(fake_mysqldb, tmp_path):
+    """Test that a spooled query that keeps failing does not block the replay"""
+    path = str(tmp_path / 'spool.sqlite')
+    spool = SqlSpool(path)
+    spool.push(
+        [
+            (CONTINUOUS_QUERY, (1, 0.0, 2.0)),
+            (CONTINUOUS_QUERY, (1, 1.0, 'poison')),
+            (CONTINUOUS_QUERY, (1, 2.0, 2.0)),
+        ]
+    )
+    spool.close()
+
+    def execute(query, args):
+        """Fail on the poison query, like on a syntax error"""
+        if 'poison' in args:
+            raise Exception('Syntax error')
+
+    cursor = fake_mysqldb.connect.return_value.cursor.return_value
+    cursor.execute.side_effect = execute
+    sql_saver = SqlSaver('user', 'password', spool_path=path)
+    sql_saver.reconnect_interval = 0
+    sql_saver.start()
+    for _ in range(500):
+        if sql_saver.spool_depth == 0:
+            break
+        time.sleep(0.01)
+    sql_saver.stop()
+
+    assert sql_saver.dead_lettered == 1
+    assert sql_saver.replayed == 2
+    saved = [call[0][1] for call in cursor.execute.call_args_list]
+    # The chunk fails max_replay_attempts times, then the queries are replayed one by
+    # one and the remaining query after the poison query in a new chunk
+    assert len(saved) == sql_saver.max_replay_attempts + 3
+    assert saved[-3:] == [(1, 0.0, 2.0), (1, 1.0, 'poison'), (1, 2.0, 2.0)]
+    spool = SqlSpool(path)
+    assert spool.depth == 0
+    assert [args for _, _, args, _ in spool.dead_letters()] == [(1, 1.0, 'poison')]
+    spool.close()
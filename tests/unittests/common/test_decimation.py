@@ -0,0 +1,76 @@
+"""This file contains unit tests for PyExpLabSys.common.decimation"""
+
+import numpy
+import pytest
+
+from PyExpLabSys.common.decimation import (
+    minmax_indices, lttb_indices, stride_indices, decimate_indices, decimate
+)
+
+
+### Test data
+X = numpy.linspace(0, 100, 10001)
+Y = numpy.sin(X)
+# A single point spike
+Y_SPIKE = Y.copy()
+Y_SPIKE[4321] = 10.0
+
+
+### Tests
+def test_minmax_keeps_envelope():
+    """Test that the min/max decimation keeps the extremes and the spike"""
+    indices = minmax_indices(Y_SPIKE, 100)
+    assert len(indices) <= 202
+    assert indices[0] == 0 and indices[-1] == len(Y) - 1
+    assert numpy.all(numpy.diff(indices) > 0)
+    assert 4321 in indices
+    assert Y_SPIKE[indices].min() == Y_SPIKE.min()
+
+
+def test_minmax_x_buckets_and_nan():
+    """Test buckets in x for unevenly sampled data and that NaN are ignored"""
+    x = numpy.concatenate((numpy.linspace(0, 1, 1000), numpy.linspace(2, 3, 10)))
+    y = numpy.arange(1010, dtype=float)
+    y[500] = numpy.nan
+    indices = minmax_indices(y, 10, x)
+    # The sparse second half has buckets of its own
+    assert numpy.sum(indices >= 1000) >= 5
+    assert 500 not in indices
+    # All NaN bucket
+    y[:] = numpy.nan
+    assert len(minmax_indices(y, 10)) <= 22
+
+
+def test_lttb():
+    """Test that LTTB returns threshold points and keeps the spike"""
+    indices = lttb_indices(Y_SPIKE, 200, X)
+    assert len(indices) == 200
+    assert indices[0] == 0 and indices[-1] == len(Y) - 1
+    assert numpy.all(numpy.diff(indices) > 0)
+    assert 4321 in indices
+    assert numpy.array_equal(lttb_indices(Y, 20000), numpy.arange(len(Y)))
+
+
+def test_stride():
+    """Test the evenly spread indices"""
+    assert stride_indices(100, 3).tolist() == [0, 50, 99]
+    assert stride_indices(100, 1).tolist() == [99]
+    assert stride_indices(100, 0).tolist() == []
+    assert stride_indices(3, 10).tolist() == [0, 1, 2]
+
+
+@pytest.mark.parametrize('method', ['minmax', 'lttb', 'stride'])
+def test_decimate(method):
+    """Test that decimate respects max_points for all methods"""
+    for max_points in (1, 3, 4, 100, 999):
+        x_out, y_out = decimate(X, Y, max_points, method=method)
+        assert len(x_out) == len(y_out) <= max_points
+        assert x_out[-1] == X[-1]
+    x_out, y_out = decimate(X[:10], Y[:10], 100, method=method)
+    assert numpy.array_equal(x_out, X[:10])
+
+
+def test_decimate_indices_unknown_method():
+    """Test that decimate_indices raises on unknown methods"""
+    with pytest.raises(ValueError):
+        decimate_indices(Y, 10, method='fft')
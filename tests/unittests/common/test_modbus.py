@@ -0,0 +1,117 @@
+# pylint: disable=protected-access
+
+"""This file contains unit tests for PyExpLabSys.common.modbus"""
+
+import struct
+from unittest import mock
+import pytest
+
+from PyExpLabSys.common.modbus import (
+    Register, RegisterMap, ModbusBus, plan_block_reads, instrument_read_block,
+    registers_to_bytes, int16, uint16, int32, float32, string, boolean, scaled,
+    converted,
+)
+
+
+### Test data
+REGISTERS = {
+    'level': Register(10, 1, scaled(int16, 1)),
+    'status': Register(11, 1, uint16),
+    'flow': Register(20, 2, float32),
+    'serial': Register(100, 4, string, static=True),
+}
+
+
+def fake_read_block(start, count):
+    """Return registers, where the value of each register is its address"""
+    return registers_to_bytes(list(range(start, start + count)))
+
+
+### Tests
+@pytest.mark.parametrize(
+    'spans,kwargs,expected',
+    [
+        ([], {}, []),
+        ([(10, 1), (11, 1), (20, 2)], {}, [(10, 12)]),
+        ([(20, 2), (10, 1), (11, 1)], {'max_gap': 0}, [(10, 2), (20, 2)]),
+        ([(10, 1), (10, 1), (10, 2)], {}, [(10, 2)]),
+        ([(0, 2), (4, 2), (8, 2)], {'max_registers': 6}, [(0, 6), (8, 2)]),
+    ],
+)
+def test_plan_block_reads(spans, kwargs, expected):
+    """Test the planning of block reads"""
+    assert plan_block_reads(spans, **kwargs) == expected
+
+
+def test_plan_block_reads_too_long_span():
+    """Test that a span longer than the maximum read raises ValueError"""
+    with pytest.raises(ValueError):
+        plan_block_reads([(0, 126)])
+
+
+def test_decoders():
+    """Test the decoders"""
+    assert uint16(b'\xff\xfe') == 65534
+    assert int16(b'\xff\xfe') == -2
+    assert int32(b'\xff\xff\xff\xfe') == -2
+    assert float32(struct.pack('>f', 1.5)) == 1.5
+    assert string(b'AB12') == 'AB12'
+    assert scaled(int16, 3)(b'\x04\xd2') == 1.234
+    assert converted(uint16, hex)(b'\x00\x10') == '0x10'
+    assert boolean(b'\x00\x00') is False
+    assert boolean(b'\xff\xff') is True
+    with pytest.raises(ValueError):
+        boolean(b'\x00\x01')
+
+
+def test_instrument_read_block():
+    """Test the read block function for minimalmodbus instruments"""
+    instrument = mock.MagicMock()
+    instrument.read_registers.return_value = [1, 2]
+    read_block = instrument_read_block(instrument, functioncode=4)
+    assert read_block(10, 2) == b'\x00\x01\x00\x02'
+    instrument.read_registers.assert_called_once_with(10, 2, functioncode=4)
+
+
+def test_register_map_read():
+    """Test reading and decoding of values from block reads"""
+    read_block = mock.MagicMock(side_effect=fake_read_block)
+    register_map = RegisterMap(REGISTERS, read_block)
+    values = register_map.read(['level', 'status', 'flow'])
+    assert values['level'] == 1.0
+    assert values['status'] == 11
+    assert values['flow'] == struct.unpack('>f', registers_to_bytes([20, 21]))[0]
+    read_block.assert_called_once_with(10, 12)
+    assert [timing[:2] for timing in register_map.timings] == [(10, 12)]
+
+    with pytest.raises(KeyError):
+        register_map.read(['not_a_register'])
+
+
+def test_register_map_static_values():
+    """Test that static values are only read once, until invalidated"""
+    read_block = mock.MagicMock(side_effect=fake_read_block)
+    register_map = RegisterMap(REGISTERS, read_block, max_gap=0)
+    first = register_map.read()
+    assert read_block.call_count == 3
+    assert first['serial'] == registers_to_bytes([100, 101, 102, 103]).decode('latin1')
+
+    read_block.reset_mock()
+    assert register_map.read() == first
+    assert sorted(call[0] for call in read_block.call_args_list) == [(10, 2), (20, 2)]
+
+    register_map.invalidate(['serial'])
+    read_block.reset_mock()
+    register_map.read(['serial'])
+    read_block.assert_called_once_with(100, 4)
+
+
+def test_modbus_bus():
+    """Test reading several slaves on one bus"""
+    bus = ModbusBus()
+    for name in ('a', 'b'):
+        bus.add_slave(name, RegisterMap(REGISTERS, fake_read_block))
+    values = bus.read_all()
+    assert sorted(values) == ['a', 'b']
+    assert values['a']['status'] == 11
+    assert bus.read_all({'b': ['status']}) == {'b': {'status': 11}}
@@ -0,0 +1,61 @@
+# pylint: disable=redefined-outer-name,protected-access
+
+"""This file contains unit tests for PyExpLabSys.common.plotters"""
+
+from unittest import mock
+import numpy
+import pytest
+
+from PyExpLabSys.common.plotters import CircularSeries, ContinuousPlotter
+
+
+### Tests
+def test_circular_series_wrap_and_trim():
+    """Test that the points stay contiguous and ordered when the storage wraps"""
+    series = CircularSeries(5)
+    assert series.points.shape == (0, 2)
+    for number in range(12):
+        series.append(float(number), 10.0 * number)
+    assert len(series) == 5
+    assert series.x.tolist() == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert series.y.tolist() == [70.0, 80.0, 90.0, 100.0, 110.0]
+    # The points are a view, not a copy
+    assert series.points.base is series._storage
+
+    series.trim(8.5)
+    assert series.x.tolist() == [9.0, 10.0, 11.0]
+    series.append(12.0, 120.0)
+    assert series.x.tolist() == [9.0, 10.0, 11.0, 12.0]
+    series.trim(100.0)
+    assert len(series) == 0
+    series.clear()
+    assert len(series) == 0
+
+    with pytest.raises(ValueError):
+        CircularSeries(0)
+
+
+def test_continuous_plotter():
+    """Test adding points and moving the window of the continuous plotter"""
+    with mock.patch('time.time', return_value=1000.0):
+        plotter = ContinuousPlotter(['left'], right_plotlist=['right'], timespan=10,
+                                    preload=2, capacity=100)
+    assert (plotter.start, plotter.end) == (1000.0, 1010.0)
+    for number in range(15):
+        with mock.patch('time.time', return_value=1000.0 + number):
+            plotter.add_point_now('left', number)
+    assert (plotter.start, plotter.end) == (1006.0, 1016.0)
+    assert plotter.data['left'][:, 0].tolist() == [1000.0 + number for number in range(7, 15)]
+    assert len(plotter.data['right']) == 0
+
+    plotter.data = {'right': [(1.0, 2.0), (3.0, 4.0)]}
+    assert numpy.array_equal(plotter.data['right'], [[1.0, 2.0], [3.0, 4.0]])
+
+
+def test_continuous_plotter_checks():
+    """Test the input checks of the continuous plotter"""
+    for kwargs in ({'timespan': 0}, {'preload': -1}, {'backend': 'qwt'}, {'capacity': 0}):
+        with pytest.raises(ValueError):
+            ContinuousPlotter(['left'], **kwargs)
+    with pytest.raises(ValueError):
+        ContinuousPlotter(['left'], right_plotlist=['left'])
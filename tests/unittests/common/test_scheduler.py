@@ -0,0 +1,82 @@
+# pylint: disable=redefined-outer-name
+
+"""This file contains unit tests for PyExpLabSys.common.scheduler"""
+
+import time
+import pytest
+
+from PyExpLabSys.common.scheduler import Scheduler, Task
+
+
+### Fixtures
+@pytest.fixture
+def scheduler():
+    """Return a started scheduler, that is stopped after the test"""
+    scheduler = Scheduler()
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+
+
+### Tests
+def test_task_overrun_skips_missed_runs():
+    """Test that a run that overruns skips the missed deadlines"""
+    task = Task('slow', lambda: time.sleep(0.035), 0.01, time.time())
+    task.run(time.time())
+    statistics = task.statistics()
+    assert (statistics['runs'], statistics['overruns'], statistics['skipped']) == (1, 1, 3)
+    assert task.deadline > time.time()
+    assert statistics['max_duration'] >= 0.035
+
+
+def test_task_errors_are_counted():
+    """Test that exceptions in the task function are counted, not raised"""
+    task = Task('failing', lambda: 1 / 0, 1.0, time.time())
+    task.run(time.time())
+    assert task.statistics()['errors'] == 1
+
+
+def test_add_task_errors(scheduler):
+    """Test the errors from add_task"""
+    scheduler.add_task('task', lambda: None, 1.0)
+    with pytest.raises(ValueError):
+        scheduler.add_task('task', lambda: None, 1.0)
+    with pytest.raises(ValueError):
+        scheduler.add_task('other', lambda: None, 0)
+
+
+def test_periodic_tasks(scheduler):
+    """Test that tasks with different periods run at their own rates"""
+    calls = {'fast': 0, 'slow': 0}
+
+    def make_function(name):
+        """Return a function that counts calls for name"""
+        def function():
+            """Count a call"""
+            calls[name] += 1
+        return function
+
+    scheduler.add_task('fast', make_function('fast'), 0.01)
+    scheduler.add_task('slow', make_function('slow'), 0.05, offset=0.01)
+    time.sleep(0.3)
+    assert 20 <= calls['fast'] <= 32
+    assert 4 <= calls['slow'] <= 7
+    statistics = scheduler.statistics()
+    assert statistics['fast']['runs'] == calls['fast']
+    assert statistics['fast']['overruns'] == 0
+    assert 0 <= statistics['fast']['mean_jitter'] < 0.01
+
+
+def test_cancel_and_remove(scheduler):
+    """Test that cancelled and removed tasks are no longer run"""
+    calls = []
+    task = scheduler.add_task('cancelled', lambda: (calls.append(1), task.cancel()), 0.01)
+    scheduler.add_task('removed', lambda: calls.append(2), 0.01)
+    time.sleep(0.05)
+    scheduler.remove_task('removed')
+    number_of_calls = len(calls)
+    time.sleep(0.05)
+    assert calls.count(1) == 1
+    assert len(calls) == number_of_calls
+    with pytest.raises(KeyError):
+        scheduler.remove_task('removed')
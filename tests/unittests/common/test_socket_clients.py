@@ -0,0 +1,101 @@
+# pylint: disable=redefined-outer-name,unused-argument
+
+"""This file contains unit tests for PyExpLabSys.common.socket_clients"""
+
+import pytest
+from PyExpLabSys import settings
+
+SETTINGS = settings.Settings()
+SETTINGS.util_log_warning_email = "fake@non.com"
+SETTINGS.util_log_error_email = "fake@non.com"
+SETTINGS.util_log_mail_host = "non.com"
+
+from PyExpLabSys.common import sockets
+from PyExpLabSys.common.sockets import DateDataPullSocket
+from PyExpLabSys.common.socket_clients import DateDataPullClient, unpack_bin
+
+
+### Test data
+NAME = 'my_socket'
+CODENAMES = ['first', 'second', 'third']
+PORT = 19100
+
+
+### Fixtures
+@pytest.fixture
+def pull_socket():
+    """A running DateDataPullSocket"""
+    old_data = sockets.DATA
+    sockets.DATA = {}
+    socket_ = DateDataPullSocket(NAME, CODENAMES, port=PORT, timeouts=[None, None, 1.0])
+    socket_.start()
+    yield socket_
+    socket_.stop()
+    sockets.DATA = old_data
+
+
+### Tests
+def test_unpack_bin_errors():
+    """Test that unpack_bin raises on data that is not in the binary format"""
+    with pytest.raises(ValueError):
+        unpack_bin(b'1.0,2.0')
+    with pytest.raises(ValueError):
+        unpack_bin(b'XXXX\x00\x00')
+    with pytest.raises(ValueError):
+        unpack_bin(sockets.pack_bin([0], [(1.0, 2.0)]))
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_client(pull_socket, binary):
+    """Test that the client gets the same data with json and binary"""
+    pull_socket.set_point('first', (1.0, 2.0))
+    pull_socket.set_point('second', (3.0, 4.5))
+    client = DateDataPullClient('127.0.0.1', NAME, port=PORT, timeout=2, binary=binary)
+    assert client.codenames == CODENAMES
+    assert client.get_field('second') == [3.0, 4.5]
+    assert client.first == [1.0, 2.0]
+
+    # The third point has the default time 0.0 and has timed out
+    with pytest.raises(ValueError):
+        client.get_all_fields()
+    client.exception_on_old_data = False
+    assert client.get_all_fields() == {
+        'first': [1.0, 2.0], 'second': [3.0, 4.5], 'third': 'OLD_DATA'
+    }
+
+
+def test_get_many(pull_socket):
+    """Test getting several fields with one request"""
+    pull_socket.set_point('first', (1.0, 2.0))
+    pull_socket.set_point('second', (3.0, 4.5))
+    client = DateDataPullClient('127.0.0.1', NAME, port=PORT, timeout=2)
+    assert client.get_many(['second', 'first']) == {
+        'first': [1.0, 2.0], 'second': [3.0, 4.5]
+    }
+    with pytest.raises(ValueError):
+        client.get_many(['first', 'not_a_codename'])
+    with pytest.raises(ValueError):
+        client.get_many(['first', 'third'])
+
+
+def test_get_history():
+    """Test getting the point history in several replies"""
+    old_data = sockets.DATA
+    sockets.DATA = {}
+    socket_ = DateDataPullSocket(NAME, CODENAMES, port=PORT + 1, history=3000)
+    socket_.start()
+    try:
+        for number in range(2500):
+            socket_.set_point('first', (float(number), number * 0.5))
+        client = DateDataPullClient('127.0.0.1', NAME, port=PORT + 1, timeout=2)
+        points = client.get_history('first')
+        assert points == [[float(number), number * 0.5] for number in range(2500)]
+        assert client.get_history('first', since=2497.0) == [[2498.0, 1249.0], [2499.0, 1249.5]]
+        assert len(client.get_history('first', max_points=100, method='stride')) == 100
+        assert client.get_history('first', method='lttb') == points
+        assert client.get_history('second') == []
+        with pytest.raises(ValueError):
+            client.get_history('not_a_codename')
+    finally:
+        socket_.stop()
+        sockets.DATA = old_data
@@ -25,6 +25,7 @@ from PyExpLabSys.common.sockets import (
     bool_translate, socket_server_status, PullUDPHandler, CommonDataPullSocket, DataPullSocket,
     DateDataPullSocket, PushUDPHandler, DataPushSocket, CallBackThread
 )
+from PyExpLabSys.common.socket_clients import unpack_bin
 from PyExpLabSys.common.supported_versions import python2_and_3
 python2_and_3(__file__)
 
@@ -189,6 +190,95 @@ def test_socket_server_status():
     sockets.DATA = old_data
 
 
+def test_make_server_unknown_type():
+    """Test that make_server raises on an unknown server type"""
+    with pytest.raises(ValueError):
+        sockets.make_server(PORT, PullUDPHandler, 'forking')
+
+
+def udp_request(port, request):
+    """Send request to the socket server on localhost:port and return the reply"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(2)
+    try:
+        sock.sendto(request, ('127.0.0.1', port))
+        return sock.recvfrom(1024)[0]
+    finally:
+        sock.close()
+
+
+@pytest.mark.parametrize('server_type', ['udp', 'threading', 'asyncio'])
+def test_server_types(clean_data, server_type):
+    """Test pull and push socket servers of the different server types over the network"""
+    port = 19000 + 10 * sockets.SERVER_TYPES.index(server_type)
+    pull_socket = DateDataPullSocket(NAME, CODENAMES, port=port, server_type=server_type)
+    pull_socket.start()
+    push_socket = DataPushSocket(NAME, port=port + 1, action='callback_direct',
+                                 callback=lambda data: data['meas1'] * 2,
+                                 server_type=server_type)
+    push_socket.start()
+    try:
+        pull_socket.set_point(FIRTS_MEASUREMENT_NAME, (1.0, 2.0))
+        assert udp_request(port, b'raw') == b'1.0,2.0;0.0,0.0'
+        assert udp_request(port, b'name') == NAME.encode('ascii')
+        assert udp_request(port + 1, b'json_wn#{"meas1": 21}') == b'RET#42'
+    finally:
+        pull_socket.stop()
+        push_socket.stop()
+
+
+def test_history_buffer():
+    """Test the ring buffer of the point history"""
+    buffer_ = sockets.HistoryBuffer(4)
+    assert buffer_.get().shape == (0, 2)
+    for number in range(6):
+        buffer_.append((float(number), number * 10.0))
+    assert buffer_.get().tolist() == [[2.0, 20.0], [3.0, 30.0], [4.0, 40.0], [5.0, 50.0]]
+    assert buffer_.get(since=3.0).tolist() == [[4.0, 40.0], [5.0, 50.0]]
+    buffer_.append((6.0, 'not a number'))
+    assert buffer_.get(since=5.0)[0, 0] == 6.0
+    assert buffer_.get(since=5.0)[0, 1] != buffer_.get(since=5.0)[0, 1]  # NaN
+
+
+def test_history_command(clean_data, udp_server):
+    """Test the codename#history command"""
+    pull_socket = DateDataPullSocket(NAME, CODENAMES, port=PORT,
+                                     history={FIRTS_MEASUREMENT_NAME: 5000})
+    for number in range(2500):
+        pull_socket.set_point(FIRTS_MEASUREMENT_NAME, (float(number), 2.0 * number))
+    pull_socket.set_point(SECOND_MEASUREMENT_NAME, (1.0, 1.0))
+    with mock.patch(SOCKETS_PATH.format('PullUDPHandler.handle')):
+        handler = PullUDPHandler((b'', mock.MagicMock()), CLIENT_ADDRESS, mock.MagicMock())
+    handler.port = PORT
+
+    # Paged replies
+    reply = json.loads(handler._single_value(FIRTS_MEASUREMENT_NAME + '#history'))
+    assert reply['more']
+    assert len(reply['points']) == sockets.HISTORY_MAX_POINTS
+    assert reply['points'][0] == [0.0, 0.0]
+    reply = json.loads(handler._single_value(FIRTS_MEASUREMENT_NAME + '#history:2000.0'))
+    assert not reply['more']
+    assert reply['points'][0] == [2001.0, 4002.0]
+    assert len(reply['points']) == 499
+
+    # Decimated
+    reply = json.loads(handler._single_value(FIRTS_MEASUREMENT_NAME + '#history::50'))
+    assert len(reply['points']) <= 50
+    assert reply['points'][-1] == [2499.0, 4998.0]
+    reply = json.loads(handler._single_value(FIRTS_MEASUREMENT_NAME + '#history::50:lttb'))
+    assert len(reply['points']) == 50
+
+    # Errors
+    for command in ('#history:a', '#history:1:2:3:4', '#history:1.0:a', '#history::5:fft'):
+        assert handler._single_value(FIRTS_MEASUREMENT_NAME + command) == \
+            sockets.UNKNOWN_COMMAND
+    assert handler._single_value(SECOND_MEASUREMENT_NAME + '#history') == \
+        sockets.UNKNOWN_COMMAND
+
+    with pytest.raises(ValueError):
+        DateDataPullSocket(NAME, CODENAMES, port=PORT + 1, history={'unknown': 10})
+
+
 class TestPullUDPHandler(object):
     """Test the PullUDPHandler"""
 
@@ -309,6 +399,28 @@ class TestPullUDPHandler(object):
             calls = [mock.call(FIRTS_MEASUREMENT_NAME), mock.call(SECOND_MEASUREMENT_NAME)]
             _old_data.assert_has_calls(calls)
 
+    def test_all_bin(self, pull_udp_handler, sockets_data_all):
+        """Test the _all_values bin and bin_wn cases"""
+        with mock.patch(SOCKETS_PATH.format('PullUDPHandler._old_data')) as _old_data:
+            _old_data.side_effect = [False, True]
+            data = pull_udp_handler._all_values('bin')
+            assert data == sockets.pack_bin([0, 1 | sockets.BIN_OLD_FLAG],
+                                            [(42.0, 47.0), (float('nan'), float('nan'))])
+            assert unpack_bin(data, CODENAMES) == [
+                (FIRTS_MEASUREMENT_NAME, [42.0, 47.0]), (SECOND_MEASUREMENT_NAME, 'OLD_DATA')
+            ]
+
+            _old_data.side_effect = [False, False]
+            data = pull_udp_handler._all_values('bin_wn')
+            assert data.startswith(sockets.BIN_WN_MAGIC)
+            assert unpack_bin(data) == [
+                (FIRTS_MEASUREMENT_NAME, [42.0, 47.0]), (SECOND_MEASUREMENT_NAME, [17.0, 1.0])
+            ]
+
+            _old_data.side_effect = [False]
+            data = pull_udp_handler._single_value(SECOND_MEASUREMENT_NAME + '#bin')
+            assert unpack_bin(data, CODENAMES) == [(SECOND_MEASUREMENT_NAME, [17.0, 1.0])]
+
     def test_all_codenames_raw(self, pull_udp_handler, sockets_data_all):
         """Test the _all_values codenames raw case"""
         expected = FIRTS_MEASUREMENT_NAME + ',' + SECOND_MEASUREMENT_NAME
@@ -327,7 +439,7 @@ class TestPullUDPHandler(object):
         """Test the _all_values name case"""
         # Set up mocks for SYSTEM_STATUS and socket_server_status
         with mock.patch('PyExpLabSys.common.sockets.SYSTEM_STATUS') as system_status:
-            system_status.complete_status.return_value = 1
+            system_status.complete_status_json.return_value = '1'
             with mock.patch('PyExpLabSys.common.sockets.socket_server_status') as\
                  socket_server_status:
                 socket_server_status.return_value = 2
@@ -340,6 +452,42 @@ class TestPullUDPHandler(object):
         """Test the all invalid command case"""
         assert pull_udp_handler._all_values('invalid_command') == sockets.UNKNOWN_COMMAND
 
+    def test_response_cache(self, pull_udp_handler, clean_data, udp_server):
+        """Test that responses are cached until the next set_point"""
+        sock = DateDataPullSocket(NAME, CODENAMES, port=PORT)
+        sock.set_point(FIRTS_MEASUREMENT_NAME, (42.0, 47.0))
+        with mock.patch(SOCKETS_PATH.format('PullUDPHandler._all_values'),
+                        wraps=pull_udp_handler._all_values) as _all_values:
+            assert pull_udp_handler._response('raw') == b'42.0,47.0;0.0,0.0'
+            assert pull_udp_handler._response('raw') == b'42.0,47.0;0.0,0.0'
+            assert _all_values.call_count == 1
+            assert clean_data[PORT]['cache']['raw'] == (b'42.0,47.0;0.0,0.0', float('inf'))
+
+            sock.set_point(SECOND_MEASUREMENT_NAME, (17.0, 1.0))
+            assert pull_udp_handler._response('raw') == b'42.0,47.0;17.0,1.0'
+            assert _all_values.call_count == 2
+
+            # Unknown commands and status are not cached
+            pull_udp_handler._response('invalid_command')
+            assert 'invalid_command' not in clean_data[PORT]['cache']
+            with mock.patch(SOCKETS_PATH.format('SYSTEM_STATUS')) as system_status:
+                system_status.complete_status_json.return_value = '{}'
+                pull_udp_handler._response('status')
+            assert 'status' not in clean_data[PORT]['cache']
+
+    def test_response_cache_timeout(self, pull_udp_handler, clean_data, udp_server):
+        """Test that cached responses expire when the first point times out"""
+        sock = DataPullSocket(NAME, CODENAMES, port=PORT, timeouts=[10.0, 20.0])
+        now = time.time()
+        sock.set_point(FIRTS_MEASUREMENT_NAME, (1.0, 2.0), timestamp=now)
+        sock.set_point(SECOND_MEASUREMENT_NAME, (3.0, 4.0), timestamp=now)
+        assert pull_udp_handler._response('json') == b'[[1.0, 2.0], [3.0, 4.0]]'
+        assert clean_data[PORT]['cache']['json'][1] == now + 10.0
+
+        with mock.patch('time.time', return_value=now + 15.0):
+            assert pull_udp_handler._response('json') == b'[\"OLD_DATA\", [3.0, 4.0]]'
+        assert clean_data[PORT]['cache']['json'][1] == now + 20.0
+
     def test_old_data_with_date_data(self, pull_udp_handler, sockets_data_single):
         """Test the _old_date date data true case"""
         sockets_data_single[PORT]['type'] = 'date'
@@ -555,7 +703,8 @@ class TestDataPullSocket(object):
         assert trace_init.call_spec[1] == {
             'port':9010, 'default_x': 0.0,
             'default_y' :0.0, 'timeouts': None,
-            'check_activity': True, 'activity_timeout': 900
+            'check_activity': True, 'activity_timeout': 900, 'server_type': 'udp',
+            'history': None
         }
 
         # With other key word arguments
@@ -565,7 +714,8 @@ class TestDataPullSocket(object):
         assert trace_init.call_spec[1] == {
             'port':1234, 'default_x': 56.0,
             'default_y' :7.7, 'timeouts': 9.0,
-            'check_activity': False, 'activity_timeout': 180
+            'check_activity': False, 'activity_timeout': 180, 'server_type': 'udp',
+            'history': None
         }
 
         # Revert monkey patch
@@ -632,7 +782,8 @@ class TestDateDataPullSocket(object):
         assert trace_init.call_spec[1] == {
             'port':9000, 'default_x': 0.0,
             'default_y' :0.0, 'timeouts': None,
-            'check_activity': True, 'activity_timeout': 900
+            'check_activity': True, 'activity_timeout': 900, 'server_type': 'udp',
+            'history': None
         }
 
         # With other key word arguments
@@ -642,7 +793,8 @@ class TestDateDataPullSocket(object):
         assert trace_init.call_spec[1] == {
             'port':1234, 'default_x': 56.0,
             'default_y' :7.7, 'timeouts': 9.0,
-            'check_activity': False, 'activity_timeout': 180
+            'check_activity': False, 'activity_timeout': 180, 'server_type': 'udp',
+            'history': None
         }
 
         # Revert monkey patch
@@ -742,7 +894,7 @@ class TestPushUDPHandler(object):
 
         # Set up mocks for SYSTEM_STATUS and socket_server_status
         with mock.patch(SOCKETS_PATH.format('SYSTEM_STATUS')) as system_status:
-            system_status.complete_status.return_value = 1
+            system_status.complete_status_json.return_value = '1'
             with mock.patch(SOCKETS_PATH.format('socket_server_status')) as\
                  socket_server_status:
                 socket_server_status.return_value = 2
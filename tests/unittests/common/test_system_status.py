@@ -0,0 +1,91 @@
+# pylint: disable=protected-access
+
+"""This file contains unit tests for PyExpLabSys.common.system_status"""
+
+import json
+import time
+from unittest import mock
+
+from PyExpLabSys.common.system_status import SystemStatus, STATIC
+
+
+### Tests
+def test_ttls():
+    """Test that the items have the time to live they are decorated with and that it
+    can be overridden
+    """
+    system_status = SystemStatus(machinename='machine')
+    assert system_status.ttls['python_version'] == STATIC
+    assert system_status.ttls['number_of_python_threads'] == 5.0
+    system_status = SystemStatus(machinename='machine', ttls={'python_version': 1.0})
+    assert system_status.ttls['python_version'] == 1.0
+
+
+def test_items_are_cached_for_their_ttl():
+    """Test that an item is only measured again when it has expired"""
+    system_status = SystemStatus(machinename='machine')
+    system_status.ttls['python_version'] = 10.0
+    with mock.patch.object(SystemStatus, 'python_version', return_value='3.0.0') as method:
+        method.__name__ = 'python_version'
+        system_status.methods_on_this_platform = [method]
+        with mock.patch('time.time', return_value=1000.0):
+            assert system_status.complete_status() == {'python_version': '3.0.0'}
+            assert system_status.complete_status() == {'python_version': '3.0.0'}
+        assert method.call_count == 1
+
+        method.return_value = '3.1.0'
+        with mock.patch('time.time', return_value=1010.0):
+            assert system_status.complete_status() == {'python_version': '3.1.0'}
+        assert method.call_count == 2
+
+
+def test_complete_status_json_snapshot():
+    """Test that the json snapshot is only formed again when an item changes"""
+    system_status = SystemStatus(machinename='machine', ttls={'number_of_python_threads': 0.0})
+    snapshot = system_status.complete_status_json()
+    assert json.loads(snapshot) == system_status.complete_status()
+    with mock.patch('json.dumps') as dumps:
+        assert system_status.complete_status_json() is snapshot
+        assert not dumps.called
+
+    with mock.patch('threading.activeCount', return_value=1000):
+        assert json.loads(system_status.complete_status_json())['number_of_python_threads'] \
+            == 1000
+
+
+def test_refresh_thread():
+    """Test that the background refresh measures the expired items"""
+    system_status = SystemStatus(machinename='machine', ttls={'number_of_python_threads': 0.0})
+    with mock.patch.object(system_status, '_status') as status:
+        system_status.start_refresh(0.01)
+        system_status.start_refresh(0.01)
+        time.sleep(0.1)
+        system_status.stop_refresh()
+    assert status.call_count > 1
+    status.assert_called_with(serve_expired=False)
+    assert system_status._refresh_thread is None
+
+
+def test_requests_do_not_measure_while_refreshing():
+    """Test that a status request while the refresh runs serves the last values"""
+    system_status = SystemStatus(machinename='machine', ttls={'python_version': 0.0})
+    with mock.patch.object(SystemStatus, 'python_version', return_value='3.0.0') as method:
+        method.__name__ = 'python_version'
+        system_status.methods_on_this_platform = [method]
+        system_status.start_refresh(60.0)
+        for _ in range(100):
+            if 'python_version' in system_status._values:
+                break
+            time.sleep(0.01)
+        assert method.call_count == 1
+
+        # The item has expired, but is not measured again by the request
+        assert system_status.complete_status() == {'python_version': '3.0.0'}
+        assert json.loads(system_status.complete_status_json()) == {
+            'python_version': '3.0.0'
+        }
+        assert method.call_count == 1
+
+        system_status.stop_refresh()
+        system_status.complete_status()
+        assert method.call_count == 2
@@ -0,0 +1,117 @@
+# pylint: disable=redefined-outer-name
+
+"""This file contains unit tests for PyExpLabSys.common.text_plot"""
+
+import itertools
+from unittest import mock
+import numpy
+import pytest
+
+from PyExpLabSys.common.text_plot import AsciiPlot, render_plot
+
+
+### Test data
+SIZE = (60, 20)
+X = numpy.linspace(0, 6.28, 10000)
+Y = numpy.sin(X)
+
+
+### Fixtures
+@pytest.fixture
+def popen():
+    """A mocked gnuplot process, that replies with empty frames"""
+    with mock.patch('PyExpLabSys.common.text_plot.Popen') as popen_:
+        frame = b'\f' + (b' ' * SIZE[0] + b'\n') * SIZE[1]
+        lines = itertools.cycle(frame.splitlines(True))
+        popen_.return_value.stdout.readline.side_effect = lambda: next(lines)
+        yield popen_
+
+
+### Tests
+def test_gnuplot_binary_data(popen):
+    """Test that the data is sent in the binary format and the frame read back"""
+    ascii_plot = AsciiPlot(title='My "plot"', size=SIZE)
+    stdin = popen.return_value.stdin
+    assert stdin.write.call_args_list[1] == mock.call(b'set title "My \'plot\'"\n')
+
+    out = ascii_plot.plot([1, 2, 3], [4.0, 5.0, 6.0], legend='data', decimation=None)
+    sent = stdin.write.call_args[0][0]
+    command, data = sent.split(b'\n', 1)
+    assert b'binary record=(3)' in command
+    assert b'title "data"' in command
+    assert numpy.frombuffer(data, dtype='<f8').tolist() == [1.0, 4.0, 2.0, 5.0, 3.0, 6.0]
+    assert popen.return_value.stdout.readline.call_count == SIZE[1]
+    assert out == (' ' * SIZE[0] + '\n') * SIZE[1]
+
+    # Decimated to two points per column
+    ascii_plot.plot(X, Y)
+    command = stdin.write.call_args[0][0].split(b'\n', 1)[0]
+    number_of_points = int(command.split(b'record=(')[1].split(b')')[0])
+    assert number_of_points <= 2 * SIZE[0]
+
+    ascii_plot.close()
+    assert popen.return_value.wait.called
+
+
+def test_gnuplot_exited(popen):
+    """Test that a short read raises"""
+    popen.return_value.stdout.readline.side_effect = None
+    popen.return_value.stdout.readline.return_value = b''
+    with pytest.raises(RuntimeError):
+        AsciiPlot(size=SIZE).plot([1, 2], [1, 2])
+
+
+def test_python_renderer(popen):
+    """Test the layout of the plots rendered in Python"""
+    ascii_plot = AsciiPlot(title='Sine', xlabel='x', ylabel='y', size=SIZE,
+                           renderer='python')
+    assert not popen.called
+    lines = ascii_plot.plot(X, Y, legend='sine').split('\n')
+    assert lines[-1] == ''
+    lines = lines[:-1]
+    assert len(lines) == SIZE[1]
+    assert all(len(line) == SIZE[0] for line in lines)
+    assert lines[0].strip() == 'Sine'
+    assert lines[-1].strip() == 'x'
+    assert 'sine ***' in lines[2]
+    # The data is inside the border and reaches from the left to the right border
+    assert lines[1].split()[0] == '1'
+    left, right = lines[1].index('+'), lines[1].rindex('+')
+    columns = [''.join(line[column] for line in lines[2:-3]) for column in range(SIZE[0])]
+    assert all('*' in column for column in columns[left + 1 : right])
+    assert '*' not in columns[left] + columns[right]
+
+    with pytest.raises(ValueError):
+        AsciiPlot(renderer='latex')
+
+
+def test_render_plot_edge_cases():
+    """Test plots of no data, constant data and non positive data on log scale"""
+    for x, y, logscale in (([], [], False), ([1.0], [2.0], False), (X, Y, True)):
+        lines = render_plot(x, y, SIZE, logscale=logscale).split('\n')[:-1]
+        assert len(lines) == SIZE[1]
+        assert all(len(line) == SIZE[0] for line in lines)
+
+
+def test_render_plot_small_size():
+    """Test that long labels are cut to fit a small plot and that a too small plot
+    raises
+    """
+    lines = render_plot(
+        X, Y, (20, 6), ylabel='pressure / mbar', legend='a long legend'
+    ).split('\n')[:-1]
+    assert len(lines) == 6
+    assert all(len(line) == 20 for line in lines)
+    left, right = lines[0].index('+'), lines[0].rindex('+')
+    assert right - left > 2
+    assert all(line[right] in '|+' for line in lines[:-1])
+
+    with pytest.raises(ValueError):
+        render_plot(X, Y, (6, 6))
+
+
+def test_render_plot_zero_middle_tick():
+    """Test that a middle tick that is zero within the precision is shown as 0"""
+    lines = render_plot(X, Y, SIZE).split('\n')
+    middle = lines[(SIZE[1] - 2) // 2]
+    assert middle.split()[0] == '0'
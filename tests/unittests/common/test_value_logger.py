@@ -0,0 +1,153 @@
+# pylint: disable=redefined-outer-name
+
+"""This file contains unit tests for PyExpLabSys.common.value_logger"""
+
+import numpy as np
+import pytest
+
+from PyExpLabSys.common.value_logger import (
+    EventBuffer, LoggingCriteriumChecker, ValueLogger, ValueLoggerGroup
+)
+
+
+### Test data
+def make_data(number_of_points=5000, seed=0):
+    """Return times and values of a noisy signal with steps, spikes and zeros"""
+    random = np.random.RandomState(seed)
+    times = np.cumsum(random.uniform(0.5, 1.5, number_of_points))
+    values = 10 ** random.choice([-3.0, -2.0, 0.0, 1.0], size=number_of_points // 500)
+    values = np.repeat(values, 500)
+    values = values * (1 + random.normal(0, 0.05, number_of_points))
+    values[random.randint(0, number_of_points, 20)] = 0.0
+    values[random.randint(0, number_of_points, 20)] *= 100
+    return times, values
+
+
+def make_checker(type_, low_compare=None):
+    """Return a checker for the 'dummy' codename"""
+    checker = LoggingCriteriumChecker(
+        codenames=['dummy'], types=[type_], criteria=[0.25 if type_ == 'log' else 1.0],
+        time_outs=[100], low_compare_values=[low_compare],
+    )
+    checker.deprecation_warning = False
+    return checker
+
+
+def scalar_check(checker, times, values):
+    """Run times and values through the scalar check"""
+    return [
+        index for index, (now, value) in enumerate(zip(times, values))
+        if checker.check('dummy', value, now=now)
+    ]
+
+
+### Tests
+@pytest.mark.parametrize('type_,low_compare', [('lin', None), ('log', None),
+                                               ('log', 1E-2)])
+def test_check_batch_equals_check(type_, low_compare):
+    """Test that check_batch saves the same points as check"""
+    times, values = make_data()
+    values = values.tolist()
+    for index in (3, 700, 2501):
+        values[index] = None
+
+    scalar = make_checker(type_, low_compare)
+    scalar_triggers = scalar_check(scalar, times.tolist(), values)
+    batch = make_checker(type_, low_compare)
+    batch_triggers = batch.check_batch('dummy', times, values)
+
+    assert list(batch_triggers) == scalar_triggers
+    assert batch.get_data('dummy') == scalar.get_data('dummy')
+    assert batch.buffer['dummy'] == scalar.buffer['dummy']
+    assert batch.last_values == scalar.last_values
+    assert batch.timeout_counter == scalar.timeout_counter
+
+
+def test_check_batch_in_pieces():
+    """Test that splitting the batch or mixing with check does not change the result"""
+    times, values = make_data(seed=1)
+    reference = make_checker('log')
+    reference.check_batch('dummy', times, values)
+
+    checker = make_checker('log')
+    checker.check_batch('dummy', times[:1234], values[:1234])
+    scalar_check(checker, times[1234:1300].tolist(), values[1234:1300].tolist())
+    for start in range(1300, len(times), 777):
+        checker.check_batch('dummy', times[start:start + 777], values[start:start + 777])
+    assert checker.get_data('dummy') == reference.get_data('dummy')
+
+
+def test_event_buffer():
+    """Test that the event buffer grows and behaves like a list of points"""
+    buffer_ = EventBuffer(capacity=2)
+    points = [(float(number), 10.0 * number) for number in range(5)]
+    buffer_.append(points[0])
+    buffer_.extend(np.array(points[1:]))
+    assert len(buffer_) == 5
+    assert buffer_ == points
+    assert buffer_[-1] == (4.0, 40.0)
+    assert list(buffer_[1:3]) == points[1:3]
+    assert buffer_.points.shape == (5, 2)
+    with pytest.raises(IndexError):
+        buffer_[5]  # pylint: disable=pointless-statement
+
+    buffer_.clear()
+    assert len(buffer_) == 0
+    assert not buffer_
+    buffer_.append((5.0, 50.0))
+    assert buffer_ == [(5.0, 50.0)]
+
+
+def test_check_batch_errors():
+    """Test the errors from check_batch"""
+    checker = make_checker('lin')
+    with pytest.raises(KeyError):
+        checker.check_batch('not_a_codename', [1.0], [1.0])
+    with pytest.raises(ValueError):
+        checker.check_batch('dummy', [1.0, 2.0], [1.0])
+
+
+def test_value_logger_group():
+    """Test that pushed values are evaluated and triggered points delivered"""
+    delivered = []
+    group = ValueLoggerGroup(callback=lambda name, points: delivered.append((name, points)))
+    group.add_logger('lin', ValueLogger(None, comp_val=1.0, model='sparse'))
+    log_points = []
+    group.add_logger('log', ValueLogger(None, comp_type='log', comp_val=0.5),
+                     callback=lambda name, points: log_points.extend(points))
+    group.start()
+
+    publish = group.publisher('lin')
+    for now, value in enumerate([5.0, 5.5, 5.9, 7.0, 7.1]):
+        publish(value, now=1000.0 + now)
+        group.push('log', 1.0 + now, now=1000.0 + now)
+    group.push('lin', None, now=1010.0)
+    group.stop()
+
+    assert delivered == [('lin', [(1000.0, 5.0)]), ('lin', [(1003.0, 7.0)])]
+    # 4.0 does not trigger, but is saved by the event handler when 5.0 does
+    assert log_points == [(1000.0 + n, 1.0 + n) for n in range(5)]
+
+
+def test_value_logger_group_survives_logger_error():
+    """Test that a value logger that raises does not stop the group thread"""
+    delivered = []
+    group = ValueLoggerGroup(callback=lambda name, points: delivered.append((name, points)))
+    group.add_logger('broken', ValueLogger(None, comp_val=1.0))
+    group.add_logger('good', ValueLogger(None, comp_val=1.0))
+    group.start()
+
+    # More than 15 values in a row that cannot be evaluated makes evaluate raise
+    for now in range(20):
+        group.push('broken', None, now=1000.0 + now)
+    group.push('good', 5.0, now=1020.0)
+    group.push('good', 7.0, now=1021.0)
+    group.stop()
+
+    assert delivered == [('good', [(1020.0, 5.0)]), ('good', [(1021.0, 7.0)])]
+
+
+def test_value_logger_push_mode_not_startable():
+    """Test that a value logger in push mode cannot be run as a thread"""
+    with pytest.raises(ValueError):
+        ValueLogger(None).run()
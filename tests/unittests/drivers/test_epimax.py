@@ -0,0 +1,65 @@
+# pylint: disable=redefined-outer-name
+
+"""This file contains unit tests for PyExpLabSys.drivers.epimax"""
+
+import struct
+from unittest import mock
+import pytest
+
+import minimalmodbus
+from PyExpLabSys.drivers.epimax import PVCi
+
+
+### Test data
+FLOATS = {
+    'ion_gauge_1_pressure': 1.5e-7,
+    'bake_out_temp_1': 150.0,
+    'bake_out_time_6': 2.5,
+    'remaining_bake_out_time': 0.75,
+    'slot_a_value_1': -3.25,
+    'slot_b_value_2': 1e-10,
+}
+STRINGS = {'global_id': 'PVCi', 'unit_name': 'Ch 1', 'user_id': 'usr1'}
+
+
+### Fixtures
+@pytest.fixture
+def pvci():
+    """A PVCi whose transport reads from a fake register memory
+
+    The fake read_float decodes big endian, like minimalmodbus does by default.
+    """
+    memory = bytearray(0x100 * 2)
+
+    def read_bytes(address, number_of_registers):
+        return bytes(memory[address * 2 : (address + number_of_registers) * 2])
+
+    def read_string(registeraddress, numberOfRegisters=16, functioncode=3):
+        return read_bytes(registeraddress, numberOfRegisters).decode('latin1')
+
+    def read_float(registeraddress, functioncode=3):
+        return struct.unpack('>f', read_bytes(registeraddress, 2))[0]
+
+    with mock.patch.object(minimalmodbus.Instrument, '__init__', return_value=None):
+        with mock.patch.multiple(PVCi, read_string=mock.DEFAULT,
+                                 read_float=mock.DEFAULT) as methods:
+            methods['read_string'].side_effect = read_string
+            methods['read_float'].side_effect = read_float
+            pvci = PVCi('/dev/null', check_hardware_version=False)
+            for name, value in FLOATS.items():
+                address = pvci.fields[name][0]
+                memory[address * 2 : address * 2 + 4] = struct.pack('>f', value)
+            for name, value in STRINGS.items():
+                address = pvci.fields[name][0]
+                memory[address * 2 : address * 2 + 4] = value.encode('latin1')
+            yield pvci
+
+
+### Tests
+def test_get_fields_matches_get_field(pvci):
+    """Test that the batched reads decode the fields like the single reads"""
+    names = list(FLOATS) + list(STRINGS)
+    assert pvci.get_fields(names) == {name: pvci.get_field(name) for name in names}
+    values = pvci.get_fields(list(FLOATS))
+    for name, value in FLOATS.items():
+        assert values[name] == pytest.approx(value)